@@ -0,0 +1,65 @@
+"""
+Times `get_function_schema` and `FunctionTool.from_func` with a cold and a warm
+schema cache, on the `tests/test_function_schema.py` fixtures and a skill's tools.
+
+    python -m benchmarks.function_schema
+"""
+
+import timeit
+from typing import Annotated, Literal
+
+from pydantic import BaseModel
+
+from emp_agents.models import FunctionTool
+from emp_agents.tools.protocol.erc20 import ERC20Skill
+from emp_agents.utils import get_function_schema
+from emp_agents.utils.function_schema import Doc, core
+from tests.test_function_schema import simple_func
+
+
+class Order(BaseModel):
+    token: str
+    amount: float
+
+
+def place_order(
+    order: Annotated[Order, Doc("The order to place")],
+    side: Annotated[Literal["buy", "sell"], Doc("The side of the order")],
+    slippage: Annotated[float | None, Doc("The allowed slippage")] = None,
+) -> str:
+    """Place an order"""
+    return "ok"
+
+
+def main() -> None:
+    functions = [simple_func, place_order] + [
+        tool.func for tool in ERC20Skill._tools  # type: ignore[attr-defined]
+    ]
+    number = 200
+
+    def schemas():
+        for func in functions:
+            get_function_schema(func)
+
+    def tools():
+        for func in functions:
+            FunctionTool.from_func(func)
+
+    for name, run in [("get_function_schema", schemas), ("from_func", tools)]:
+
+        def cold_run():
+            core._signatures.clear()
+            core._schemas.clear()
+            run()
+
+        cold = timeit.timeit(cold_run, number=number)
+        warm = timeit.timeit(run, number=number)
+        per_call = 1e6 / (number * len(functions))
+        print(
+            f"{name:<20} cold {cold * per_call:8.1f} us/func"
+            f"  warm {warm * per_call:8.1f} us/func"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compares the memory used by `ConversationProvider` and `CompactConversationProvider`
+for a long tool-heavy history, and the time a full garbage collection takes.
+
+    python -m benchmarks.history_memory --messages 50000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+
+from emp_agents.agents.compact_history import CompactConversationProvider
+from emp_agents.agents.history import AbstractConversationProvider, ConversationProvider
+from emp_agents.models import AssistantMessage, Message, ToolMessage, UserMessage
+
+
+def make_history(count: int) -> list[Message]:
+    messages: list[Message] = []
+    for i in range(count):
+        match i % 3:
+            case 0:
+                messages.append(UserMessage(content=f"question {i} " * 5))
+            case 1:
+                messages.append(AssistantMessage(content=f"answer {i} " * 20))
+            case 2:
+                messages.append(
+                    ToolMessage(
+                        content=f'{{"result": {i}, "status": "ok"}}',
+                        tool_call_id=f"call_{uuid.uuid4().hex[:24]}",
+                    )
+                )
+    return messages
+
+
+def measure(provider: AbstractConversationProvider, count: int) -> tuple[int, float]:
+    gc.collect()
+    tracemalloc.start()
+    provider.add_messages(make_history(count))
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    gc.collect()
+    return size, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=30_000)
+    args = parser.parse_args()
+
+    for cls in [ConversationProvider, CompactConversationProvider]:
+        size, gc_time = measure(cls(), args.messages)
+        print(
+            f"{cls.__name__:<30} {size / 1024 / 1024:8.2f} MiB"
+            f"  gc.collect {gc_time * 1000:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
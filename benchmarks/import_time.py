@@ -0,0 +1,43 @@
+"""
+Reports the cumulative `-X importtime` of common entry points, each measured in a
+fresh interpreter.
+
+    python -m benchmarks.import_time
+"""
+
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import emp_agents",
+    "from emp_agents import OpenAIProvider",
+    "from emp_agents import AgentBase",
+    "from emp_agents import AnthropicProvider",
+    "import emp_agents.tools",
+]
+
+
+def import_time(statement: str) -> int:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            # only top level imports, their cumulative time includes their children
+            if not name.startswith("  "):
+                total += int(cumulative)
+    return total
+
+
+def main() -> None:
+    for statement in STATEMENTS:
+        print(f"{statement:<45} {import_time(statement) / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
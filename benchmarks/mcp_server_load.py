@@ -0,0 +1,81 @@
+"""
+Fires many simultaneous tool calls at the MCP server entry point over stdio, for
+blocking and async tools, and reports throughput and latency from the client
+pool's metrics.
+
+    python -m benchmarks.mcp_server_load
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from mcp import StdioServerParameters
+
+from emp_agents.types.mcp import MCPClient, MCPConnectionType
+
+ROOT = Path(__file__).parent.parent
+CALLS = 500
+WAIT = 0.05
+
+
+def make_client(pool_size: int, max_workers: int) -> MCPClient:
+    return MCPClient(
+        connection_type=MCPConnectionType.STDIO,
+        params=StdioServerParameters(
+            command=sys.executable,
+            args=[
+                "-m",
+                "emp_agents.utils.mcp.server",
+                "--module",
+                "tests.servers.skills",
+                "--skill",
+                "LoadTestSkill",
+                "--max-workers",
+                str(max_workers),
+            ],
+            cwd=str(ROOT),
+        ),
+        pool_size=pool_size,
+    )
+
+
+async def run(tool: str, pool_size: int, max_workers: int) -> None:
+    async with make_client(pool_size, max_workers) as client:
+        # open every session of the pool before measuring
+        await asyncio.gather(
+            *(client.call_tool(tool, {"seconds": WAIT}) for _ in range(pool_size * 4))
+        )
+        client.pool.reset_metrics()
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(client.call_tool(tool, {"seconds": WAIT}) for _ in range(CALLS))
+        )
+        elapsed = time.perf_counter() - start
+        metrics = client.metrics()
+        assert metrics is not None and metrics.latency_p50 is not None
+        assert metrics.latency_p95 is not None
+        print(
+            f"{tool:<14} pool={pool_size} workers={max_workers:<3} "
+            f"{CALLS / elapsed:8.0f} calls/s  "
+            f"p50 {metrics.latency_p50 * 1000:7.1f} ms  "
+            f"p95 {metrics.latency_p95 * 1000:7.1f} ms"
+        )
+
+
+async def main() -> None:
+    print(f"{CALLS} simultaneous calls of tools that wait {WAIT * 1000:.0f} ms")
+    for tool, pool_size, max_workers in [
+        ("blocking_wait", 1, 4),
+        ("blocking_wait", 1, 32),
+        ("blocking_wait", 4, 32),
+        ("async_wait", 1, 4),
+        ("async_wait", 4, 4),
+    ]:
+        await run(tool, pool_size, max_workers)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
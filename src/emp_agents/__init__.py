@@ -1,17 +1,46 @@
-from . import tools
-from .agents import AgentBase
-from .models import (
-    AssistantMessage,
-    GenericTool,
-    Message,
-    Middleware,
-    Property,
-    Request,
-    SystemMessage,
-    UserMessage,
-)
-from .providers import AnthropicProvider, DeepSeekProvider, GrokProvider, OpenAIProvider
-from .types import Role
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import tools
+    from .agents import AgentBase
+    from .models import (
+        AssistantMessage,
+        GenericTool,
+        Message,
+        Middleware,
+        Property,
+        Request,
+        SystemMessage,
+        UserMessage,
+    )
+    from .providers import (
+        AnthropicProvider,
+        DeepSeekProvider,
+        GrokProvider,
+        OpenAIProvider,
+    )
+    from .types import Role
+
+# the public API is imported on first access, so that eg. using only one provider
+# does not load the SDKs of the others or the onchain tools
+_LAZY_IMPORTS = {
+    "AgentBase": ".agents",
+    "AnthropicProvider": ".providers",
+    "AssistantMessage": ".models",
+    "DeepSeekProvider": ".providers",
+    "GenericTool": ".models",
+    "GrokProvider": ".providers",
+    "Message": ".models",
+    "Middleware": ".models",
+    "OpenAIProvider": ".providers",
+    "Property": ".models",
+    "Request": ".models",
+    "Role": ".types",
+    "SystemMessage": ".models",
+    "UserMessage": ".models",
+    "tools": ".tools",
+}
 
 __all__ = [
     "AgentBase",
@@ -30,3 +59,16 @@ __all__ = [
     "UserMessage",
     "tools",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+    value = module if module.__name__ == f"{__name__}.{name}" else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
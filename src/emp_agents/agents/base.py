@@ -1,6 +1,19 @@
 import asyncio
+from functools import wraps
+from pathlib import Path
 from textwrap import dedent
-from typing import Any, Awaitable, Callable, Sequence, Type, TypeVar, cast, overload
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Self,
+    Sequence,
+    Type,
+    TypeVar,
+    cast,
+    overload,
+)
 
 from pydantic import (
     BaseModel,
@@ -11,9 +24,15 @@ from pydantic import (
     field_validator,
 )
 
-from emp_agents.agents.history import AbstractConversationProvider, ConversationProvider
+from emp_agents.agents.history import (
+    AbstractConversationProvider,
+    AsyncAbstractConversationProvider,
+    ConversationProvider,
+)
 from emp_agents.exceptions import DuplicateToolException
+from emp_agents.implicits.context import AgentContext, current_context
 from emp_agents.logger import logger
+from emp_agents.middleware.pipeline import MiddlewarePipeline
 from emp_agents.models import (
     AssistantMessage,
     FunctionTool,
@@ -24,15 +43,48 @@ from emp_agents.models import (
     ResponseT,
     SystemMessage,
     ToolMessage,
+    ToolOutputPolicy,
+    ToolOutputStore,
+    ToolSelector,
     UserMessage,
+    export_messages,
+    import_messages,
 )
 from emp_agents.models.middleware import Middleware
 from emp_agents.providers.openai import OpenAIModelType
 from emp_agents.types import Role
-from emp_agents.types.mcp import MCPClient, SSEParams
-from emp_agents.utils import count_tokens, execute_tool, summarize_conversation
+from emp_agents.utils import (
+    SegmentSummaryCache,
+    count_tokens,
+    execute_tool,
+    summarize_conversation,
+    summarize_conversation_hierarchical,
+)
+
+if TYPE_CHECKING:
+    from emp_agents.types.mcp import MCPClient
 
 T = TypeVar("T", bound=BaseModel)
+V = TypeVar("V")
+
+
+async def _resolve(value: V | Awaitable[V]) -> V:
+    if isinstance(value, Awaitable):
+        return await value
+    return value
+
+
+def _in_agent_context(
+    method: Callable[..., Awaitable[V]],
+) -> Callable[..., Awaitable[V]]:
+    """Runs an agent's method, and the tools it calls, in the agent's context"""
+
+    @wraps(method)
+    async def wrapper(self: "AgentBase", *args: Any, **kwargs: Any) -> V:
+        with self._context.activate():
+            return await method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class AgentBase(BaseModel):
@@ -45,20 +97,39 @@ class AgentBase(BaseModel):
     )
     requires: list[str] = Field(default_factory=list)
     provider: Provider
-    conversation: AbstractConversationProvider = Field(
-        default_factory=ConversationProvider
+    conversation: AbstractConversationProvider | AsyncAbstractConversationProvider = (
+        Field(default_factory=ConversationProvider)
     )
     sync_tools: bool = Field(
         default=True, description="If true, tools will be executed synchronously"
     )
     mcp_clients: list[str] = Field(default_factory=list)
+    mcp_manifest_cache: str | None = Field(
+        default=None,
+        description="A directory to cache the MCP servers' tools in between restarts",
+    )
 
     # This can be used to modify the conversation before completion, such as RAG
     middleware: list[Middleware] = Field(default_factory=list)
 
-    _mcp_clients: list[MCPClient] = PrivateAttr(default_factory=list)
+    # If set, only the tools relevant to the latest user message are sent each turn
+    tool_selector: ToolSelector | None = None
+
+    # Per-tool overrides of how tool outputs are placed into the conversation
+    tool_output_policies: dict[str, ToolOutputPolicy] = Field(default_factory=dict)
+
+    _mcp_clients: list["MCPClient"] = PrivateAttr(default_factory=list)
     _tools: list[GenericTool] = PrivateAttr(default_factory=list)
     _tools_map: dict[str, Callable[..., Any]] = PrivateAttr(default_factory=dict)
+    _summary_cache: SegmentSummaryCache = PrivateAttr(
+        default_factory=SegmentSummaryCache
+    )
+    _tool_outputs: ToolOutputStore = PrivateAttr(default_factory=ToolOutputStore)
+    _system_message_pending: bool = PrivateAttr(default=False)
+    # implicits and skill state (network, wallet, ...) of this agent
+    _context: AgentContext = PrivateAttr(
+        default_factory=lambda: current_context().child()
+    )
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -97,7 +168,15 @@ class AgentBase(BaseModel):
         ]
 
     def _load_implicits(self):
-        """Override this method to load implicits to the agent directly"""
+        """
+        Override this method to load implicits to the agent directly, they are
+        only visible to this agent
+        """
+
+    @property
+    def context(self) -> AgentContext:
+        """The agent's implicits and skill state, active while it runs"""
+        return self._context
 
     def model_post_init(self, _context: Any):
         if not (self.provider.api_key):
@@ -112,35 +191,67 @@ class AgentBase(BaseModel):
                 raise ValueError(f"Invalid tool type: {type(tool)}")
 
         self._tools_map = {tool.name: tool.execute for tool in self._tools}
-        self.conversation.add_message(SystemMessage(content=self.system_prompt))
+        if isinstance(self.conversation, AsyncAbstractConversationProvider):
+            # async stores are written from the event loop, see _prepare_conversation
+            self._system_message_pending = True
+        else:
+            self.conversation.add_message(SystemMessage(content=self.system_prompt))
+
+        with self._context.activate():
+            self._load_implicits()
 
-        self._load_implicits()
+        if self.mcp_clients:
+            from emp_agents.types.mcp import MCPClient, SSEParams
+            from emp_agents.utils.mcp.manifest import ToolManifestCache
+
+            manifest_cache = (
+                ToolManifestCache(directory=Path(self.mcp_manifest_cache))
+                if self.mcp_manifest_cache
+                else None
+            )
 
         for mcp_client in self.mcp_clients:
             self._mcp_clients.append(
                 MCPClient(
                     params=SSEParams(
                         url=mcp_client,
-                    )
+                    ),
+                    manifest_cache=manifest_cache,
                 )
             )
 
     async def initialize_mcp_clients(self):
-        for mcp_client in self._mcp_clients:
-            tools = await mcp_client.list_tools()
-            for tool in tools:
+        """
+        Load the tools of every MCP server concurrently.  A server that cannot be
+        reached is logged and skipped, the agent keeps the tools of the others.
+        """
+        results = await asyncio.gather(
+            *(mcp_client.list_tools() for mcp_client in self._mcp_clients),
+            return_exceptions=True,
+        )
+        for mcp_client, result in zip(self._mcp_clients, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Skipping MCP server {mcp_client.params}: {result!r}")
+                continue
+            for tool in result:
                 self._add_tool(tool)
 
+    async def aclose(self) -> None:
+        """Close the agent's connections to its MCP servers"""
+        await asyncio.gather(*(mcp_client.aclose() for mcp_client in self._mcp_clients))
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
     async def get_token_count(
         self,
         model: str | OpenAIModelType = "gpt4o_mini",
     ) -> int:
         """A utility to get the token count for openai models, fairly accurate across all providers"""
-        maybe_coro = self.conversation.get_history()
-        if isinstance(maybe_coro, Awaitable):
-            conversation = await maybe_coro
-        else:
-            conversation = maybe_coro
+        conversation = await self._get_history()
         return count_tokens(conversation, model)
 
     async def summarize(
@@ -149,24 +260,42 @@ class AgentBase(BaseModel):
         update: bool = True,
         prompt: str | None = None,
         max_tokens: int = 500,
+        hierarchical: bool = False,
+        segment_tokens: int = 4_000,
     ) -> str:
+        """
+        Summarize the conversation, optionally replacing the history with the summary.
+
+        With `hierarchical=True` the history is summarized in token-bounded segments
+        concurrently and the partial summaries are merged.  Segment summaries are
+        cached on the agent, so repeated compactions only summarize new segments.
+        """
         model = self._load_model(model)
 
-        maybe_coro = self.conversation.get_history()
-        if isinstance(maybe_coro, Awaitable):
-            conversation = await maybe_coro
-        else:
-            conversation = maybe_coro
+        # the summary replaces the whole history, not only the window
+        conversation = await self._get_full_history()
 
-        summary = await summarize_conversation(
-            self.provider,
-            conversation,
-            model=model,
-            prompt=prompt,
-            max_tokens=max_tokens,
-        )
-        if update:
-            self.conversation.set_history([summary])
+        if hierarchical:
+            summary = await summarize_conversation_hierarchical(
+                self.provider,
+                conversation,
+                model=model,
+                prompt=prompt,
+                max_tokens=max_tokens,
+                segment_tokens=segment_tokens,
+                cache=self._summary_cache,
+            )
+        else:
+            summary = await summarize_conversation(
+                self.provider,
+                conversation,
+                model=model,
+                prompt=prompt,
+                max_tokens=max_tokens,
+            )
+        if update and summary.content:
+            # an empty summary means summarizing failed, keep the history
+            await _resolve(self.conversation.set_history([summary]))
         assert summary.content is not None, "Summary content should always be present"
         return summary.content
 
@@ -249,11 +378,7 @@ class AgentBase(BaseModel):
     ) -> T | str:
         """Complete the current conversation until no more tool calls"""
         _model = self._load_model(model)
-        maybe_coro = self.conversation.get_history()
-        if isinstance(maybe_coro, Awaitable):
-            conversation = await maybe_coro
-        else:
-            conversation = maybe_coro
+        conversation = await self._get_history()
 
         if response_format in [None, str]:
             response = await self._run_conversation(
@@ -275,6 +400,7 @@ class AgentBase(BaseModel):
         )
         return response_format.model_validate_json(response)
 
+    @_in_agent_context
     async def _run_conversation(
         self,
         messages: list[Message],
@@ -286,17 +412,13 @@ class AgentBase(BaseModel):
     ) -> str:
         """Core conversation loop handling tool calls"""
         conversation = messages.copy()
-        for middleware in self.middleware:
-            _conversation = middleware.process(conversation)
-            if isinstance(_conversation, Awaitable):
-                conversation = await _conversation  # type: ignore
-            else:
-                conversation = _conversation
+        if self.middleware:
+            conversation = await MiddlewarePipeline(self.middleware).run(conversation)
         while True:
             request = Request(
                 messages=conversation,
                 model=model,
-                tools=self._tools,
+                tools=self._select_tools(conversation),
                 max_tokens=max_tokens or 1_000,
                 temperature=temperature,
                 response_format=response_format,
@@ -306,7 +428,10 @@ class AgentBase(BaseModel):
             conversation += response.messages
 
             if not response.tool_calls:
-                self.conversation.set_history(conversation)
+                await _resolve(self.conversation.set_history(conversation))
+                if isinstance(self.conversation, AbstractConversationProvider):
+                    # async providers write behind, the turn does not wait on the store
+                    self.conversation.flush()
                 return response.text
 
             tool_invocation_coros = [
@@ -323,7 +448,7 @@ class AgentBase(BaseModel):
                 tool_results = await asyncio.gather(*tool_invocation_coros)
             for result, tool_call in zip(tool_results, response.tool_calls):
                 message = ToolMessage(
-                    content=result,
+                    content=self._apply_output_policy(tool_call.function.name, result),
                     tool_call_id=(
                         tool_call.id if tool_call and hasattr(tool_call, "id") else None
                     ),
@@ -331,7 +456,46 @@ class AgentBase(BaseModel):
                 if hasattr(self, "conversation_history"):
                     logger.info(message)
                 conversation += [message]
-                self.conversation.set_history(conversation)
+                await _resolve(self.conversation.set_history(conversation))
+
+    def _apply_output_policy(self, tool_name: str, result: Any) -> Any:
+        policy = self.tool_output_policies.get(tool_name)
+        if policy is None:
+            policy = next(
+                (tool.output_policy for tool in self._tools if tool.name == tool_name),
+                None,
+            )
+        if policy is None or not isinstance(result, str):
+            return result
+
+        stored = len(self._tool_outputs)
+        result = policy.apply(result, self._tool_outputs)
+        if len(self._tool_outputs) > stored and (
+            self._tool_outputs.tool_name not in self._tools_map
+        ):
+            self._add_tool(self._tool_outputs.as_tool())
+        return result
+
+    def _select_tools(self, conversation: list[Message]) -> list[GenericTool]:
+        if self.tool_selector is None or not self._tools:
+            return self._tools
+
+        recent = [
+            message.content
+            for message in conversation
+            if message.role in (Role.user, Role.assistant)
+            and isinstance(message.content, str)
+            and message.content
+        ][-self.tool_selector.query_messages :]
+        query = "\n".join(recent)
+        pinned = {
+            tool_call.function.name
+            for message in conversation
+            if isinstance(message, AssistantMessage) and message.tool_calls
+            for tool_call in message.tool_calls
+        }
+        pinned.add(self._tool_outputs.tool_name)
+        return self.tool_selector.select(query, self._tools, pinned)
 
     @overload
     async def answer(
@@ -355,7 +519,7 @@ class AgentBase(BaseModel):
         response_format: Type[T] | Type[str] | None = None,
         model: str | None = None,
     ) -> T | str:
-        self.conversation.add_message(Message(role=Role.user, content=question))
+        await self._add_messages([Message(role=Role.user, content=question)])
 
         if response_format in [None, str]:
             return await self.complete(
@@ -370,14 +534,49 @@ class AgentBase(BaseModel):
     def add_message(
         self,
         message: Message,
-    ) -> None:
+    ) -> None | Awaitable[None]:
+        """Returns an awaitable if the conversation provider is async"""
+        if isinstance(self.conversation, AsyncAbstractConversationProvider):
+            return self._add_messages([message])
         self.conversation.add_message(message)
+        return None
 
     def add_messages(
         self,
         messages: list[Message],
-    ) -> None:
+    ) -> None | Awaitable[None]:
+        """Returns an awaitable if the conversation provider is async"""
+        if isinstance(self.conversation, AsyncAbstractConversationProvider):
+            return self._add_messages(messages)
         self.conversation.add_messages(messages)
+        return None
+
+    async def _add_messages(self, messages: list[Message]) -> None:
+        await self._prepare_conversation()
+        await _resolve(self.conversation.add_messages(messages))
+
+    async def _prepare_conversation(self) -> None:
+        """Adds the system message to a new async conversation on first use"""
+        if not self._system_message_pending:
+            return
+        assert isinstance(self.conversation, AsyncAbstractConversationProvider)
+        self._system_message_pending = False
+        if not await self.conversation.get_history():
+            await self.conversation.add_message(
+                SystemMessage(content=self.system_prompt)
+            )
+
+    async def _get_history(self) -> list[Message]:
+        await self._prepare_conversation()
+        return await _resolve(self.conversation.get_history())
+
+    async def _get_full_history(self) -> list[Message]:
+        """The history ignoring the provider's window, if it reads one by default"""
+        get_full_history = getattr(self.conversation, "get_full_history", None)
+        if get_full_history is None:
+            return await self._get_history()
+        await self._prepare_conversation()
+        return await _resolve(get_full_history())
 
     async def __call__(
         self,
@@ -386,20 +585,48 @@ class AgentBase(BaseModel):
     ) -> str:
         return await self.answer(question, model=model)
 
+    def fork(self) -> Self:
+        """
+        Branch the agent, eg. to explore several plans in parallel.  The branch
+        continues from the current conversation but records its own messages.
+        Raises `TypeError` if the conversation provider can not be forked.
+        """
+        fork = getattr(self.conversation, "fork", None)
+        if fork is None:
+            raise TypeError(f"{type(self.conversation).__name__} can not be forked")
+        branch = self.model_copy(update={"conversation": fork()})
+        branch._tools = self._tools.copy()
+        branch._tools_map = self._tools_map.copy()
+        branch._context = self._context.child()
+        return branch
+
     async def reset(self):
-        self.conversation.reset()
+        await _resolve(self.conversation.reset())
 
     @property
     def system_prompt(self) -> str:
         prompt = self.prompt
         return prompt.strip()
 
+    async def export_conversation(self, path: Path | str) -> int:
+        """Write the conversation to a `.jsonl` or `.msgpack` file, optionally `.gz`"""
+        return export_messages(await self._get_full_history(), path)
+
+    async def import_conversation(
+        self, path: Path | str, batch_size: int = 1_000
+    ) -> None:
+        """Append the messages of an exported conversation, streamed in batches"""
+        batch: list[Message] = []
+        for message in import_messages(path):
+            batch.append(message)
+            if len(batch) >= batch_size:
+                await self._add_messages(batch)
+                batch = []
+        if batch:
+            await self._add_messages(batch)
+
     async def print_conversation(self) -> None:
-        maybe_coro = self.conversation.get_history()
-        if isinstance(maybe_coro, Awaitable):
-            conversation = await maybe_coro
-        else:
-            conversation = maybe_coro
+        conversation = await self._get_history()
         for message in conversation:
             print(f"{message.role}: {message.content}")
 
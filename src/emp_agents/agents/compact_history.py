@@ -0,0 +1,193 @@
+import json
+from array import array
+from typing import Any, Iterator, Self
+
+from pydantic import PrivateAttr
+
+from emp_agents.agents.windowed_history import WindowedConversationProvider
+from emp_agents.models import (
+    AssistantMessage,
+    Message,
+    SystemMessage,
+    ToolMessage,
+    UserMessage,
+)
+from emp_agents.models.shared.message import message_adapter
+
+MESSAGE_TYPES: tuple[type[Message], ...] = (
+    SystemMessage,
+    UserMessage,
+    AssistantMessage,
+    ToolMessage,
+)
+ROLE_CODES = {
+    cls.model_fields["role"].default: code for code, cls in enumerate(MESSAGE_TYPES)
+}
+NO_CONTENT = 0x80
+
+
+def _fingerprint(message: Message) -> int:
+    tool_calls = getattr(message, "tool_calls", None)
+    return hash(
+        (
+            message.content,
+            getattr(message, "tool_call_id", None),
+            getattr(message, "refusal", None),
+            (
+                tuple(
+                    (
+                        tool_call.id,
+                        tool_call.function.name,
+                        json.dumps(tool_call.function.arguments, sort_keys=True),
+                    )
+                    for tool_call in tool_calls
+                )
+                if tool_calls
+                else None
+            ),
+        )
+    )
+
+
+class MessageColumns:
+    """
+    Column storage for messages: one byte per role, the UTF-8 contents and tool
+    call IDs in shared buffers with end offsets, and the rare remaining fields
+    (eg. an assistant's tool calls) as JSON keyed by position.  Only a handful
+    of objects are alive no matter how long the history is.
+    """
+
+    __slots__ = (
+        "roles",
+        "fingerprints",
+        "content",
+        "content_ends",
+        "ids",
+        "id_ends",
+        "extras",
+    )
+
+    def __init__(self) -> None:
+        self.roles = bytearray()
+        self.fingerprints = array("q")
+        self.content = bytearray()
+        self.content_ends = array("Q")
+        self.ids = bytearray()
+        self.id_ends = array("Q")
+        self.extras: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def copy(self) -> "MessageColumns":
+        columns = MessageColumns()
+        columns.roles = self.roles[:]
+        columns.fingerprints = self.fingerprints[:]
+        columns.content = self.content[:]
+        columns.content_ends = self.content_ends[:]
+        columns.ids = self.ids[:]
+        columns.id_ends = self.id_ends[:]
+        columns.extras = self.extras.copy()
+        return columns
+
+    def append(self, message: Message) -> None:
+        index = len(self.roles)
+        code = ROLE_CODES[message.role]
+        if message.content is None:
+            code |= NO_CONTENT
+        self.roles.append(code)
+        self.fingerprints.append(_fingerprint(message))
+        self.content += (message.content or "").encode()
+        self.content_ends.append(len(self.content))
+        self.ids += (getattr(message, "tool_call_id", None) or "").encode()
+        self.id_ends.append(len(self.ids))
+
+        extras = message.model_dump(
+            mode="json",
+            exclude={"role", "content", "tool_call_id"},
+            exclude_none=True,
+        )
+        if extras:
+            self.extras[index] = json.dumps(extras)
+
+    def truncate(self, length: int) -> None:
+        if length >= len(self.roles):
+            return
+        del self.roles[length:]
+        del self.fingerprints[length:]
+        del self.content_ends[length:]
+        del self.id_ends[length:]
+        del self.content[self.content_ends[-1] if length else 0 :]
+        del self.ids[self.id_ends[-1] if length else 0 :]
+        for index in [index for index in self.extras if index >= length]:
+            del self.extras[index]
+
+    def matches(self, index: int, message: Message) -> bool:
+        role = self.roles[index] & ~NO_CONTENT
+        if role != ROLE_CODES[message.role]:
+            return False
+        return self.fingerprints[index] == _fingerprint(message)
+
+    def _slice(self, buffer: bytearray, ends: array, index: int) -> str:
+        start = ends[index - 1] if index else 0
+        return buffer[start : ends[index]].decode()
+
+    def __getitem__(self, index: int) -> Message:
+        code = self.roles[index]
+        cls = MESSAGE_TYPES[code & ~NO_CONTENT]
+        fields: dict[str, Any] = {
+            "content": (
+                None
+                if code & NO_CONTENT
+                else self._slice(self.content, self.content_ends, index)
+            )
+        }
+        if cls is ToolMessage:
+            fields["tool_call_id"] = self._slice(self.ids, self.id_ends, index) or None
+        if index in self.extras:
+            fields.update(json.loads(self.extras[index]))
+            fields["role"] = cls.model_fields["role"].default
+            return message_adapter.validate_python(fields)
+        return cls.model_construct(**fields)
+
+
+class CompactConversationProvider(WindowedConversationProvider):
+    """
+    A conversation provider for very long histories.
+
+    Messages are stored in `MessageColumns` instead of as pydantic models and are
+    only materialized when the history is read, so a long-running agent keeps a
+    few buffers alive rather than tens of thousands of objects for the garbage
+    collector to track.  `get_history(last_n=...)` materializes only a window.
+    """
+
+    _columns: MessageColumns = PrivateAttr(default_factory=MessageColumns)
+
+    def _read(self, start: int, stop: int | None = None) -> list[Message]:
+        return list(self.iter_messages(start, stop))
+
+    def _matches(self, index: int, message: Message) -> bool:
+        return self._columns.matches(index, message)
+
+    def _write(self, start: int, messages: list[Message]) -> None:
+        self._columns.truncate(start)
+        for message in messages:
+            self._columns.append(message)
+
+    def reset(self) -> None:
+        self._columns = MessageColumns()
+        self._view_start = 0
+
+    def iter_messages(
+        self, start: int = 0, stop: int | None = None
+    ) -> Iterator[Message]:
+        for index in range(start, len(self._columns) if stop is None else stop):
+            yield self._columns[index]
+
+    def fork(self) -> Self:
+        branch = self.model_copy()
+        branch._columns = self._columns.copy()
+        return branch
+
+    def __len__(self) -> int:
+        return len(self._columns)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Awaitable
+from typing import Awaitable, Self
 
 from pydantic import BaseModel, PrivateAttr
 
@@ -27,6 +27,39 @@ class AbstractConversationProvider(BaseModel, ABC):
     def get_history(self) -> list[Message] | Awaitable[list[Message]]:
         pass
 
+    def flush(self) -> None:
+        """Persist buffered writes, called by the agent at the end of every turn"""
+
+    # providers that can branch a conversation define `fork(self) -> Self`,
+    # returning a new branch that starts from the current history
+
+
+class AsyncAbstractConversationProvider(BaseModel, ABC):
+    """A conversation provider for stores that are accessed over the network"""
+
+    @abstractmethod
+    async def set_history(self, messages: list[Message]) -> None:
+        pass
+
+    @abstractmethod
+    async def add_message(self, message: Message) -> None:
+        pass
+
+    @abstractmethod
+    async def add_messages(self, messages: list[Message]) -> None:
+        pass
+
+    @abstractmethod
+    async def reset(self) -> None:
+        pass
+
+    @abstractmethod
+    async def get_history(self) -> list[Message]:
+        pass
+
+    async def flush(self) -> None:
+        """Wait until buffered writes have been persisted, not called by the agent"""
+
 
 class ConversationProvider(AbstractConversationProvider):
     _history: list[Message] = PrivateAttr(default_factory=list)
@@ -46,3 +79,95 @@ class ConversationProvider(AbstractConversationProvider):
 
     def get_history(self) -> list[Message] | Awaitable[list[Message]]:
         return self._history.copy()
+
+    def fork(self) -> Self:
+        branch = self.model_copy()
+        branch._history = self._history.copy()
+        return branch
+
+
+class _Segment:
+    """
+    A run of messages in a forkable history.  A segment is never modified once a
+    branch has been forked from it, so branches can share it as their prefix.
+    """
+
+    __slots__ = ("parent", "start", "messages")
+
+    def __init__(
+        self, parent: "_Segment | None", messages: list[Message] | None = None
+    ):
+        self.parent = parent
+        self.start = len(parent) if parent is not None else 0
+        self.messages = messages if messages is not None else []
+
+    def __len__(self) -> int:
+        return self.start + len(self.messages)
+
+    def chain(self) -> list["_Segment"]:
+        segments = []
+        segment: _Segment | None = self
+        while segment is not None:
+            segments.append(segment)
+            segment = segment.parent
+        segments.reverse()
+        return segments
+
+
+class ForkableConversationProvider(AbstractConversationProvider):
+    """
+    A conversation with cheap branching.
+
+    `fork` freezes the current history and starts a new segment for both the
+    original and the branch, so every branch shares the common prefix in memory
+    and only stores the messages appended after the fork.  Messages are shared
+    between branches and must not be mutated.
+    """
+
+    _head: _Segment = PrivateAttr(default_factory=lambda: _Segment(None))
+
+    def set_history(self, messages: list[Message]) -> None:
+        # keep every segment that is still a prefix of the new history
+        position = 0
+        for segment in self._head.chain():
+            own = segment.messages
+            matched = 0
+            for message, stored in zip(messages[position:], own):
+                if message is not stored:
+                    break
+                matched += 1
+            if matched < len(own):
+                if segment is self._head:
+                    del own[matched:]
+                else:
+                    # the divergence is in a shared segment, branch off its parent
+                    self._head = _Segment(segment.parent)
+                    matched = 0
+                position += matched
+                break
+            position += len(own)
+        self._head.messages.extend(messages[position:])
+
+    def add_message(self, message: Message) -> None:
+        self._head.messages.append(message)
+
+    def add_messages(self, messages: list[Message]) -> None:
+        self._head.messages.extend(messages)
+
+    def reset(self) -> None:
+        self._head = _Segment(None)
+
+    def get_history(self) -> list[Message]:
+        return [
+            message for segment in self._head.chain() for message in segment.messages
+        ]
+
+    def fork(self) -> Self:
+        shared = self._head if self._head.messages else self._head.parent
+        self._head = _Segment(shared)
+        branch = self.model_copy()
+        branch._head = _Segment(shared)
+        return branch
+
+    def __len__(self) -> int:
+        return len(self._head)
@@ -3,6 +3,7 @@ from typing import Any, Callable
 from fast_depends import Provider
 from pydantic import BaseModel, ConfigDict, Field
 
+from emp_agents.implicits import Provider as ScopedProvider
 from emp_agents.models import Message
 from emp_agents.models.protocol import SkillSet
 
@@ -22,38 +23,34 @@ class SkillsAgent(AgentBase):
             for tool in skill._tools:
                 self._add_tool(tool)
 
+        # overrides are set in the agent's own context, so they only apply to
+        # its tool calls, even with other agents running concurrently
+        with self._context.activate():
+            for scope, old, new in self.scopes:
+                if isinstance(scope, ScopedProvider):
+                    scope.scoped_override(old, new)
+
     async def _run_conversation(
         self,
         messages: list[Message],
         model: str,
         max_tokens: int | None = None,
+        temperature: float | None = None,
         response_format: type[BaseModel] | None = None,
+        **kwargs: Any,
     ) -> str:
-        for scope, old, new in self.scopes:
+        # a plain `fast_depends` provider can only be overridden process-wide
+        shared = [
+            (scope, old, new)
+            for scope, old, new in self.scopes
+            if not isinstance(scope, ScopedProvider)
+        ]
+        for scope, old, new in shared:
             scope.dependency_overrides[old] = new
-
-        response = await super()._run_conversation(
-            messages, model, max_tokens, response_format
-        )
-
-        for scope, old, new in self.scopes:
-            scope.dependency_overrides.pop(old, None)
-
-        return response
-
-    async def respond(
-        self,
-        question: str,
-        model: str | None = None,
-        max_tokens: int | None = None,
-        response_format: type[BaseModel] | None = None,
-    ) -> str:
-        for scope, old, new in self.scopes:
-            scope.dependency_overrides[old] = new
-
-        response = await super().respond(question, model, max_tokens, response_format)
-
-        for scope, old, new in self.scopes:
-            scope.dependency_overrides.pop(old, None)
-
-        return response
+        try:
+            return await super()._run_conversation(
+                messages, model, max_tokens, temperature, response_format, **kwargs
+            )
+        finally:
+            for scope, old, new in shared:
+                scope.dependency_overrides.pop(old, None)
@@ -0,0 +1,173 @@
+import sqlite3
+import uuid
+from typing import Any, Self
+
+from pydantic import Field, PrivateAttr
+
+from emp_agents.agents.windowed_history import WindowedConversationProvider
+from emp_agents.models import Message
+from emp_agents.models.shared.message import message_adapter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_session_seq ON messages (session_id, seq, id);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    length INTEGER NOT NULL
+);
+"""
+
+
+class SQLiteConversationProvider(WindowedConversationProvider):
+    """
+    A durable conversation store backed by SQLite in WAL mode.
+
+    The message table is append-only: every message is written once with its
+    position (`seq`) in the session, and the session row records the current
+    length.  Rewriting history, eg. replacing it with a summary, appends the new
+    messages over the old positions and shortens the length, so the latest row
+    for each position is the live one and older rows are kept as an archive.
+    The visible history therefore always starts at the last summary.
+
+    Writes are buffered and committed in one transaction by `flush`, which the
+    agent calls at the end of every turn.  `get_history(last_n=...)` reads only
+    the requested window and keeps it in memory, so long sessions are never
+    loaded in full.
+    """
+
+    path: str = Field(description="Path to the SQLite database file")
+    session_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    batch_size: int = Field(
+        default=100, description="Flush automatically once this many writes are pending"
+    )
+
+    _connection: sqlite3.Connection = PrivateAttr()
+    _length: int = PrivateAttr(default=0)
+    _stored_length: int = PrivateAttr(default=0)
+    _pending: list[tuple[int, str]] = PrivateAttr(default_factory=list)
+    # the messages at positions [_cache_start, _length), starting at the last window read
+    _cache: list[Message] = PrivateAttr(default_factory=list)
+    _cache_start: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+
+        row = self._connection.execute(
+            "SELECT length FROM sessions WHERE session_id = ?", (self.session_id,)
+        ).fetchone()
+        if row is None:
+            self._connection.execute(
+                "INSERT INTO sessions (session_id, length) VALUES (?, 0)",
+                (self.session_id,),
+            )
+        else:
+            self._length = self._stored_length = self._cache_start = row[0]
+
+    def _read(self, start: int, stop: int | None = None) -> list[Message]:
+        if stop is None:
+            stop = self._length
+        if start >= self._cache_start:
+            return self._cache[start - self._cache_start : stop - self._cache_start]
+
+        # pending writes are all in the cache, the rows before it are up to date
+        # SQLite returns the bare `payload` column from the row holding MAX(id)
+        rows = self._connection.execute(
+            """
+            SELECT payload, MAX(id) FROM messages
+            WHERE session_id = ? AND seq >= ? AND seq < ?
+            GROUP BY seq ORDER BY seq
+            """,
+            (self.session_id, start, min(stop, self._cache_start)),
+        ).fetchall()
+        messages = [message_adapter.validate_json(payload) for payload, _ in rows]
+        messages += self._cache[: max(0, stop - self._cache_start)]
+        if stop == self._length:
+            self._cache, self._cache_start = messages.copy(), start
+        return messages
+
+    def _matches(self, index: int, message: Message) -> bool:
+        return self._read(index, index + 1) == [message]
+
+    def _write(self, start: int, messages: list[Message]) -> None:
+        self._pending.extend(
+            (start + i, message.model_dump_json()) for i, message in enumerate(messages)
+        )
+        self._length = start + len(messages)
+        if start >= self._cache_start:
+            self._cache = self._cache[: start - self._cache_start] + messages
+        else:
+            self._cache, self._cache_start = list(messages), start
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending and self._length == self._stored_length:
+            return
+        with self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.executemany(
+                "INSERT INTO messages (session_id, seq, payload) VALUES (?, ?, ?)",
+                [(self.session_id, seq, payload) for seq, payload in self._pending],
+            )
+            self._connection.execute(
+                "UPDATE sessions SET length = ? WHERE session_id = ?",
+                (self._length, self.session_id),
+            )
+        self._pending.clear()
+        self._stored_length = self._length
+
+    def reset(self) -> None:
+        self._write(0, [])
+        self.flush()
+
+    def get_history(self, last_n: int | None = None) -> list[Message]:
+        self.flush()
+        history = super().get_history(last_n)
+        # only the messages from the window onwards are kept in memory
+        if self._view_start > self._cache_start:
+            self._cache = self._cache[self._view_start - self._cache_start :]
+            self._cache_start = self._view_start
+        return history
+
+    def fork(self) -> Self:
+        """A new session in the same database, starting with a copy of the history"""
+        self.flush()
+        session_id = uuid.uuid4().hex
+        with self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.execute(
+                """
+                INSERT INTO messages (session_id, seq, payload)
+                SELECT ?, seq, payload FROM messages
+                WHERE id IN (
+                    SELECT MAX(id) FROM messages
+                    WHERE session_id = ? AND seq < ?
+                    GROUP BY seq
+                )
+                ORDER BY seq
+                """,
+                (session_id, self.session_id, self._length),
+            )
+            self._connection.execute(
+                "INSERT INTO sessions (session_id, length) VALUES (?, ?)",
+                (session_id, self._length),
+            )
+        return type(self)(**{**self.model_dump(), "session_id": session_id})
+
+    def __len__(self) -> int:
+        return self._length
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
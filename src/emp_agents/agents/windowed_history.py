@@ -0,0 +1,98 @@
+from abc import abstractmethod
+
+from pydantic import Field, PrivateAttr
+
+from emp_agents.agents.history import AbstractConversationProvider
+from emp_agents.models import Message, SystemMessage, ToolMessage
+
+
+class WindowedConversationProvider(AbstractConversationProvider):
+    """
+    A conversation provider for histories too long to read in full on every turn.
+
+    `get_history(last_n=...)` returns only the most recent messages, `window` by
+    default.  The window is preceded by the system message and never starts
+    with a tool result, so it can be sent to a provider as is.  A window passed
+    back to `set_history` only replaces that window, from the first message that
+    changed, and `get_full_history` reads every message regardless of the window.
+
+    Subclasses store the messages, and implement `__len__`, `_read`, `_matches`
+    and `_write`.
+    """
+
+    window: int | None = Field(
+        default=None,
+        description="The default number of most recent messages returned by get_history",
+    )
+
+    # the position of the first message of the last window read
+    _view_start: int = PrivateAttr(default=0)
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @abstractmethod
+    def _read(self, start: int, stop: int | None = None) -> list[Message]:
+        """The messages at positions [start, stop), up to the last one by default"""
+
+    @abstractmethod
+    def _matches(self, index: int, message: Message) -> bool:
+        """Whether `message` is the one stored at position `index`"""
+
+    @abstractmethod
+    def _write(self, start: int, messages: list[Message]) -> None:
+        """Replace the messages from position `start` onwards"""
+
+    def set_history(self, messages: list[Message]) -> None:
+        start = self._view_start
+        offset = 0
+        if 0 < start < len(self):
+            if (
+                len(messages) > 1
+                and isinstance(messages[0], SystemMessage)
+                and self._matches(0, messages[0])
+                and self._matches(start, messages[1])
+            ):
+                # a window written back with its system message in front
+                messages = messages[1:]
+            if messages and self._matches(start, messages[0]):
+                # the caller is writing back the window it got from get_history
+                offset = start
+
+        # only write from the first position that differs from what is stored
+        unchanged = 0
+        for message in messages:
+            position = offset + unchanged
+            if position >= len(self) or not self._matches(position, message):
+                break
+            unchanged += 1
+        self._write(offset + unchanged, messages[unchanged:])
+
+    def add_message(self, message: Message) -> None:
+        self._write(len(self), [message])
+
+    def add_messages(self, messages: list[Message]) -> None:
+        self._write(len(self), messages)
+
+    def get_history(self, last_n: int | None = None) -> list[Message]:
+        if last_n is None:
+            last_n = self.window
+        length = len(self)
+        start = 0 if last_n is None else max(0, length - last_n)
+        # a tool result is never sent without the call it answers
+        while 0 < start < length and isinstance(
+            self._read(start, start + 1)[0], ToolMessage
+        ):
+            start -= 1
+        self._view_start = start
+
+        messages = self._read(start)
+        if start > 0:
+            (first,) = self._read(0, 1)
+            if isinstance(first, SystemMessage):
+                messages.insert(0, first)
+        return messages
+
+    def get_full_history(self) -> list[Message]:
+        """The whole history, whatever the window, eg. to summarize or export it"""
+        return self.get_history(last_n=len(self))
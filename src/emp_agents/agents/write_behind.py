@@ -0,0 +1,160 @@
+import asyncio
+from abc import ABC, abstractmethod
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from emp_agents.agents.history import AsyncAbstractConversationProvider
+from emp_agents.logger import logger
+from emp_agents.models import Message
+
+
+class ConversationStore(BaseModel, ABC):
+    """The remote side of a `WriteBehindConversationProvider`, eg. a database or an API"""
+
+    @abstractmethod
+    async def load(self) -> list[Message]: ...
+
+    @abstractmethod
+    async def append(self, messages: list[Message]) -> None: ...
+
+    @abstractmethod
+    async def replace(self, messages: list[Message]) -> None: ...
+
+
+class InMemoryConversationStore(ConversationStore):
+    """An in-process store, with an optional delay to stand in for a network round trip"""
+
+    latency: float = 0.0
+
+    _messages: list[Message] = PrivateAttr(default_factory=list)
+    _writes: int = PrivateAttr(default=0)
+
+    @property
+    def writes(self) -> int:
+        return self._writes
+
+    async def load(self) -> list[Message]:
+        await asyncio.sleep(self.latency)
+        return self._messages.copy()
+
+    async def append(self, messages: list[Message]) -> None:
+        await asyncio.sleep(self.latency)
+        self._messages.extend(messages)
+        self._writes += 1
+
+    async def replace(self, messages: list[Message]) -> None:
+        await asyncio.sleep(self.latency)
+        self._messages = messages.copy()
+        self._writes += 1
+
+
+class WriteBehindConversationProvider(AsyncAbstractConversationProvider):
+    """
+    Serves the conversation from memory and writes it to a `ConversationStore` in
+    the background.
+
+    Appends are buffered and sent as one batch after `flush_interval` seconds, or
+    immediately once `max_batch` messages are waiting.  Rewrites of the history,
+    eg. a summary, are sent as a replace and ordered with the appends around them.
+    `flush` waits until everything written so far has reached the store.
+    """
+
+    store: ConversationStore
+    flush_interval: float = Field(default=0.05, ge=0)
+    max_batch: int = Field(default=64, gt=0)
+
+    _history: list[Message] | None = PrivateAttr(default=None)
+    # pending writes in order, as ("append" | "replace", messages)
+    _operations: list[tuple[str, list[Message]]] = PrivateAttr(default_factory=list)
+    _pending: int = PrivateAttr(default=0)
+    _wakeup: asyncio.Event | None = PrivateAttr(default=None)
+    _worker: asyncio.Task | None = PrivateAttr(default=None)
+    _lock: asyncio.Lock | None = PrivateAttr(default=None)
+
+    async def _load(self) -> list[Message]:
+        if self._history is None:
+            self._history = await self.store.load()
+        return self._history
+
+    def _enqueue(self, operation: str, messages: list[Message]) -> None:
+        if operation == "replace":
+            # a replace supersedes every write that has not been sent yet
+            self._operations = [(operation, messages.copy())]
+        elif self._operations:
+            # coalesce consecutive writes, an append after a replace extends it
+            last_operation, last_messages = self._operations[-1]
+            self._operations[-1] = (last_operation, last_messages + messages)
+        else:
+            self._operations.append((operation, messages.copy()))
+        self._pending = sum(len(batch) for _, batch in self._operations)
+
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._lock = asyncio.Lock()
+            self._worker = asyncio.create_task(self._flush_loop())
+        assert self._wakeup is not None
+        self._wakeup.set()
+
+    async def _flush_loop(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            await self._wakeup.wait()
+            if self._pending < self.max_batch:
+                await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                await self._drain()
+            except Exception as e:
+                logger.error(f"Failed to write conversation, will retry: {e}")
+                await asyncio.sleep(self.flush_interval)
+                self._wakeup.set()
+
+    async def _drain(self) -> None:
+        if self._lock is None:
+            return
+        async with self._lock:
+            while self._operations:
+                operation, messages = self._operations.pop(0)
+                self._pending -= len(messages)
+                try:
+                    if operation == "append":
+                        await self.store.append(messages)
+                    else:
+                        await self.store.replace(messages)
+                except BaseException:
+                    self._operations.insert(0, (operation, messages))
+                    self._pending += len(messages)
+                    raise
+
+    async def set_history(self, messages: list[Message]) -> None:
+        history = await self._load()
+        if messages[: len(history)] == history:
+            await self.add_messages(messages[len(history) :])
+            return
+        self._history = messages.copy()
+        self._enqueue("replace", messages)
+
+    async def add_message(self, message: Message) -> None:
+        await self.add_messages([message])
+
+    async def add_messages(self, messages: list[Message]) -> None:
+        if not messages:
+            return
+        history = await self._load()
+        history.extend(messages)
+        self._enqueue("append", messages)
+
+    async def reset(self) -> None:
+        await self.set_history([])
+
+    async def get_history(self) -> list[Message]:
+        return (await self._load()).copy()
+
+    async def flush(self) -> None:
+        await self._drain()
+
+    async def aclose(self) -> None:
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
@@ -1,3 +1,8 @@
+from collections.abc import Sequence
+
+from pydantic_core import ErrorDetails
+
+
 class TooManyTriesException(BaseException):
     pass
 
@@ -8,3 +13,20 @@ class InvalidModelException(BaseException):
 
 class DuplicateToolException(BaseException):
     """This happens if two tools with the same name are added"""
+
+
+class InvalidToolArgumentsException(BaseException):
+    """The arguments a model passed to a tool do not match its signature"""
+
+    def __init__(self, tool_name: str, errors: Sequence[ErrorDetails]):
+        super().__init__(f"Invalid arguments for {tool_name}: {errors}")
+        self.tool_name = tool_name
+        self.errors = errors
+
+
+class MCPConnectionException(BaseException):
+    """The connection to an MCP server could not be opened or was lost"""
+
+
+class MCPPoolSaturatedException(BaseException):
+    """Too many calls are already waiting for an MCP server"""
@@ -1,9 +1,11 @@
 from typing import Any, Callable, ParamSpec, TypeVar
 
-from fast_depends import Depends, Provider, inject
+from fast_depends import Depends, inject
 
+from .context import AgentContext, ScopedValue, current_context
 from .manager import ImplicitManager
 from .models import IgnoreDepends as IgnoreDependsModel
+from .provider import Provider, ScopedOverrides
 
 P = ParamSpec("P")
 T = TypeVar("T")
@@ -26,15 +28,20 @@ def set_implicit(name: str, implicit: Any):
     ImplicitManager.add_implicit(name, implicit)
 
 
-def lazy_implicit(name: str) -> Callable[P, T] | T:
-    return ImplicitManager.lazy_implicit(name)
+def lazy_implicit(name: str, cache: bool = False) -> Callable[P, T] | T:
+    return ImplicitManager.lazy_implicit(name, cache=cache)
 
 
 __all__ = [
+    "AgentContext",
     "Depends",
     "ImplicitManager",
     "IgnoreDepends",
     "Provider",
+    "ScopedOverrides",
+    "ScopedValue",
+    "current_context",
     "inject",
+    "lazy_implicit",
     "set_implicit",
 ]
@@ -0,0 +1,103 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class AgentContext:
+    """
+    State scoped to an agent: its implicits, and values such as the selected
+    network or wallet.
+
+    The active context is held in a contextvar, so it follows the agent's task
+    into the tasks and threads it starts, eg. tools run with `asyncio.gather` or
+    `asyncio.to_thread`.  The context itself is mutable, so a value set by one
+    tool is seen by the agent's later tool calls, while agents running
+    concurrently each see only their own.  Lookups fall back to the parent
+    context, and the root context holds the process-wide defaults.
+    """
+
+    __slots__ = ("parent", "values", "implicits", "_resolved")
+
+    def __init__(self, parent: "AgentContext | None" = None):
+        self.parent = parent
+        self.values: dict[str, Any] = {}
+        self.implicits: dict[str, Any] = {}
+        # the implicit each value was resolved from, so replacing it invalidates
+        self._resolved: dict[str, tuple[Any, Any]] = {}
+
+    def child(self) -> "AgentContext":
+        return AgentContext(parent=self)
+
+    def get_value(self, name: str, default: Any = None) -> Any:
+        context: AgentContext | None = self
+        while context is not None:
+            value = context.values.get(name, _MISSING)
+            if value is not _MISSING:
+                return value
+            context = context.parent
+        return default
+
+    def set_value(self, name: str, value: Any) -> None:
+        self.values[name] = value
+
+    def get_implicit(self, name: str) -> Any:
+        context: AgentContext | None = self
+        while context is not None:
+            implicit = context.implicits.get(name, _MISSING)
+            if implicit is not _MISSING:
+                return implicit
+            context = context.parent
+        raise KeyError(name)
+
+    def add_implicit(self, name: str, implicit: Any) -> None:
+        self.implicits[name] = implicit
+
+    def resolve(self, name: str) -> Any:
+        """Call a callable implicit once per context, later calls reuse its result"""
+        implicit = self.get_implicit(name)
+        cached = self._resolved.get(name)
+        if cached is not None and cached[0] is implicit:
+            return cached[1]
+        value = implicit() if callable(implicit) else implicit
+        self._resolved[name] = (implicit, value)
+        return value
+
+    @contextmanager
+    def activate(self) -> Iterator["AgentContext"]:
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+
+root_context = AgentContext()
+_current: ContextVar[AgentContext] = ContextVar(
+    "emp_agents_context", default=root_context
+)
+
+
+def current_context() -> AgentContext:
+    return _current.get()
+
+
+class ScopedValue(Generic[T]):
+    """
+    A value stored in the active `AgentContext`, with the interface of a
+    `ContextVar`.  Outside of an agent it is process-wide.
+    """
+
+    def __init__(self, name: str, default: T):
+        self.name = name
+        self.default = default
+
+    def get(self) -> T:
+        return current_context().get_value(self.name, self.default)
+
+    def set(self, value: T) -> None:
+        current_context().set_value(self.name, value)
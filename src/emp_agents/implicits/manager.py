@@ -1,27 +1,39 @@
 from collections.abc import Callable
 from typing import Any
 
+from .context import current_context, root_context
+
 
 class ImplicitManager:
-    implicits: dict[str, Any] = {}
+    # the process-wide implicits, agents add theirs to their own context
+    implicits: dict[str, Any] = root_context.implicits
 
     @classmethod
     def get_implicit(cls, name: str):
-        """Get an implicit argument by name"""
-        if name not in cls.implicits:
+        """Get an implicit argument by name, from the active agent's context"""
+        try:
+            return current_context().get_implicit(name)
+        except KeyError:
             raise ValueError(f"Implicit {name} not found")
-        return cls.implicits[name]
 
     @classmethod
     def add_implicit(cls, name: str, implicit: Any):
-        """Adds a new implicit argument"""
-        cls.implicits[name] = implicit
+        """Adds a new implicit argument to the active agent's context"""
+        current_context().add_implicit(name, implicit)
 
     @classmethod
-    def lazy_implicit(cls, name: str) -> Callable[..., Any] | Any:
-        """Create a lazy implicit that can be resolved later"""
+    def lazy_implicit(cls, name: str, cache: bool = False) -> Callable[..., Any] | Any:
+        """
+        Create a lazy implicit that can be resolved later.  With `cache` set, a
+        callable implicit is only called once per agent and its result reused.
+        """
 
         def _get_implicit(*args, **kwargs) -> Any:
+            if cache and not (args or kwargs):
+                try:
+                    return current_context().resolve(name)
+                except KeyError:
+                    raise ValueError(f"Implicit {name} not found")
             imp = cls.get_implicit(name)
             if callable(imp):
                 return imp(*args, **kwargs)
@@ -0,0 +1,90 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from itertools import count
+from typing import Any
+
+from fast_depends import Provider as BaseProvider
+
+from .context import ScopedValue, current_context
+
+_provider_ids = count()
+
+
+class ScopedOverrides(dict):
+    """
+    The overrides of a `Provider`: the process-wide ones it holds, under those
+    set in the active `AgentContext`.
+
+    `fast_depends` keeps a reference to this mapping when a function is
+    decorated with `inject`, and looks each dependency up in it on every call,
+    so the layer of the calling agent is the one used.
+    """
+
+    def __init__(self, layer: ScopedValue[dict[Callable, Callable] | None]):
+        super().__init__()
+        self.layer = layer
+
+    def _scoped(self) -> dict[Callable, Callable]:
+        return self.layer.get() or {}
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        scoped = self._scoped()
+        if key in scoped:
+            return scoped[key]
+        return super().get(key, default)
+
+    def __getitem__(self, key: Any) -> Any:
+        scoped = self._scoped()
+        if key in scoped:
+            return scoped[key]
+        return super().__getitem__(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._scoped() or super().__contains__(key)
+
+    def __len__(self) -> int:
+        # `fast_depends` skips the lookup when the overrides are empty
+        return super().__len__() + len(self._scoped())
+
+
+class Provider(BaseProvider):
+    """
+    A `fast_depends` provider whose overrides can be scoped to an agent.
+
+    `override` and `scope` change the dependency for the whole process, as with
+    `fast_depends`.  `scoped_override` changes it only for the active
+    `AgentContext`, so concurrent agents can each use their own, and
+    `scoped` does so for a block of code, in the current task only.
+    """
+
+    dependency_overrides: ScopedOverrides
+
+    def __init__(self) -> None:
+        self.dependency_overrides = ScopedOverrides(
+            ScopedValue(f"dependency_overrides:{next(_provider_ids)}", None)
+        )
+
+    def clear(self) -> None:
+        # cleared in place, `inject` holds on to the mapping
+        self.dependency_overrides.clear()
+
+    def scoped_override(
+        self,
+        original: Callable[..., Any],
+        override: Callable[..., Any],
+    ) -> None:
+        """Override a dependency in the active context, eg. for one agent"""
+        layer = self.dependency_overrides.layer
+        # copied so the parent context's overrides are left unchanged
+        layer.set({**(layer.get() or {}), original: override})
+
+    @contextmanager
+    def scoped(
+        self,
+        original: Callable[..., Any],
+        override: Callable[..., Any],
+    ) -> Iterator[None]:
+        """Override a dependency for the block, in this task and those it starts"""
+        with current_context().child().activate():
+            self.scoped_override(original, override)
+            yield
@@ -1,5 +1,7 @@
 from . import rag
+from .pipeline import MiddlewarePipeline
 
 __all__ = [
+    "MiddlewarePipeline",
     "rag",
 ]
@@ -0,0 +1,73 @@
+import asyncio
+from typing import TYPE_CHECKING, Any, Awaitable, Sequence
+
+from emp_agents.logger import logger
+from emp_agents.models.middleware import Middleware, MiddlewareMode, append_context
+
+if TYPE_CHECKING:
+    from emp_agents.models import Message
+
+
+class MiddlewarePipeline:
+    """
+    Runs middleware in declaration order, concurrently where it is safe.
+
+    Consecutive `read` middleware form a stage that runs concurrently on the same
+    snapshot of the conversation; their contributions are appended to the latest
+    message in declaration order, so the result does not depend on which finished
+    first.  A `rewrite` middleware is a barrier: it runs alone and sees the output
+    of every middleware declared before it.  A middleware that exceeds its
+    `timeout` is skipped for the turn.
+    """
+
+    def __init__(self, middleware: Sequence[Middleware]):
+        self.stages: list[list[Middleware]] = []
+        for item in middleware:
+            if (
+                item.mode == MiddlewareMode.read
+                and self.stages
+                and self.stages[-1][0].mode == MiddlewareMode.read
+            ):
+                self.stages[-1].append(item)
+            else:
+                self.stages.append([item])
+
+    @staticmethod
+    async def _run(middleware: Middleware, coro: Awaitable[Any]) -> tuple[bool, Any]:
+        try:
+            return True, await asyncio.wait_for(coro, timeout=middleware.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f'Middleware "{middleware.name}" timed out after {middleware.timeout}s, skipping'
+            )
+            return False, None
+
+    async def run(self, messages: list["Message"]) -> list["Message"]:
+        conversation = messages
+        for stage in self.stages:
+            if stage[0].mode == MiddlewareMode.rewrite:
+                (middleware,) = stage
+                ok, result = await self._run(
+                    middleware, self._maybe_await(middleware.process(conversation))
+                )
+                if ok:
+                    conversation = result
+                continue
+
+            snapshot = list(conversation)
+            results = await asyncio.gather(
+                *[
+                    self._run(middleware, middleware.contribute(snapshot))
+                    for middleware in stage
+                ]
+            )
+            conversation = append_context(
+                conversation, [result for ok, result in results if ok and result]
+            )
+        return conversation
+
+    @staticmethod
+    async def _maybe_await(result: Any) -> Any:
+        if isinstance(result, Awaitable):
+            return await result
+        return result
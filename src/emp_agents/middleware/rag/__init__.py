@@ -1,5 +1,20 @@
+from typing import TYPE_CHECKING, Any
+
 from .ragie import Ragie
 
+if TYPE_CHECKING:
+    from .local import LocalRag
+
 __all__ = [
+    "LocalRag",
     "Ragie",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # numpy is only loaded when the local index is used, it is in the `rag` extra
+    if name == "LocalRag":
+        from .local import LocalRag
+
+        return LocalRag
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,24 +1,31 @@
 from abc import abstractmethod
 from typing import TYPE_CHECKING
 
-from emp_agents.models.middleware import Middleware
+from emp_agents.models.middleware import Middleware, MiddlewareMode, append_context
 
 if TYPE_CHECKING:
     from emp_agents.agents.base import Message
 
 
 class Rag(Middleware):
+    mode: MiddlewareMode = MiddlewareMode.read
+
     @abstractmethod
     async def get_context(self, query: str) -> str: ...
 
-    async def process(self, messages: list["Message"]) -> list["Message"]:
+    async def contribute(self, messages: list["Message"]) -> str | None:
         if len(messages) == 0:
-            return messages
+            return None
 
         message = messages[-1]
         if message.content is None:
-            return messages
+            return None
 
         context = await self.get_context(message.content)
-        message.content += f"\n\nThe Following Context is retrieved from relevant datasources:\n\n{context}"
-        return messages
+        return f"\n\nThe Following Context is retrieved from relevant datasources:\n\n{context}"
+
+    async def process(self, messages: list["Message"]) -> list["Message"]:
+        context = await self.contribute(messages)
+        if context is None:
+            return messages
+        return append_context(messages, [context])
@@ -0,0 +1,72 @@
+import hashlib
+import os
+import re
+from abc import ABC, abstractmethod
+
+import httpx
+import numpy as np
+from pydantic import BaseModel, Field
+
+_WORD = re.compile(r"\w+")
+
+
+class EmbeddingProvider(BaseModel, ABC):
+    """Turns texts into L2-normalized float32 vectors of `dimensions` length"""
+
+    dimensions: int
+
+    @abstractmethod
+    async def embed(self, texts: list[str]) -> np.ndarray: ...
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (vectors / norms).astype(np.float32)
+
+
+class HashingEmbedder(EmbeddingProvider):
+    """
+    A local, deterministic bag-of-words embedder using signed feature hashing.
+    It needs no model or network access, and gives the same vectors in every process.
+    """
+
+    dimensions: int = 256
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for word in _WORD.findall(text.lower()):
+            digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        return vector
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        return normalize(np.stack([self._embed_one(text) for text in texts]))
+
+
+class OpenAIEmbedder(EmbeddingProvider):
+    URL: str = "https://api.openai.com/v1/embeddings"
+
+    api_key: str = Field(default_factory=lambda: os.environ["OPENAI_API_KEY"])
+    model: str = "text-embedding-3-small"
+    dimensions: int = 1536
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                self.URL,
+                json={
+                    "model": self.model,
+                    "input": texts,
+                    "dimensions": self.dimensions,
+                },
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=None,
+            )
+        if response.status_code >= 400:
+            raise ValueError(response.json())
+        rows = sorted(response.json()["data"], key=lambda row: row["index"])
+        return normalize(np.array([row["embedding"] for row in rows], dtype=np.float32))
@@ -0,0 +1,42 @@
+from pydantic import Field, PrivateAttr
+
+from ._type import Rag
+from .embeddings import EmbeddingProvider, HashingEmbedder
+from .vector_index import VectorIndex
+
+
+class LocalRag(Rag):
+    name: str = "Local RAG Middleware"
+    description: str = (
+        "This middleware retrieves context from an in-process vector index."
+    )
+
+    index_path: str = Field(description="The directory the vector index is stored in")
+    embedder: EmbeddingProvider = Field(default_factory=HashingEmbedder)
+    num_chunks: int = Field(3, description="The number of chunks to retrieve")
+    min_score: float = Field(
+        0.0, description="Chunks scoring at or below this similarity are dropped"
+    )
+
+    _index: VectorIndex = PrivateAttr()
+
+    def model_post_init(self, __context) -> None:
+        self._index = VectorIndex(self.index_path, self.embedder.dimensions)
+        return super().model_post_init(__context)
+
+    @property
+    def index(self) -> VectorIndex:
+        return self._index
+
+    async def add_documents(self, texts: list[str]) -> None:
+        """Embed and append documents to the index, they are searchable immediately"""
+        self._index.add(texts, await self.embedder.embed(texts))
+
+    async def get_context(self, query: str) -> str:
+        (embedding,) = await self.embedder.embed([query])
+        chunks = [
+            text
+            for score, text in self._index.search(embedding, self.num_chunks)
+            if score > self.min_score
+        ]
+        return "\n-------\n".join(chunks)
@@ -1,11 +1,17 @@
+import asyncio
 import os
-from typing import ClassVar
+from typing import Any, ClassVar
 
 import httpx
-from pydantic import Field
+from pydantic import Field, PrivateAttr
+
+from emp_agents.logger import logger
+from emp_agents.utils.cache import TTLCache
 
 from ._type import Rag
 
+CacheKey = tuple[str | None, str]
+
 
 class Ragie(Rag):
     name: str = "Ragie Middleware"
@@ -22,6 +28,21 @@ class Ragie(Rag):
         default=None, description="The partition to use for the Ragie API"
     )
     num_chunks: int = Field(1, description="The number of chunks to retrieve")
+    cache_ttl: float | None = Field(
+        default=300, description="Seconds a retrieval is reused for the same query"
+    )
+    cache_size: int = Field(
+        default=256, description="The number of retrievals kept in the cache"
+    )
+
+    _client: httpx.AsyncClient | None = PrivateAttr(default=None)
+    _client_loop: asyncio.AbstractEventLoop | None = PrivateAttr(default=None)
+    _cache: TTLCache[CacheKey, Any] = PrivateAttr()
+    _inflight: dict[CacheKey, asyncio.Task] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context) -> None:
+        self._cache = TTLCache(maxsize=self.cache_size, ttl=self.cache_ttl)
+        return super().model_post_init(__context)
 
     async def get_context(self, query: str) -> str:
         context = await self.retrieve(query)
@@ -32,20 +53,86 @@ class Ragie(Rag):
         data = "\n-------\n".join(c["text"] for c in chunks[: self.num_chunks])
         return data
 
+    def prefetch(self, query: str) -> asyncio.Future:
+        """
+        Start retrieving context for a query without waiting for it.
+        A later `retrieve` for the same query reuses the in-flight request, so this
+        can be called as soon as the query is known to take retrieval off the
+        critical path.  A cached query is not fetched again.
+        """
+        key = (self.partition, query)
+        cached = self._cache.get(key)
+        if cached is not None:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(cached)
+            return future
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._prefetched(key, done))
+        return task
+
+    def _prefetched(self, key: CacheKey, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        # retrieved here, so a prefetch nobody awaits does not warn when it fails
+        if not task.cancelled() and (error := task.exception()) is not None:
+            logger.warning(f"Prefetching Ragie context failed: {error!r}")
+
     async def retrieve(self, query: str):
+        key = (self.partition, query)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        return await asyncio.shield(self.prefetch(query))
+
+    async def _fetch(self, key: CacheKey):
+        partition, query = key
         payload = {"query": query}
 
-        if self.partition:
-            payload["partition"] = self.partition
+        if partition:
+            payload["partition"] = partition
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self._build_url("retrievals"),
-                json=payload,
-                headers=self._make_headers(),
+        response = await self._get_client().post(
+            self._build_url("retrievals"),
+            json=payload,
+            headers=self._make_headers(),
+        )
+
+        result = response.json()
+        if response.is_success:
+            self._cache.set(key, result)
+        return result
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # pooled connections are bound to the event loop they were opened on
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._client_loop not in (None, loop):
+            self._discard(self._client, self._client_loop)
+            self._client = None
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=10),
+                timeout=httpx.Timeout(30.0),
             )
+        self._client_loop = loop
+        return self._client
+
+    @staticmethod
+    def _discard(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+        """Close a client of another event loop, on that loop"""
+        if loop.is_closed():
+            # a closed loop closed the connections' transports
+            return
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
 
-        return response.json()
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
 
     def _make_headers(self, content_type: str = "application/json"):
         headers = {
@@ -0,0 +1,134 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+class VectorIndex:
+    """
+    An exact (brute-force) cosine similarity index stored in a directory.
+
+    Embeddings are appended to a raw float32 file and read through `np.memmap`,
+    so several worker processes searching the same index share one copy in the
+    OS page cache.  `meta.json` holds the committed row count and size of the
+    documents file and is written last, which lets readers pick up rows added
+    by a writer without ever seeing a partial append, and lets the next `add`
+    discard what an interrupted one left behind.  Only one process should add
+    to an index at a time.
+    """
+
+    def __init__(self, path: Path | str, dimensions: int):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dimensions = dimensions
+
+        self._embeddings_path = self.path / "embeddings.f32"
+        self._documents_path = self.path / "documents.jsonl"
+        self._meta_path = self.path / "meta.json"
+
+        self._matrix: np.ndarray | None = None
+        self._offsets: list[int] = []
+
+        if self._meta_path.exists():
+            meta = json.loads(self._meta_path.read_text())
+            if meta["dimensions"] != dimensions:
+                raise ValueError(
+                    f"Index at {self.path} has {meta['dimensions']} dimensions, not {dimensions}"
+                )
+        else:
+            self._write_meta(0, 0)
+
+    def _read_meta(self) -> dict:
+        return json.loads(self._meta_path.read_text())
+
+    def _write_meta(self, count: int, documents_size: int) -> None:
+        tmp = self._meta_path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "dimensions": self.dimensions,
+                    "count": count,
+                    "documents_size": documents_size,
+                }
+            )
+        )
+        os.replace(tmp, self._meta_path)
+
+    def _documents_size(self, meta: dict) -> int:
+        if "documents_size" in meta:
+            return meta["documents_size"]
+        # indexes written before the size was recorded
+        if not meta["count"]:
+            return 0
+        with open(self._documents_path, "rb") as f:
+            for _ in range(meta["count"]):
+                f.readline()
+            return f.tell()
+
+    def __len__(self) -> int:
+        return self._read_meta()["count"]
+
+    def _load(self) -> np.ndarray:
+        count = len(self)
+        if self._matrix is None or self._matrix.shape[0] != count:
+            self._matrix = (
+                np.memmap(
+                    self._embeddings_path,
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(count, self.dimensions),
+                )
+                if count
+                else np.zeros((0, self.dimensions), dtype=np.float32)
+            )
+            self._load_offsets(count)
+        return self._matrix
+
+    def _load_offsets(self, count: int) -> None:
+        if len(self._offsets) >= count:
+            return
+        with open(self._documents_path, "rb") as f:
+            if self._offsets:
+                f.seek(self._offsets[-1])
+                f.readline()
+            while len(self._offsets) < count:
+                self._offsets.append(f.tell())
+                f.readline()
+
+    def add(self, texts: list[str], embeddings: np.ndarray) -> None:
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if embeddings.shape != (len(texts), self.dimensions):
+            raise ValueError(
+                f"Expected embeddings of shape {(len(texts), self.dimensions)}, got {embeddings.shape}"
+            )
+        meta = self._read_meta()
+        count = meta["count"]
+        documents_size = self._documents_size(meta)
+        # both files are cut back to the last commit, dropping any rows of an
+        # interrupted add
+        with open(self._embeddings_path, "ab") as f:
+            f.truncate(count * self.dimensions * 4)
+            f.write(embeddings.tobytes())
+        with open(self._documents_path, "ab") as f:
+            f.truncate(documents_size)
+            for text in texts:
+                f.write(json.dumps({"text": text}).encode() + b"\n")
+            documents_size = f.tell()
+        self._write_meta(count + len(texts), documents_size)
+
+    def document(self, row: int) -> str:
+        with open(self._documents_path, "rb") as f:
+            f.seek(self._offsets[row])
+            return json.loads(f.readline())["text"]
+
+    def search(self, query: np.ndarray, k: int = 3) -> list[tuple[float, str]]:
+        matrix = self._load()
+        if matrix.shape[0] == 0:
+            return []
+
+        scores = matrix @ np.asarray(query, dtype=np.float32).reshape(-1)
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(float(scores[row]), self.document(int(row))) for row in top]
@@ -1,22 +1,36 @@
 from emp_agents.models.shared.tools import FunctionTool, GenericTool, MCPTool, Property
 
-from .middleware import Middleware
+from .middleware import Middleware, MiddlewareMode
 from .provider import Provider, ResponseT
 from .shared import (
     AssistantMessage,
+    ChainOutput,
     Message,
+    OffloadOutput,
+    ProjectOutput,
     Request,
     Role,
     SystemMessage,
     ToolCall,
     ToolMessage,
+    ToolOutputPolicy,
+    ToolOutputStore,
+    TruncateOutput,
     UserMessage,
+    dump_messages,
+    export_messages,
+    import_messages,
+    load_messages,
 )
+from .tool_selector import BM25ToolSelector, ToolSelector
 
 __all__ = [
+    "BM25ToolSelector",
+    "ChainOutput",
     "GenericTool",
     "Message",
     "Middleware",
+    "MiddlewareMode",
     "Property",
     "Provider",
     "Request",
@@ -29,4 +43,14 @@ __all__ = [
     "ToolCall",
     "ToolMessage",
     "FunctionTool",
+    "ToolSelector",
+    "OffloadOutput",
+    "ProjectOutput",
+    "ToolOutputPolicy",
+    "ToolOutputStore",
+    "TruncateOutput",
+    "dump_messages",
+    "export_messages",
+    "import_messages",
+    "load_messages",
 ]
@@ -1,17 +1,54 @@
 from abc import ABC, abstractmethod
+from enum import StrEnum
 from typing import TYPE_CHECKING, Awaitable
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 if TYPE_CHECKING:
     from emp_agents.models import Message
 
 
+def append_context(
+    messages: list["Message"], contributions: list[str]
+) -> list["Message"]:
+    """Append context to the latest message, without mutating the original message"""
+    if not messages or not contributions:
+        return messages
+    message = messages[-1]
+    if message.content is None:
+        return messages
+    content = message.content + "".join(contributions)
+    return messages[:-1] + [message.model_copy(update={"content": content})]
+
+
+class MiddlewareMode(StrEnum):
+    read = "read"
+    rewrite = "rewrite"
+
+
 class Middleware(BaseModel, ABC):
     name: str
     description: str
+    mode: MiddlewareMode = Field(
+        default=MiddlewareMode.rewrite,
+        description=(
+            "`read` middleware only contribute context and run concurrently with their "
+            "neighbours, `rewrite` middleware may change the messages and run alone"
+        ),
+    )
+    timeout: float | None = Field(
+        default=None,
+        description="Seconds to wait for this middleware before skipping it for the turn",
+    )
 
     @abstractmethod
     async def process(
         self, messages: list["Message"]
     ) -> Awaitable[list["Message"]] | list["Message"]: ...
+
+    async def contribute(self, messages: list["Message"]) -> str | None:
+        """
+        The context a `read` middleware adds to the latest message, if any.
+        It must not modify `messages`, the pipeline merges the contributions.
+        """
+        return None
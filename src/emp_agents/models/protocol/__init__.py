@@ -1,9 +1,17 @@
 from emp_agents.models.protocol.decorators import (
     cachable,
     onchain_action,
+    output_policy,
     tool_method,
     view_action,
 )
 from emp_agents.models.protocol.skill_set import SkillSet
 
-__all__ = ["SkillSet", "cachable", "tool_method", "onchain_action", "view_action"]
+__all__ = [
+    "SkillSet",
+    "cachable",
+    "tool_method",
+    "onchain_action",
+    "output_policy",
+    "view_action",
+]
@@ -1,4 +1,7 @@
-from typing import Awaitable, Callable
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+if TYPE_CHECKING:
+    from emp_agents.models.shared.tool_output import ToolOutputPolicy
 
 StrCallable = Callable[..., str | Awaitable[str]]
 
@@ -81,6 +84,26 @@ def view_action(func: StrCallable):
     return method
 
 
+def output_policy(policy: "ToolOutputPolicy"):
+    """Decorator that sets how a tool's output is placed into the conversation.
+
+    Use this for tools that return large payloads, to truncate, project or
+    offload their output instead of resending it on every turn.
+
+    Args:
+        policy: The output policy to apply to the tool's results
+
+    Returns:
+        A decorator that attaches the policy to the method
+    """
+
+    def decorator(func: StrCallable):
+        setattr(func, "_output_policy", policy)
+        return func
+
+    return decorator
+
+
 def cachable(func: StrCallable):
     """Decorator that caches the results of a method."""
     cache = {}
@@ -1,22 +1,35 @@
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar
 
 from emp_agents.models import GenericTool
 
+if TYPE_CHECKING:
+    from emp_agents.models.protocol.skill_set import SkillSet
+
 
 class ToolRegistry:
     """Registry to store tool class and method information."""
 
-    _registry: ClassVar[dict[str, type]] = {}
+    _registry: ClassVar[dict[str, type["SkillSet"]]] = {}
 
     @classmethod
-    def register_class(cls, tool_class: type) -> None:
+    def register_class(cls, tool_class: type["SkillSet"]) -> None:
         """Register a tool class and collect its decorated methods."""
         class_name = tool_class.__name__
         cls._registry[class_name] = tool_class
 
+    @classmethod
+    def get_skill_names(cls) -> list[str]:
+        return list(cls._registry)
+
+    @classmethod
+    def get_tool_names(cls, skill_name: str) -> list[str]:
+        """The names of a skill's tools, without building them"""
+        return cls._registry[skill_name].tool_names()
+
     @classmethod
     def get_tool(cls, skill_name: str, tool_name: str) -> GenericTool:
-        return cls._registry[skill_name]._tools_map[tool_name]
+        """Only the requested tool is built, not every tool of the skill"""
+        return cls._registry[skill_name]._load_tool(tool_name)
 
     @classmethod
     def get_skill(cls, skill_name: str) -> list[GenericTool]:
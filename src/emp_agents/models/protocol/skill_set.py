@@ -1,4 +1,4 @@
-from typing import ClassVar
+from typing import Any, Callable, ClassVar
 
 from pydantic import BaseModel, PrivateAttr
 
@@ -6,9 +6,28 @@ from emp_agents.models import FunctionTool, GenericTool
 from emp_agents.models.protocol.registry import ToolRegistry
 
 
+class _LazyTools:
+    """
+    Builds a skill's tools on first access, so importing a skill does not pay for
+    introspecting the schema of every tool.  Once built, the value is stored on
+    the skill class and replaces this descriptor.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type["SkillSet"]) -> Any:
+        tools_map = {name: owner._load_tool(name) for name in owner._tool_methods}
+        type.__setattr__(owner, "_tools_map", tools_map)
+        type.__setattr__(owner, "_tools", list(tools_map.values()))
+        return getattr(owner, self.name)
+
+
 class SkillSet(BaseModel):
     _tools_map: ClassVar[dict[str, GenericTool]] = PrivateAttr(default_factory=dict)
     _tools: ClassVar[list[GenericTool]] = PrivateAttr(default_factory=list)
+    _tool_methods: ClassVar[dict[str, Callable[..., Any]]] = {}
+    _loaded_tools: ClassVar[dict[str, GenericTool]] = {}
 
     async def setup(self):
         """Any setup commands post init"""
@@ -16,15 +35,29 @@ class SkillSet(BaseModel):
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
 
-        cls._tools_map = {}
-
-        items = cls.__dict__.values()
-        for method in items:
-            if hasattr(method, "_is_tool_method"):
-                cls._tools_map[method.__name__] = FunctionTool.from_func(method)
-
-        cls._tools = list(cls._tools_map.values())
+        cls._tool_methods = {
+            method.__name__: method
+            for method in cls.__dict__.values()
+            if hasattr(method, "_is_tool_method")
+        }
+        cls._loaded_tools = {}
+        for name in ["_tools_map", "_tools"]:
+            lazy_tools = _LazyTools()
+            lazy_tools.__set_name__(cls, name)
+            type.__setattr__(cls, name, lazy_tools)
         ToolRegistry.register_class(cls)
 
+    @classmethod
+    def tool_names(cls) -> list[str]:
+        """The names of the skill's tools, without building them"""
+        return list(cls._tool_methods)
+
+    @classmethod
+    def _load_tool(cls, name: str) -> GenericTool:
+        """Builds a single tool of the skill, without building the others"""
+        if name not in cls._loaded_tools:
+            cls._loaded_tools[name] = FunctionTool.from_func(cls._tool_methods[name])
+        return cls._loaded_tools[name]
+
     def __iter__(self):
         return iter(self._tools)
@@ -8,10 +8,25 @@ from emp_agents.models.shared.message import (
     UserMessage,
 )
 from emp_agents.models.shared.request import Request
+from emp_agents.models.shared.serialization import (
+    dump_messages,
+    export_messages,
+    import_messages,
+    load_messages,
+)
+from emp_agents.models.shared.tool_output import (
+    ChainOutput,
+    OffloadOutput,
+    ProjectOutput,
+    ToolOutputPolicy,
+    ToolOutputStore,
+    TruncateOutput,
+)
 from emp_agents.models.shared.tools import GenericTool, MCPTool, Property
 from emp_agents.types.enums import Role
 
 __all__ = [
+    "ChainOutput",
     "GenericTool",
     "Message",
     "Property",
@@ -24,4 +39,13 @@ __all__ = [
     "AssistantMessage",
     "Example",
     "MCPTool",
+    "OffloadOutput",
+    "ProjectOutput",
+    "ToolOutputPolicy",
+    "ToolOutputStore",
+    "TruncateOutput",
+    "dump_messages",
+    "export_messages",
+    "import_messages",
+    "load_messages",
 ]
@@ -1,9 +1,16 @@
 import json
 from abc import ABC
 from datetime import datetime
-from typing import Any, Literal
-
-from pydantic import AliasChoices, BaseModel, Field, field_serializer
+from typing import Annotated, Any, Literal, Mapping, Self, Union
+
+from pydantic import (
+    AliasChoices,
+    BaseModel,
+    Field,
+    PrivateAttr,
+    TypeAdapter,
+    field_serializer,
+)
 from pydantic.types import Json
 
 from emp_agents.types.enums import Role
@@ -30,6 +37,45 @@ class Message(BaseModel, ABC):
     role: Role
     content: str | None
 
+    # memoized `model_dump` results, see `cached_dump`
+    _dumps: dict[bool, dict[str, Any]] = PrivateAttr(default_factory=dict)
+
+    def cached_dump(self, exclude_none: bool = False) -> dict[str, Any]:
+        """
+        `model_dump`, memoized so a long conversation is not reserialized on every
+        request.  Messages are treated as immutable once they are part of a
+        conversation: assigning a field clears the cache, but mutating a nested
+        value in place does not.  The returned dict is shared and must not be modified.
+        """
+        dump = self._dumps.get(exclude_none)
+        if dump is None:
+            dump = self._dumps[exclude_none] = self.model_dump(
+                exclude_none=exclude_none
+            )
+        return dump
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._dumps = {}
+
+    def model_copy(
+        self, *, update: Mapping[str, Any] | None = None, deep: bool = False
+    ) -> Self:
+        copied = super().model_copy(update=update, deep=deep)
+        copied._dumps = {}
+        return copied
+
+    def __eq__(self, other: Any) -> bool:
+        # the serialization cache is not part of the message
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return (
+            type(self) is type(other)
+            and self.__dict__ == other.__dict__
+            and self.__pydantic_extra__ == other.__pydantic_extra__
+        )
+
     @classmethod
     def build(
         self,
@@ -86,3 +132,10 @@ class ToolMessage(Message):
     tool_call_id: str | None = Field(
         default=None, validation_alias=AliasChoices("tool_call_id")
     )
+
+
+AnyMessage = Annotated[
+    Union[SystemMessage, UserMessage, AssistantMessage, ToolMessage],
+    Field(discriminator="role"),
+]
+message_adapter: TypeAdapter[AnyMessage] = TypeAdapter(AnyMessage)
@@ -0,0 +1,90 @@
+import gzip
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Literal, cast
+
+from emp_agents.models.shared.message import Message, message_adapter
+
+MessageFormat = Literal["jsonl", "msgpack"]
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError(
+            "msgpack is required for the msgpack format, install emp-agents[archive]"
+        ) from e
+    return msgpack
+
+
+def _format_for(path: Path) -> MessageFormat:
+    suffixes = path.suffixes
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes = suffixes[:-1]
+    return "msgpack" if suffixes and suffixes[-1] == ".msgpack" else "jsonl"
+
+
+def _open(path: Path, mode: Literal["rb", "wb", "ab"]) -> IO[bytes]:
+    if path.suffix == ".gz":
+        return cast(IO[bytes], gzip.open(path, mode))
+    return open(path, mode)
+
+
+def dump_messages(
+    messages: Iterable[Message],
+    fp: IO[bytes],
+    format: MessageFormat = "jsonl",
+) -> int:
+    """
+    Write messages to a binary file one at a time, so any iterable, including a
+    generator, is streamed with constant memory.  Returns the number written.
+    """
+    count = 0
+    if format == "msgpack":
+        packer = _msgpack().Packer()
+        for message in messages:
+            fp.write(packer.pack(message.model_dump(mode="json")))
+            count += 1
+        return count
+
+    for message in messages:
+        fp.write(message.model_dump_json().encode())
+        fp.write(b"\n")
+        count += 1
+    return count
+
+
+def load_messages(
+    fp: IO[bytes],
+    format: MessageFormat = "jsonl",
+) -> Iterator[Message]:
+    """Lazily read the messages written by `dump_messages`"""
+    if format == "msgpack":
+        for data in _msgpack().Unpacker(fp, raw=False):
+            yield message_adapter.validate_python(data)
+        return
+
+    for line in fp:
+        if line.strip():
+            yield message_adapter.validate_json(line)
+
+
+def export_messages(
+    messages: Iterable[Message],
+    path: Path | str,
+    append: bool = False,
+) -> int:
+    """
+    Write messages to a file, the format is picked from the suffix: `.jsonl` or
+    `.msgpack`, optionally gzip compressed with a trailing `.gz`.
+    """
+    path = Path(path)
+    with _open(path, "ab" if append else "wb") as fp:
+        return dump_messages(messages, fp, _format_for(path))
+
+
+def import_messages(path: Path | str) -> Iterator[Message]:
+    """Lazily read a file written by `export_messages`"""
+    path = Path(path)
+    with _open(path, "rb") as fp:
+        yield from load_messages(fp, _format_for(path))
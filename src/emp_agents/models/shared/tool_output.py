@@ -0,0 +1,163 @@
+import json
+import math
+import uuid
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Annotated, Any
+
+from pydantic import BaseModel, Field, PrivateAttr
+from typing_extensions import Doc
+
+if TYPE_CHECKING:
+    from emp_agents.models.shared.tools import FunctionTool
+
+
+class ToolOutputStore(BaseModel):
+    """
+    Keeps full tool outputs outside of the conversation.
+    Offloaded outputs are referenced by a short handle and read back page by page.
+    """
+
+    tool_name: str = "read_tool_output"
+
+    _outputs: dict[str, tuple[str, int]] = PrivateAttr(default_factory=dict)
+
+    def put(self, output: str, page_size: int) -> str:
+        handle = f"out_{uuid.uuid4().hex[:8]}"
+        self._outputs[handle] = (output, page_size)
+        return handle
+
+    def pages(self, handle: str) -> int:
+        output, page_size = self._outputs[handle]
+        return max(1, math.ceil(len(output) / page_size))
+
+    def read(self, handle: str, page: int = 1) -> str:
+        if handle not in self._outputs:
+            return f"Unknown output handle: {handle}"
+        output, page_size = self._outputs[handle]
+        pages = self.pages(handle)
+        if page < 1 or page > pages:
+            return f"Invalid page {page}, {handle} has {pages} pages"
+        content = output[(page - 1) * page_size : page * page_size]
+        return f"[{handle} page {page}/{pages}]\n{content}"
+
+    def as_tool(self) -> "FunctionTool":
+        """The retrieval tool the model uses to page through offloaded outputs"""
+        from emp_agents.models.shared.tools import FunctionTool
+
+        def read_tool_output(
+            handle: Annotated[str, Doc("The handle of the stored tool output")],
+            page: Annotated[int, Doc("The page to read, starting at 1")] = 1,
+        ) -> str:
+            """Read a page of a large tool output that was stored outside of the conversation"""
+            return self.read(handle, page)
+
+        read_tool_output.__name__ = self.tool_name
+        return FunctionTool.from_func(read_tool_output)
+
+    def __len__(self) -> int:
+        return len(self._outputs)
+
+
+class ToolOutputPolicy(BaseModel, ABC):
+    """Controls how a tool's output is placed into the conversation"""
+
+    @abstractmethod
+    def apply(self, output: str, store: ToolOutputStore) -> str: ...
+
+
+class TruncateOutput(ToolOutputPolicy):
+    max_chars: int = Field(default=4_000, gt=0)
+
+    def apply(self, output: str, store: ToolOutputStore) -> str:
+        if len(output) <= self.max_chars:
+            return output
+        dropped = len(output) - self.max_chars
+        return f"{output[: self.max_chars]}\n... [truncated {dropped} characters]"
+
+
+class ProjectOutput(ToolOutputPolicy):
+    """
+    Keeps only the listed fields of a JSON output.
+
+    Fields are dotted paths, lists are projected element-wise, and `*` matches
+    every key of an object, eg. `pairs.baseToken.symbol` or `*.symbol`.
+    Outputs that are not valid JSON are left unchanged.
+    """
+
+    fields: list[str]
+    max_items: int | None = Field(
+        default=None, description="Keep at most this many elements of each list"
+    )
+
+    def _tree(self) -> dict[str, Any]:
+        tree: dict[str, Any] = {}
+        for field in self.fields:
+            node = tree
+            *parents, leaf = field.split(".")
+            for part in parents:
+                child = node.get(part)
+                if child is True:
+                    break
+                node = node.setdefault(part, {})
+            else:
+                node[leaf] = True
+        return tree
+
+    def _project(self, value: Any, tree: dict[str, Any] | bool) -> Any:
+        if tree is True:
+            return value
+        assert isinstance(tree, dict)
+        if isinstance(value, list):
+            items = value[: self.max_items] if self.max_items else value
+            return [self._project(item, tree) for item in items]
+        if isinstance(value, dict):
+            if "*" in tree:
+                return {
+                    key: self._project(item, tree["*"]) for key, item in value.items()
+                }
+            return {
+                key: self._project(value[key], subtree)
+                for key, subtree in tree.items()
+                if key in value
+            }
+        return value
+
+    def apply(self, output: str, store: ToolOutputStore) -> str:
+        try:
+            data = json.loads(output)
+        except (TypeError, json.JSONDecodeError):
+            return output
+        return json.dumps(self._project(data, self._tree()))
+
+
+class OffloadOutput(ToolOutputPolicy):
+    """
+    Stores large outputs in the agent's `ToolOutputStore` and only places a preview
+    and a handle in the conversation.  The model pages through the rest with the
+    auto-registered retrieval tool.
+    """
+
+    page_size: int = Field(default=4_000, gt=0)
+    preview_chars: int = Field(default=1_000, ge=0)
+
+    def apply(self, output: str, store: ToolOutputStore) -> str:
+        if len(output) <= self.page_size:
+            return output
+        handle = store.put(output, self.page_size)
+        return (
+            f"[Output of {len(output)} characters stored as `{handle}` in "
+            f"{store.pages(handle)} pages.  Use `{store.tool_name}` with this handle "
+            "to read it.]\n"
+            f"{output[: self.preview_chars]}"
+        )
+
+
+class ChainOutput(ToolOutputPolicy):
+    """Applies several policies in order, eg. a projection followed by offloading"""
+
+    policies: list[ToolOutputPolicy]
+
+    def apply(self, output: str, store: ToolOutputStore) -> str:
+        for policy in self.policies:
+            output = policy.apply(output, store)
+        return output
@@ -1,15 +1,30 @@
 import inspect
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Callable, Self, get_args, get_origin
-
-from pydantic import BaseModel, Field
-
-from emp_agents.types.mcp import MCPClient
-from emp_agents.utils import FunctionSchema, get_function_schema
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Self,
+    Sequence,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter, ValidationError
+
+from emp_agents.exceptions import InvalidToolArgumentsException
+from emp_agents.models.shared.tool_output import ToolOutputPolicy
+from emp_agents.utils import (
+    FunctionSchema,
+    get_arguments_adapter,
+    get_function_schema,
+    get_signature,
+)
 
 if TYPE_CHECKING:
     from emp_agents.agents.base import AgentBase
+    from emp_agents.types.mcp import MCPClient
 
 
 class Property(BaseModel):
@@ -33,6 +48,11 @@ class GenericTool(BaseModel, ABC):
     required: list[str]
     type: str = "object"
     additional_properties: bool = Field(default=False)
+    output_policy: ToolOutputPolicy | None = Field(
+        default=None,
+        description="How the tool's output is placed into the conversation",
+        exclude=True,
+    )
 
     @classmethod
     def _convert_type(cls, type):
@@ -122,9 +142,19 @@ class GenericTool(BaseModel, ABC):
         pass
 
 
+def sorted_tools(tools: Sequence[GenericTool]) -> list[GenericTool]:
+    """
+    Tools in a stable order, by name, so a request does not depend on the order
+    tools were imported or registered in and its prefix stays cacheable.
+    """
+    return sorted(tools, key=lambda tool: tool.name)
+
+
 class FunctionTool(GenericTool):
     func: Callable
 
+    _arguments: TypeAdapter[dict[str, Any]] | None = PrivateAttr(default=None)
+
     @classmethod
     def from_func(cls, func: Callable[..., Any]):
         description: str = func.__doc__ or ""
@@ -147,14 +177,29 @@ class FunctionTool(GenericTool):
             parameters=parameters_,
             required=[
                 key
-                for key, value in inspect.signature(func).parameters.items()
+                for key, value in get_signature(func).parameters.items()
                 if value.default == inspect._empty
             ],
             func=func,
+            output_policy=getattr(func, "_output_policy", None),
         )
 
+    def validate_arguments(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """
+        Validate and coerce the arguments passed by the model against the
+        function's signature, the validator is compiled on first use.
+        """
+        if self._arguments is None:
+            self._arguments = get_arguments_adapter(self.func)
+        try:
+            return self._arguments.validate_python(arguments)
+        except ValidationError as e:
+            raise InvalidToolArgumentsException(
+                self.name, e.errors(include_url=False, include_context=False)
+            ) from e
+
     def execute(self, **kwargs):
-        return self.func(**kwargs)
+        return self.func(**self.validate_arguments(kwargs))
 
     @classmethod
     def from_agent(cls, agent: "AgentBase") -> Self:
@@ -173,7 +218,7 @@ class FunctionTool(GenericTool):
             parameters=parameters_,
             required=[
                 key
-                for key, value in inspect.signature(func).parameters.items()
+                for key, value in get_signature(func).parameters.items()
                 if value.default == inspect._empty
             ],
             func=agent.answer,
@@ -181,7 +226,8 @@ class FunctionTool(GenericTool):
 
 
 class MCPTool(GenericTool):
-    client: MCPClient
+    # resolved when `emp_agents.types.mcp` is imported, which loads the mcp SDK
+    client: "MCPClient"
 
     async def execute(self, **kwargs):
         return await self.client.call_tool(self.name, kwargs)
@@ -0,0 +1,123 @@
+import math
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from emp_agents.models.shared.tools import GenericTool
+
+_WORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase terms, breaking snake_case and camelCase identifiers"""
+    return [word.lower() for word in _WORD.findall(text)]
+
+
+class ToolSelector(BaseModel, ABC):
+    """
+    Picks the subset of tools to send to the provider on each turn, based on
+    the last `query_messages` user and assistant messages.  Tools in `pinned`
+    must always be part of the selection.
+    """
+
+    top_k: int = Field(default=10, gt=0)
+    query_messages: int = Field(
+        default=4,
+        gt=0,
+        description="How many recent messages the query is built from",
+    )
+
+    @abstractmethod
+    def select(
+        self,
+        query: str,
+        tools: list[GenericTool],
+        pinned: set[str],
+    ) -> list[GenericTool]: ...
+
+
+class BM25ToolSelector(ToolSelector):
+    """
+    Ranks tools with Okapi BM25 over their names, descriptions and parameter docs.
+    The index is rebuilt only when the set of tools changes.
+    """
+
+    k1: float = 1.5
+    b: float = 0.75
+    name_weight: int = Field(
+        default=2, description="How many times the tool name counts towards the score"
+    )
+
+    _index_key: tuple[str, ...] = PrivateAttr(default=())
+    _documents: list[Counter[str]] = PrivateAttr(default_factory=list)
+    _lengths: list[int] = PrivateAttr(default_factory=list)
+    _idf: dict[str, float] = PrivateAttr(default_factory=dict)
+    _average_length: float = PrivateAttr(default=0.0)
+
+    def _document(self, tool: GenericTool) -> list[str]:
+        terms = tokenize(tool.name) * self.name_weight + tokenize(tool.description)
+        for name, parameter in tool.parameters.items():
+            terms += tokenize(name) + tokenize(parameter.description)
+        return terms
+
+    def _build_index(self, tools: list[GenericTool]) -> None:
+        documents = [Counter(self._document(tool)) for tool in tools]
+        lengths = [sum(document.values()) for document in documents]
+        frequencies: Counter[str] = Counter()
+        for document in documents:
+            frequencies.update(document.keys())
+
+        count = len(documents)
+        self._documents = documents
+        self._lengths = lengths
+        self._average_length = (sum(lengths) / count) if count else 0.0
+        self._idf = {
+            term: math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in frequencies.items()
+        }
+        self._index_key = tuple(tool.name for tool in tools)
+
+    def scores(self, query: str, tools: list[GenericTool]) -> list[float]:
+        if self._index_key != tuple(tool.name for tool in tools):
+            self._build_index(tools)
+
+        terms = [term for term in tokenize(query) if term in self._idf]
+        scores = []
+        for document, length in zip(self._documents, self._lengths):
+            score = 0.0
+            norm = self.k1 * (
+                1 - self.b + self.b * length / (self._average_length or 1)
+            )
+            for term in terms:
+                frequency = document.get(term, 0)
+                if frequency:
+                    score += (
+                        self._idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+                    )
+            scores.append(score)
+        return scores
+
+    def select(
+        self,
+        query: str,
+        tools: list[GenericTool],
+        pinned: set[str],
+    ) -> list[GenericTool]:
+        if len(tools) <= self.top_k:
+            return tools
+
+        scores = self.scores(query, tools)
+        ranked = sorted(
+            (i for i, tool in enumerate(tools) if tool.name not in pinned),
+            key=lambda i: scores[i],
+            reverse=True,
+        )
+        if not any(scores[i] > 0 for i in ranked):
+            # nothing to go on, eg. "yes, go ahead", so leave the choice to the model
+            return tools
+        chosen = {i for i, tool in enumerate(tools) if tool.name in pinned}
+        chosen.update(ranked[: self.top_k])
+        # keep the agent's tool order so the request stays stable between turns
+        return [tool for i, tool in enumerate(tools) if i in chosen]
@@ -1,9 +1,28 @@
-from .anthropic import AnthropicModelType, AnthropicProvider
-from .deepseek import DeepSeekModelType, DeepSeekProvider
-from .grok import GrokModelType, GrokProvider
-from .openai import OpenAIModelType, OpenAIProvider
-from .openrouter import OpenRouterModelType, OpenRouterProvider
-from .standard_request import StandardRequest
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .anthropic import AnthropicModelType, AnthropicProvider
+    from .deepseek import DeepSeekModelType, DeepSeekProvider
+    from .grok import GrokModelType, GrokProvider
+    from .openai import OpenAIModelType, OpenAIProvider
+    from .openrouter import OpenRouterModelType, OpenRouterProvider
+    from .standard_request import StandardRequest
+
+# providers are imported on first access, so only the SDKs in use are loaded
+_LAZY_IMPORTS = {
+    "AnthropicModelType": ".anthropic",
+    "AnthropicProvider": ".anthropic",
+    "DeepSeekModelType": ".deepseek",
+    "DeepSeekProvider": ".deepseek",
+    "GrokModelType": ".grok",
+    "GrokProvider": ".grok",
+    "OpenAIModelType": ".openai",
+    "OpenAIProvider": ".openai",
+    "OpenRouterModelType": ".openrouter",
+    "OpenRouterProvider": ".openrouter",
+    "StandardRequest": ".standard_request",
+}
 
 __all__ = [
     "AnthropicProvider",
@@ -18,3 +37,15 @@ __all__ = [
     "OpenRouterModelType",
     "StandardRequest",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -7,6 +7,7 @@ from pydantic import ConfigDict, Field, PrivateAttr
 
 from emp_agents.exceptions import InvalidModelException
 from emp_agents.models import Provider, Request, Role
+from emp_agents.models.shared.tools import sorted_tools
 
 from .response import Response
 from .types import AnthropicModelType
@@ -43,9 +44,11 @@ class AnthropicProvider(Provider[Response]):
 
     def _from_request(self, request: Request):
         exclude = ["frequency_penalty", "presence_penalty", "num_responses", "n"]
-        result = request.model_dump(exclude_none=True)
+        result = request.model_dump(exclude_none=True, exclude={"messages", "tools"})
         result["tools"] = (
-            [t.to_anthropic() for t in request.tools] if request.tools else []
+            [t.to_anthropic() for t in sorted_tools(request.tools)]
+            if request.tools
+            else []
         )
         if "tool_choice" in result:
             result["tool_choice"] = {"type": result["tool_choice"]}
@@ -61,7 +64,7 @@ class AnthropicProvider(Provider[Response]):
         result["system"] = result.get("system", "") + str(
             "\n".join([m.content for m in system_messages if m.content is not None])
         )
-        result["messages"] = [m.model_dump(exclude_none=True) for m in messages]
+        result["messages"] = [m.cached_dump(exclude_none=True) for m in messages]
 
         if "response_format" in result:
             result[
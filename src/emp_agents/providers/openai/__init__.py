@@ -6,6 +6,8 @@ from pydantic import Field
 
 from emp_agents.models import GenericTool, Provider, Request, SystemMessage
 from emp_agents.models.shared.message import Message
+from emp_agents.models.shared.tools import sorted_tools
+from emp_agents.utils.canonical import canonical_json
 
 from .request import Tool
 from .response import Response
@@ -37,14 +39,16 @@ class OpenAIProviderBase(Provider[Response], Generic[ModelType]):
         result["max_completion_tokens"] = result["max_tokens"]
         del result["max_tokens"]
         del result["tools"]
-        for message in result["messages"]:
-            if message["role"] == "system":
-                message["role"] = "user"
+        # the message dicts are shared with the messages' serialization cache
+        result["messages"] = [
+            {**message, "role": "user"} if message["role"] == "system" else message
+            for message in result["messages"]
+        ]
         return result
 
     def _from_request(self, request: Request):
         exclude = ["system"]
-        result = request.model_dump(exclude_none=True)
+        result = request.model_dump(exclude_none=True, exclude={"messages", "tools"})
         if request.system:
             messages = [SystemMessage(content=request.system)] + request.messages
         else:
@@ -80,9 +84,12 @@ class OpenAIProviderBase(Provider[Response], Generic[ModelType]):
                     },
                 },
             }
-        result["messages"] = [m.model_dump() for m in messages]
+        result["messages"] = [m.cached_dump() for m in messages]
         result["tools"] = (
-            [self.to_tool_call(t).model_dump(exclude_none=True) for t in request.tools]
+            [
+                self.to_tool_call(t).model_dump(exclude_none=True)
+                for t in sorted_tools(request.tools)
+            ]
             if request.tools
             else None
         )
@@ -106,7 +113,9 @@ class OpenAIProviderBase(Provider[Response], Generic[ModelType]):
     async def completion(self, request: Request) -> Response:
         openai_request = self._from_request(request)
         async with httpx.AsyncClient(headers=self.headers) as client:
-            response = await client.post(self.url, json=openai_request, timeout=None)
+            response = await client.post(
+                self.url, content=canonical_json(openai_request), timeout=None
+            )
         if response.status_code >= 400:
             raise ValueError(response.json())
         return Response(**response.json())
@@ -2,7 +2,7 @@ from typing import Annotated, Optional
 
 from pydantic import Field, PlainSerializer
 
-from emp_agents.models.shared.tools import GenericTool
+from emp_agents.models.shared.tools import GenericTool, sorted_tools
 from emp_agents.providers.standard_request import StandardRequest
 
 from .tool import Tool
@@ -18,7 +18,7 @@ class Request(StandardRequest[OpenAIModelType]):
         Optional[list[GenericTool]],
         PlainSerializer(
             lambda tools_list: (
-                [tool.to_openai() for tool in tools_list]
+                [tool.to_openai() for tool in sorted_tools(tools_list)]
                 if tools_list is not None
                 else None
             ),
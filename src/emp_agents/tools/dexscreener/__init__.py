@@ -2,9 +2,25 @@ from typing import Annotated, Literal
 
 from typing_extensions import Doc
 
-from emp_agents.models.protocol import SkillSet, tool_method
+from emp_agents.models import OffloadOutput, ProjectOutput
+from emp_agents.models.protocol import SkillSet, output_policy, tool_method
 from emp_agents.tools.dexscreener.api import DexScreenerApi
 
+PAIR_FIELDS = [
+    "pairs.chainId",
+    "pairs.dexId",
+    "pairs.pairAddress",
+    "pairs.baseToken",
+    "pairs.quoteToken",
+    "pairs.priceUsd",
+    "pairs.liquidity.usd",
+    "pairs.volume.h24",
+    "pairs.priceChange.h24",
+    "pairs.fdv",
+    "error",
+    "details",
+]
+
 
 class DexScreenerSkill(SkillSet):
     """
@@ -13,6 +29,7 @@ class DexScreenerSkill(SkillSet):
     """
 
     @tool_method
+    @output_policy(ProjectOutput(fields=PAIR_FIELDS, max_items=10))
     @staticmethod
     async def search_pairs(
         query: Annotated[str, Doc("The search query to find trading pairs")],
@@ -33,6 +50,7 @@ class DexScreenerSkill(SkillSet):
         return await DexScreenerApi.get_pair_by_chain(chain_id, pair_id)
 
     @tool_method
+    @output_policy(ProjectOutput(fields=PAIR_FIELDS, max_items=30))
     @staticmethod
     async def find_pairs_by_tokens(
         token_addresses: Annotated[list[str], Doc("List of token addresses (max 30)")],
@@ -41,18 +59,21 @@ class DexScreenerSkill(SkillSet):
         return await DexScreenerApi.find_pairs_by_tokens(token_addresses)
 
     @tool_method
+    @output_policy(OffloadOutput())
     @staticmethod
     async def get_token_profiles() -> str:
         """Get the latest token profiles (rate-limit 60 requests per minute)"""
         return await DexScreenerApi.get_token_profiles()
 
     @tool_method
+    @output_policy(OffloadOutput())
     @staticmethod
     async def get_latest_boosted_tokens() -> str:
         """Get the latest boosted tokens (rate-limit 60 requests per minute)"""
         return await DexScreenerApi.get_latest_boosted_tokens()
 
     @tool_method
+    @output_policy(OffloadOutput())
     @staticmethod
     async def get_top_boosted_tokens() -> str:
         """Get the tokens with most active boosts (rate-limit 60 requests per minute)"""
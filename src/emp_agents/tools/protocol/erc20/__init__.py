@@ -1,21 +1,35 @@
+import asyncio
+import json
 from collections.abc import Callable
 from typing import Annotated, Optional
 
 import httpx
-from eth_rpc import PrivateKeyWallet
+from eth_rpc import ContractFunc, PrivateKeyWallet
 from eth_rpc.networks import Network
+from eth_rpc.types import BLOCK_STRINGS
 from eth_typeshed import ERC20
-from eth_typeshed.multicall import make_multicall
+from eth_typeshed.multicall import TryResult, make_multicall
 from typing_extensions import Doc
 
 from emp_agents.implicits import IgnoreDepends, Provider, inject
-from emp_agents.models.protocol import SkillSet, onchain_action, view_action
+from emp_agents.models import OffloadOutput
+from emp_agents.models.protocol import (
+    SkillSet,
+    onchain_action,
+    output_policy,
+    view_action,
+)
 
 from ..network import NetworkSkill
 from ..wallets import SimpleWalletSkill
 
 erc20_scope = Provider()
 
+# calls per multicall, well within the gas and calldata limits of `eth_call`
+MULTICALL_CHUNK_SIZE = 500
+# multicalls in flight at once
+MULTICALL_CONCURRENCY = 4
+
 
 def load_wallet() -> PrivateKeyWallet | None:
     """
@@ -39,12 +53,38 @@ def scope_load_wallet(
     return (erc20_scope, load_wallet, new_load_wallet)
 
 
+async def multicall_chunked(
+    network: type[Network],
+    calls: list[ContractFunc],
+    chunk_size: int | None = None,
+    concurrency: int | None = None,
+    block_number: int | BLOCK_STRINGS = "latest",
+) -> list[TryResult]:
+    """
+    Runs the calls through Multicall3 in chunks of `chunk_size`, with up to
+    `concurrency` chunks in flight.  A failed call gives an unsuccessful result
+    instead of failing its chunk.
+    """
+    chunk_size = chunk_size or MULTICALL_CHUNK_SIZE
+    multicall = make_multicall(network)
+    limit = asyncio.Semaphore(concurrency or MULTICALL_CONCURRENCY)
+
+    async def execute(chunk: list[ContractFunc]) -> list[TryResult]:
+        async with limit:
+            return await multicall.try_execute(*chunk, block_number=block_number)
+
+    chunks = [calls[i : i + chunk_size] for i in range(0, len(calls), chunk_size)]
+    results = await asyncio.gather(*(execute(chunk) for chunk in chunks))
+    return [result for chunk in results for result in chunk]
+
+
 class ERC20Skill(SkillSet):
     """
     Tools for interacting with ERC20 tokens.
     """
 
     @view_action
+    @output_policy(OffloadOutput())
     @staticmethod
     async def describe_protocol():
         """Returns the complete protocol specification of the ERC20 protocol"""
@@ -109,6 +149,55 @@ class ERC20Skill(SkillSet):
         assert decimals is not None
         return f"Balance: {balance / 10 ** decimals}"
 
+    @view_action
+    @output_policy(OffloadOutput())
+    @staticmethod
+    @inject(dependency_overrides_provider=erc20_scope)  # type: ignore[call-overload]
+    async def get_balances(
+        token_addresses: Annotated[
+            list[str], Doc("The addresses of the ERC20 tokens.")
+        ],
+        addresses: Annotated[
+            list[str], Doc("The addresses of the accounts to get the balances of.")
+        ],
+        network: Annotated[
+            type[Network] | None,
+            Doc("The network to use"),
+        ] = IgnoreDepends(load_network),
+    ) -> str:
+        """Returns the balances of several accounts for several ERC20 tokens, in one batch"""
+        if network is None:
+            return "NOTE: No network set, try setting the network first"
+
+        token_addresses = list(dict.fromkeys(token_addresses))
+        addresses = list(dict.fromkeys(addresses))
+        tokens = [ERC20[network](address=address) for address in token_addresses]
+
+        # the decimals of each token, then its balance for each account
+        calls: list[ContractFunc] = [token.decimals() for token in tokens]
+        for token in tokens:
+            calls.extend(token.balance_of(address) for address in addresses)
+        try:
+            results = await multicall_chunked(network, calls)
+        except Exception as e:
+            return f"Error getting balances: {e}"
+
+        balances: dict[str, dict[str, float | None]] = {}
+        for i, token_address in enumerate(token_addresses):
+            decimals = results[i]
+            start = len(tokens) + i * len(addresses)
+            balances[token_address] = {
+                address: (
+                    balance.result / 10**decimals.result
+                    if decimals.success and balance.success
+                    else None
+                )
+                for address, balance in zip(
+                    addresses, results[start : start + len(addresses)]
+                )
+            }
+        return json.dumps(balances)
+
     @onchain_action
     @staticmethod
     @inject(dependency_overrides_provider=erc20_scope)  # type: ignore[call-overload]
@@ -5,11 +5,20 @@ import httpx
 from typing_extensions import Doc
 
 from emp_agents.logger import logger
-from emp_agents.models.protocol import SkillSet, view_action
+from emp_agents.models import ChainOutput, OffloadOutput, ProjectOutput
+from emp_agents.models.protocol import SkillSet, output_policy, view_action
 
 
 class GmxSkill(SkillSet):
     @view_action
+    @output_policy(
+        ChainOutput(
+            policies=[
+                ProjectOutput(fields=["*.symbol", "*.address", "*.decimals"]),
+                OffloadOutput(),
+            ]
+        )
+    )
     @staticmethod
     async def get_tokens_address_dict(
         chain: Annotated[
@@ -3,9 +3,11 @@ from typing import Annotated, Literal, Optional, cast
 from eth_rpc.networks import Network, get_network_by_name
 from typing_extensions import Doc
 
+from emp_agents.implicits import ScopedValue
 from emp_agents.models.protocol import SkillSet, tool_method
 
-_network: Optional[type[Network]] = None
+# scoped to the agent, so agents running concurrently can use different networks
+_network: ScopedValue[Optional[type[Network]]] = ScopedValue("network", None)
 
 
 NetworkOptions = Literal[
@@ -34,9 +36,8 @@ class NetworkSkill(SkillSet):
         """
         Set the current network
         """
-        global _network
         try:
-            _network = get_network_by_name(network)
+            _network.set(get_network_by_name(network))
         except ValueError:
             return f"Invalid network: {network}"
         return f"network set to {network}"
@@ -47,23 +48,26 @@ class NetworkSkill(SkillSet):
         """
         Get the current network
         """
-        if not _network:
+        network = _network.get()
+        if not network:
             return "No network set, try setting the network first"
-        return f"current network: {_network.name}"
+        return f"current network: {network.name}"
 
     @tool_method
     @staticmethod
     def make_block_explorer_link(tx_hash: str) -> str:
-        if not _network:
+        network = _network.get()
+        if not network:
             return "No network set, try setting the network first"
-        return f"{_network.block_explorer.url}/tx/{tx_hash}"
+        return f"{network.block_explorer.url}/tx/{tx_hash}"
 
     @staticmethod
     def get_network_type() -> type[Network] | None:
-        return _network
+        return _network.get()
 
     @staticmethod
     def get_network_str() -> NetworkOptions | None:
-        if not _network:
+        network = _network.get()
+        if not network:
             return None
-        return cast(NetworkOptions, _network.name)
+        return cast(NetworkOptions, network.name)
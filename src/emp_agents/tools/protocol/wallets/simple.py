@@ -1,4 +1,3 @@
-from contextvars import ContextVar
 from typing import Annotated, Optional
 
 from eth_rpc import Account, PrivateKeyWallet
@@ -6,17 +5,17 @@ from eth_rpc.networks import Network, get_network_by_name
 from eth_typing import HexAddress, HexStr
 from typing_extensions import Doc
 
-from emp_agents.implicits import Depends, inject
+from emp_agents.implicits import Depends, ScopedValue, inject
 from emp_agents.models.protocol import SkillSet, onchain_action, tool_method
 
 from ..network import NetworkOptions, NetworkSkill
 
-# Context variable to store private key
-_private_key: ContextVar[Optional[str]] = ContextVar("_private_key", default=None)
+# scoped to the agent, so agents running concurrently can use different wallets
+_private_key: ScopedValue[Optional[str]] = ScopedValue("private_key", None)
 
 
 class SimpleWalletSkill(SkillSet):
-    """A simple wallet tool that stores private key in memory using context vars"""
+    """A simple wallet tool that stores the private key in memory, per agent"""
 
     @staticmethod
     def get_wallet() -> PrivateKeyWallet:
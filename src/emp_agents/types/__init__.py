@@ -1,11 +1,24 @@
+from typing import TYPE_CHECKING, Any
+
 from emp_agents.types.completion import TCompletionAgent
-from emp_agents.types.mcp import MCPClient, SSEParams
 
 from .enums import Role
 
+if TYPE_CHECKING:
+    from emp_agents.types.mcp import MCPClient, SSEParams
+
 __all__ = [
     "TCompletionAgent",
     "Role",
     "MCPClient",
     "SSEParams",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # the mcp SDK is only loaded when an MCP type is used
+    if name in ("MCPClient", "SSEParams"):
+        from emp_agents.types import mcp
+
+        return getattr(mcp, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
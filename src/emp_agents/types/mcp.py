@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import asyncio
 from enum import StrEnum
 from typing import TYPE_CHECKING, Any
 
-from mcp import ClientSession, StdioServerParameters
+from mcp import StdioServerParameters
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
-from mcp.types import Prompt, Tool
+from mcp.types import Prompt, ServerNotification, Tool, ToolListChangedNotification
 from pydantic import BaseModel, Field, PrivateAttr
 
+from emp_agents.exceptions import MCPConnectionException
+from emp_agents.logger import logger
+from emp_agents.utils.canonical import request_fingerprint
+from emp_agents.utils.mcp.manifest import (
+    ToolManifestCache,
+    server_version,
+    tools_digest,
+)
+from emp_agents.utils.mcp.pool import MCPPoolMetrics, MCPSessionPool
+from emp_agents.utils.mcp.session import MCPSession
+
 if TYPE_CHECKING:
     from emp_agents.models import MCPTool
 
@@ -24,10 +36,46 @@ class MCPConnectionType(StrEnum):
 
 
 class MCPClient(BaseModel):
+    """
+    A client for an MCP server.  Requests share a pool of long-lived sessions,
+    opened on first use and reconnected when lost, see `MCPSession` and
+    `MCPSessionPool`.  Close it with `aclose` or use the client as an async
+    context manager.
+    """
+
     connection_type: MCPConnectionType = Field(default=MCPConnectionType.SSE)
     params: SSEParams | StdioServerParameters
-
-    _client: ClientSession | None = PrivateAttr(default=None)
+    health_check_interval: float = Field(
+        default=30.0, description="Seconds between pings of an idle server"
+    )
+    ping_timeout: float = Field(default=10.0)
+    connect_timeout: float = Field(
+        default=30.0, description="How long a request waits for a connection"
+    )
+    request_timeout: float | None = Field(
+        default=None, description="How long a request waits for its response"
+    )
+    manifest_cache: ToolManifestCache | None = Field(
+        default=None,
+        description="Where to cache the server's tools between restarts",
+    )
+    pool_size: int = Field(
+        default=1, ge=1, description="The most sessions opened with the server"
+    )
+    max_calls_per_session: int | None = Field(
+        default=None,
+        description="Calls in flight per session before further calls wait",
+    )
+    max_queue: int | None = Field(
+        default=None,
+        description="Calls allowed to wait for a session before calls are rejected",
+    )
+    call_timeout: float | None = Field(
+        default=None, description="Seconds before a tool call is abandoned"
+    )
+
+    _pool: MCPSessionPool | None = PrivateAttr(default=None)
+    _revalidation: asyncio.Task | None = PrivateAttr(default=None)
 
     def model_post_init(self, __context: Any) -> None:
         if self.connection_type == MCPConnectionType.SSE:
@@ -37,55 +85,113 @@ class MCPClient(BaseModel):
         else:
             raise ValueError(f"Invalid connection type: {self.connection_type}")
 
-    # async def _create_session(self) -> ClientSession:
-    #     if self._client is not None:
-    #         return self._client
-
-    #     if self.connection_type == MCPConnectionType.SSE:
-    #         assert isinstance(self.params, SSEParams)
-    #         read, write = await sse_client(**self.params.model_dump())
-    #         session = ClientSession(read, write)
-    #         await session.initialize()
-    #         self._client = session
-    #         return session
-    #     else:
-    #         assert isinstance(self.params, StdioServerParameters)
-    #         read, write = await stdio_client(self.params).__aenter__()
-    #         session = ClientSession(read, write)
-    #         await session.initialize()
-    #         self._client = session
-    #         return session
+    def _open_streams(self):
+        if self.connection_type == MCPConnectionType.SSE:
+            return sse_client(**self.params.model_dump())
+        assert isinstance(self.params, StdioServerParameters)
+        return stdio_client(self.params)
+
+    @property
+    def cache_key(self) -> str:
+        """Identifies the server by how it is connected to"""
+        return request_fingerprint(
+            {
+                "connection_type": self.connection_type,
+                "params": self.params.model_dump(mode="json"),
+            }
+        )
+
+    def _new_session(self) -> MCPSession:
+        return MCPSession(
+            self._open_streams,
+            health_check_interval=self.health_check_interval,
+            ping_timeout=self.ping_timeout,
+            connect_timeout=self.connect_timeout,
+            request_timeout=self.request_timeout,
+        )
+
+    @property
+    def pool(self) -> MCPSessionPool:
+        # sessions are bound to the event loop they were started on
+        loop = asyncio.get_running_loop()
+        if self._pool is None or self._pool.loop not in (None, loop):
+            if self._pool is not None:
+                self._discard(self._pool)
+            self._pool = MCPSessionPool(
+                self._new_session,
+                size=self.pool_size,
+                max_calls_per_session=self.max_calls_per_session,
+                max_queue=self.max_queue,
+                call_timeout=self.call_timeout,
+            )
+            self._pool.listeners.append(self._on_notification)
+        return self._pool
+
+    @staticmethod
+    def _discard(pool: MCPSessionPool) -> None:
+        """Close a pool of another event loop, on that loop"""
+        loop = pool.loop
+        if loop is None or loop.is_closed():
+            # a closed loop cancelled the sessions' tasks, closing their streams
+            return
+        asyncio.run_coroutine_threadsafe(pool.aclose(), loop)
+
+    @property
+    def session(self) -> MCPSession:
+        return self.pool.primary
+
+    def metrics(self) -> MCPPoolMetrics | None:
+        """Queue depth and call latency of the session pool, once it is in use"""
+        return self._pool.metrics() if self._pool is not None else None
+
+    def _on_notification(self, notification: ServerNotification) -> None:
+        if self.manifest_cache is not None and isinstance(
+            notification.root, ToolListChangedNotification
+        ):
+            self.manifest_cache.invalidate(self.cache_key)
+
+    async def _list_tools(self) -> list[Tool]:
+        session = self.session
+        if self.manifest_cache is None:
+            return (await session.run(lambda s: s.list_tools(), retry=True)).tools
+
+        await session.get()
+        assert session.initialize_result is not None
+        version = server_version(session.initialize_result)
+        tools = self.manifest_cache.load(self.cache_key, version)
+        if tools is None:
+            tools = (await session.run(lambda s: s.list_tools(), retry=True)).tools
+            self.manifest_cache.store(self.cache_key, version, tools)
+        elif self.manifest_cache.revalidate and self._revalidation is None:
+            self._revalidation = asyncio.create_task(
+                self._revalidate(self.manifest_cache, version, tools)
+            )
+        return tools
+
+    async def _revalidate(
+        self, cache: ToolManifestCache, version: str, cached: list[Tool]
+    ) -> None:
+        try:
+            tools = (await self.session.run(lambda s: s.list_tools(), retry=True)).tools
+        except (Exception, MCPConnectionException) as e:
+            logger.warning(f"Could not revalidate the tools of {self.params}: {e!r}")
+            return
+        if tools_digest(tools) != tools_digest(cached):
+            logger.info(
+                f"MCP server {self.params} changed its tools without a new version"
+            )
+            cache.store(self.cache_key, version, tools)
 
     async def get_prompts(self) -> list[Prompt]:
-        if self.connection_type == MCPConnectionType.SSE:
-            async with sse_client(**self.params.model_dump()) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                prompts = await session.list_prompts()
-        else:
-            assert isinstance(self.params, StdioServerParameters)
-            async with stdio_client(self.params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    prompts = await session.list_prompts()
+        prompts = await self.pool.run(
+            lambda session: session.list_prompts(), retry=True
+        )
         return prompts.prompts
 
     async def list_tools(self) -> list[MCPTool]:
         from emp_agents.models import MCPTool
 
-        if self.connection_type == MCPConnectionType.SSE:
-            async with sse_client(**self.params.model_dump()) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    tools_result = await session.list_tools()
-        else:
-            assert isinstance(self.params, StdioServerParameters)
-            async with stdio_client(self.params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    tools_result = await session.list_tools()
-
-        tools: list[Tool] = tools_result.tools
+        tools = await self._list_tools()
         return [
             MCPTool(
                 client=self,
@@ -98,16 +204,31 @@ class MCPClient(BaseModel):
         ]
 
     async def call_tool(self, tool_name: str, kwargs: dict[str, Any]) -> Any:
-        if self.connection_type == MCPConnectionType.SSE:
-            async with sse_client(**self.params.model_dump()) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    result = await session.call_tool(tool_name, kwargs)
-        else:
-            assert isinstance(self.params, StdioServerParameters)
-            async with stdio_client(self.params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    result = await session.call_tool(tool_name, **kwargs)
-
+        result = await self.pool.run(
+            lambda session: session.call_tool(tool_name, kwargs)
+        )
         return result.content[0].text  # type: ignore
+
+    async def aclose(self) -> None:
+        if self._revalidation is not None:
+            self._revalidation.cancel()
+            await asyncio.gather(self._revalidation, return_exceptions=True)
+            self._revalidation = None
+        if self._pool is not None:
+            await self._pool.aclose()
+            self._pool = None
+
+    async def __aenter__(self) -> "MCPClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+
+def _resolve_mcp_tool() -> None:
+    from emp_agents.models import MCPTool
+
+    MCPTool.model_rebuild(_types_namespace={"MCPClient": MCPClient})
+
+
+_resolve_mcp_tool()
@@ -1,21 +1,35 @@
+from emp_agents.utils.canonical import canonical_json, request_fingerprint
 from emp_agents.utils.executor import execute_tool
 from emp_agents.utils.format import (
+    SegmentSummaryCache,
     count_tokens,
     format_conversation,
     summarize_conversation,
+    summarize_conversation_hierarchical,
 )
 from emp_agents.utils.retry import retry
 from emp_agents.utils.tools import load_tools
 
-from .function_schema import FunctionSchema, get_function_schema
+from .function_schema import (
+    FunctionSchema,
+    get_arguments_adapter,
+    get_function_schema,
+    get_signature,
+)
 
 __all__ = [
     "FunctionSchema",
+    "SegmentSummaryCache",
+    "canonical_json",
     "execute_tool",
+    "request_fingerprint",
     "retry",
     "load_tools",
     "count_tokens",
     "format_conversation",
+    "get_arguments_adapter",
     "get_function_schema",
+    "get_signature",
     "summarize_conversation",
+    "summarize_conversation_hierarchical",
 ]
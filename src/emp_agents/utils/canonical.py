@@ -0,0 +1,39 @@
+import hashlib
+import json
+from decimal import Decimal
+from typing import Any
+
+from pydantic import BaseModel
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if isinstance(value, Decimal):
+        return str(value)
+    # anything else has no stable JSON form, so it must not end up in a key
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def canonical_json(payload: Any) -> bytes:
+    """
+    Serialize a request payload to byte-stable JSON: sorted keys, no
+    insignificant whitespace and UTF-8 kept as is.  The same payload gives the
+    same bytes in every process, whatever its hash seed or import order.
+    Pydantic models, bytes and decimals are supported besides JSON types, any
+    other value raises `TypeError`.
+    """
+    return json.dumps(
+        payload,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_encode,
+    ).encode()
+
+
+def request_fingerprint(payload: Any) -> str:
+    """A stable hash of a request payload, suitable as a cache key"""
+    return hashlib.sha256(canonical_json(payload)).hexdigest()
@@ -1,8 +1,10 @@
+import json
 from asyncio import iscoroutine
 from typing import Any
 
 from pydantic.types import Json
 
+from emp_agents.exceptions import InvalidToolArgumentsException
 from emp_agents.logger import logger
 
 
@@ -14,7 +16,15 @@ async def execute_tool(
     logger.info(f'Executing tool "{function_name}" with arguments {arguments}')
 
     func = tools_map[function_name]
-    response = func(**arguments)
+    try:
+        response = func(**arguments)
+    except InvalidToolArgumentsException as e:
+        # returned to the model so it can correct the call
+        logger.info(f'Invalid arguments for tool "{function_name}": {e.errors}')
+        return json.dumps(
+            {"error": "invalid_arguments", "tool": e.tool_name, "details": e.errors},
+            default=str,
+        )
     if iscoroutine(response):
         return await response
     return response
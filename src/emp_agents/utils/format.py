@@ -1,6 +1,7 @@
-from typing import TYPE_CHECKING
-
-import tiktoken
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable
 
 if TYPE_CHECKING:
     from emp_agents.models import Message, Provider
@@ -12,6 +13,11 @@ You are an assistant that summarizes conversations concisely.
 Dont worry about human readability, just focus on conciseness.
 """
 
+DEFAULT_REDUCE_PROMPT = """
+You are an assistant that merges partial summaries of consecutive parts of one conversation.
+Combine them into a single concise summary, keeping the chronological order.
+"""
+
 
 def format_conversation(conversation: list["Message"]) -> str:
     """
@@ -30,6 +36,8 @@ def count_tokens(
     model: "OpenAIModelType | str" = "gpt-4o-mini",
 ) -> int:
     """OpenAI tokenizer is a good estimator for other providers token counts"""
+    import tiktoken
+
     encoding = tiktoken.encoding_for_model(model)
     tokens = 0
     if isinstance(messages, list):
@@ -77,3 +85,166 @@ async def summarize_conversation(
     except Exception as e:
         print(f"Error during summarization: {e}")
         return AssistantMessage(content="")
+
+
+class SegmentSummaryCache:
+    """
+    An LRU cache of summaries for conversation segments, keyed on the segment text.
+
+    Segments are cut greedily from the start of the conversation, so once a
+    segment is full it stays byte-identical as the conversation grows and its
+    summary can be reused by every later compaction.
+    """
+
+    def __init__(self, maxsize: int = 1_024):
+        self.maxsize = maxsize
+        self._summaries: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def key(text: str, prompt: str) -> str:
+        return hashlib.sha256(f"{prompt}\0{text}".encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        summary = self._summaries.get(key)
+        if summary is not None:
+            self._summaries.move_to_end(key)
+        return summary
+
+    def set(self, key: str, summary: str) -> None:
+        self._summaries[key] = summary
+        self._summaries.move_to_end(key)
+        while len(self._summaries) > self.maxsize:
+            self._summaries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+
+def split_conversation(
+    messages: list["Message"],
+    segment_tokens: int,
+    token_counter: Callable[["Message"], int] | None = None,
+) -> list[list["Message"]]:
+    """
+    Greedily split a conversation into consecutive segments of at most `segment_tokens`.
+    A single message larger than the budget becomes a segment of its own.
+    """
+    if token_counter is None:
+        token_counter = _count_message_tokens
+
+    segments: list[list["Message"]] = []
+    current: list["Message"] = []
+    current_tokens = 0
+    for message in messages:
+        tokens = token_counter(message)
+        if current and current_tokens + tokens > segment_tokens:
+            segments.append(current)
+            current, current_tokens = [], 0
+        current.append(message)
+        current_tokens += tokens
+    if current:
+        segments.append(current)
+    return segments
+
+
+def _count_message_tokens(message: "Message") -> int:
+    return count_tokens([message])
+
+
+async def _summarize_text(
+    provider: "Provider",
+    text: str,
+    model: str,
+    prompt: str,
+    instruction: str,
+    max_tokens: int,
+) -> str:
+    from emp_agents.models import Request, SystemMessage, UserMessage
+
+    request = Request(
+        messages=[
+            SystemMessage(content=prompt),
+            UserMessage(content=f"{instruction}\n\n{text}"),
+        ],
+        model=model,
+        max_tokens=max_tokens,
+        temperature=0.5,
+    )
+    response = await provider.completion(request)
+    return response.text
+
+
+async def summarize_conversation_hierarchical(
+    provider: "Provider",
+    messages: list["Message"],
+    model: str,
+    prompt: str | None = None,
+    max_tokens: int = 500,
+    segment_tokens: int = 4_000,
+    concurrency: int = 4,
+    cache: SegmentSummaryCache | None = None,
+    token_counter: Callable[["Message"], int] | None = None,
+) -> "Message":
+    """
+    Map-reduce summarization for histories too long to summarize in one request.
+
+    The conversation is split into token-bounded segments which are summarized
+    concurrently, then the partial summaries are merged.  If the merged partial
+    summaries are still over the segment budget they are reduced again, level by
+    level.  Passing a `cache` lets later compactions only summarize new segments.
+    Errors from the provider are raised.
+    """
+    from emp_agents.models import AssistantMessage
+
+    summary_prompt = prompt or DEFAULT_SUMMARY_PROMPT
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _summarize_segment(segment: list["Message"], merge: bool) -> str:
+        text = format_conversation(segment)
+        if merge:
+            # merges have their own prompt, the summary prompt is for the conversation
+            async with semaphore:
+                return await _summarize_text(
+                    provider,
+                    text,
+                    model,
+                    DEFAULT_REDUCE_PROMPT,
+                    "Merge these partial summaries:",
+                    max_tokens,
+                )
+
+        key = SegmentSummaryCache.key(text, summary_prompt)
+        if cache is not None and (cached := cache.get(key)) is not None:
+            return cached
+        async with semaphore:
+            summary = await _summarize_text(
+                provider,
+                text,
+                model,
+                summary_prompt,
+                "Summarize the following conversation:",
+                max_tokens,
+            )
+        if cache is not None:
+            cache.set(key, summary)
+        return summary
+
+    segments = split_conversation(messages, segment_tokens, token_counter)
+    if not segments:
+        return AssistantMessage(content="")
+    merge = False
+    while True:
+        partials = await asyncio.gather(
+            *[_summarize_segment(segment, merge) for segment in segments]
+        )
+        if len(partials) == 1:
+            return AssistantMessage(content=partials[0])
+
+        summaries: list["Message"] = [
+            AssistantMessage(content=partial) for partial in partials
+        ]
+        segments = split_conversation(summaries, segment_tokens, token_counter)
+        if len(segments) == len(summaries):
+            # partial summaries are too large to group, merge them pairwise
+            segments = [summaries[i : i + 2] for i in range(0, len(summaries), 2)]
+        merge = True
@@ -2,12 +2,22 @@
 A small utility to generate JSON schemas for python functions.
 """
 
-from .core import Annotated, Doc, FunctionSchema, get_function_schema, guess_type
+from .core import (
+    Annotated,
+    Doc,
+    FunctionSchema,
+    get_arguments_adapter,
+    get_function_schema,
+    get_signature,
+    guess_type,
+)
 
 __version__ = "0.4.4"
 __all__ = (
     "__version__",
+    "get_arguments_adapter",
     "get_function_schema",
+    "get_signature",
     "guess_type",
     "Doc",
     "Annotated",
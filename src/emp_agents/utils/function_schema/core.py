@@ -1,5 +1,7 @@
+import copy
 import enum
 import inspect
+import weakref
 from inspect import isclass
 from typing import (
     Annotated,
@@ -10,10 +12,12 @@ from typing import (
     Union,
     get_args,
     get_origin,
+    get_type_hints,
 )
 
 from fast_depends.dependencies.model import Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing_extensions import NotRequired, TypedDict
 
 from emp_agents.implicits.models import IgnoreDepends
 
@@ -26,7 +30,88 @@ except ImportError:
     UnionType = Union  # type: ignore
 
 
-__all__ = ("get_function_schema", "guess_type", "Doc", "Annotated")
+__all__ = (
+    "get_arguments_adapter",
+    "get_function_schema",
+    "get_signature",
+    "guess_type",
+    "Doc",
+    "Annotated",
+)
+
+# keyed weakly on the function, so schemas are dropped along with their functions
+_signatures: "weakref.WeakKeyDictionary[Callable, inspect.Signature]" = (
+    weakref.WeakKeyDictionary()
+)
+_schemas: "weakref.WeakKeyDictionary[Callable, dict[tuple, FunctionSchema]]" = (
+    weakref.WeakKeyDictionary()
+)
+_adapters: "weakref.WeakKeyDictionary[Callable, TypeAdapter]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_signature(func: Callable) -> inspect.Signature:
+    """`inspect.signature`, memoized per function object"""
+    try:
+        signature = _signatures.get(func)
+    except TypeError:
+        # not weak referenceable or not hashable
+        return inspect.signature(func)
+    if signature is None:
+        signature = _signatures[func] = inspect.signature(func)
+    return signature
+
+
+def get_arguments_adapter(func: Callable) -> TypeAdapter[dict[str, Any]]:
+    """
+    A validator for the arguments a model passes to `func`, built from its signature.
+
+    Arguments are validated and coerced to the annotated types, unknown arguments
+    are rejected unless `func` takes `**kwargs`, and parameters filled by
+    dependency injection are left out.  Only the arguments that were passed are
+    returned, so the function's own defaults still apply.
+    """
+    if isinstance(func, (classmethod, staticmethod)):
+        func = func.__func__
+    try:
+        return _adapters[func]
+    except KeyError:
+        pass
+    except TypeError:
+        return _build_arguments_adapter(func)
+    adapter = _adapters[func] = _build_arguments_adapter(func)
+    return adapter
+
+
+def _build_arguments_adapter(func: Callable) -> TypeAdapter[dict[str, Any]]:
+    try:
+        hints = get_type_hints(func, include_extras=True)
+    except Exception:
+        hints = {}
+
+    fields: dict[str, Any] = {}
+    extra: Literal["allow", "forbid"] = "forbid"
+    for name, param in get_signature(func).parameters.items():
+        if name == "self" or isinstance(param.default, Depends):
+            continue
+        if param.kind is inspect.Parameter.VAR_KEYWORD:
+            extra = "allow"
+            continue
+        if param.kind is inspect.Parameter.VAR_POSITIONAL:
+            continue
+        annotation = hints.get(name, param.annotation)
+        if annotation is inspect.Parameter.empty:
+            annotation = Any
+        if param.default is not inspect.Parameter.empty:
+            annotation = NotRequired[annotation]
+        fields[name] = annotation
+
+    arguments = TypedDict(f"{func.__name__}_arguments", fields)  # type: ignore[misc]
+    arguments.__pydantic_config__ = ConfigDict(  # type: ignore[attr-defined]
+        extra=extra, arbitrary_types_allowed=True
+    )
+    return TypeAdapter(arguments)
 
 
 def get_function_schema(  # noqa: C901
@@ -79,13 +164,32 @@ def get_function_schema(  # noqa: C901
             'required': ['city']
         }
     }
+
+    Schemas are memoized per function object, a function is assumed not to change
+    its signature or docstring after its schema is first built.
     """
     if isinstance(func, classmethod):
         func = func.__func__
     elif isinstance(func, staticmethod):
         func = func.__func__
 
-    sig = inspect.signature(func)
+    key = (format, ignore_class_arg)
+    try:
+        cached = _schemas.setdefault(func, {})
+    except TypeError:
+        return _build_function_schema(func, format, ignore_class_arg)
+    if key not in cached:
+        cached[key] = _build_function_schema(func, format, ignore_class_arg)
+    # callers are free to modify the schema they get
+    return copy.deepcopy(cached[key])
+
+
+def _build_function_schema(  # noqa: C901
+    func: Callable,
+    format: Optional[Literal["openai", "claude"]],
+    ignore_class_arg: bool,
+) -> FunctionSchema:
+    sig = get_signature(func)
     params = sig.parameters
     schema: dict[str, Any] = {
         "type": "object",
@@ -145,16 +249,16 @@ def get_function_schema(  # noqa: C901
         ):
             continue
 
+        type_ = guess_type(T)
         schema["properties"][name] = {
-            "type": guess_type(T),
+            "type": type_,
             "description": description,
         }
         if isclass(T) and issubclass(T, BaseModel):
-            schema["properties"][name]["properties"] = T.model_json_schema()[
-                "properties"
-            ]
+            model_schema = T.model_json_schema()
+            schema["properties"][name]["properties"] = model_schema["properties"]
             schema["properties"][name]["type"] = "object"
-            schema["properties"][name]["required"] = T.model_json_schema()["required"]
+            schema["properties"][name]["required"] = model_schema["required"]
 
             for item in schema["properties"][name]["properties"]:
                 del schema["properties"][name]["properties"][item]["title"]
@@ -162,7 +266,7 @@ def get_function_schema(  # noqa: C901
                     "description"
                 ] = "a field in the model"
 
-        if guess_type(T) == "array":
+        if type_ == "array":
             schema["properties"][name]["items"] = {"type": guess_type(get_args(T)[0])}
 
         if enum_ is not None:
@@ -191,7 +295,8 @@ def get_function_schema(  # noqa: C901
 
     params_key = "input_schema" if format == "claude" else "parameters"
 
-    schema["required"] = list(set(schema["required"]))
+    # dedupe in signature order, a set would reorder by hash between processes
+    schema["required"] = list(dict.fromkeys(schema["required"]))
 
     return {
         "name": func.__name__,
@@ -222,15 +327,11 @@ def guess_type(  # noqa: C901
     # hacking around typing modules, `typing.Union` and `types.UnitonType`
     if origin in [Union, UnionType]:
         union_types = [t for t in get_args(T) if t is not type(None)]
-        _types = [
-            guess_type(union_type)
-            for union_type in union_types
-            if guess_type(union_type) is not None
-        ]
+        _types = [_type for _type in map(guess_type, union_types) if _type is not None]
 
         # number contains integer in JSON schema
-        # deduplicate
-        _types = list(set(_types))
+        # deduplicate, keeping the order of the union
+        _types = [t for i, t in enumerate(_types) if t not in _types[:i]]
 
         if len(_types) == 1:
             return _types[0]
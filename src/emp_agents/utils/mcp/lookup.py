@@ -1,5 +1,7 @@
+import asyncio
 from typing import TYPE_CHECKING
 
+from emp_agents.logger import logger
 from emp_agents.types.mcp import MCPClient
 
 if TYPE_CHECKING:
@@ -11,13 +13,24 @@ class MCPUtil:
 
     @classmethod
     async def get_all_function_tools(
-        cls, clients: list["MCPClient"]
+        cls, clients: list["MCPClient"], raise_on_error: bool = False
     ) -> list["MCPTool"]:
-        """Get all function tools from a list of MCP servers."""
+        """
+        Get all function tools from a list of MCP servers, listed concurrently.
+        Servers that fail are skipped unless `raise_on_error` is set.
+        """
+        results = await asyncio.gather(
+            *(cls.get_tools(client) for client in clients),
+            return_exceptions=True,
+        )
         tools = []
         tool_names: set[str] = set()
-        for client in clients:
-            server_tools = await cls.get_tools(client)
+        for client, server_tools in zip(clients, results):
+            if isinstance(server_tools, BaseException):
+                if raise_on_error:
+                    raise server_tools
+                logger.warning(f"Skipping MCP server {client.params}: {server_tools!r}")
+                continue
             server_tool_names = {tool.name for tool in server_tools}
             if len(server_tool_names & tool_names) > 0:
                 raise Exception(
@@ -0,0 +1,72 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from mcp.types import InitializeResult, Tool
+from pydantic import BaseModel, Field
+
+from emp_agents.logger import logger
+from emp_agents.utils.canonical import request_fingerprint
+
+
+def server_version(initialize_result: InitializeResult) -> str:
+    """
+    An ETag for a server's tools, from what it reports when a session is
+    initialized: its name and version, protocol version and capabilities.
+    """
+    return request_fingerprint(
+        initialize_result.model_dump(mode="json", exclude={"meta", "instructions"})
+    )
+
+
+def tools_digest(tools: list[Tool]) -> str:
+    """A hash of a server's tool list, to tell whether it changed"""
+    return request_fingerprint([tool.model_dump(mode="json") for tool in tools])
+
+
+class ToolManifestCache(BaseModel):
+    """
+    Caches the tools listed by MCP servers on disk, one JSON file per server,
+    so a warm restart does not wait for the tools to be listed.  An entry is
+    only used while the server reports the same version, and is dropped when the
+    server sends a `tools/list_changed` notification.  For servers that change
+    their tools without either, `revalidate` lists the tools again in the
+    background after a warm start, and replaces the entry if they differ.
+    """
+
+    directory: Path = Field(description="The directory the manifests are kept in")
+    revalidate: bool = Field(
+        default=False,
+        description="List the tools again in the background after a warm start",
+    )
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self, key: str, version: str) -> list[Tool] | None:
+        try:
+            manifest = json.loads(self._path(key).read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable MCP tool manifest {key}: {e}")
+            return None
+        if manifest.get("version") != version:
+            return None
+        return [Tool.model_validate(tool) for tool in manifest["tools"]]
+
+    def store(self, key: str, version: str, tools: list[Tool]) -> None:
+        manifest: dict[str, Any] = {
+            "version": version,
+            "tools": [tool.model_dump(mode="json") for tool in tools],
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # written to a temporary file and renamed, so readers never see half a file
+        path = self._path(key)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(manifest))
+        os.replace(temporary, path)
+
+    def invalidate(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
@@ -0,0 +1,180 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from mcp import ClientSession
+from pydantic import BaseModel, Field
+
+from emp_agents.exceptions import MCPConnectionException, MCPPoolSaturatedException
+from emp_agents.utils.mcp.session import MCPSession, NotificationListener
+
+T = TypeVar("T")
+
+
+class MCPPoolMetrics(BaseModel):
+    """A snapshot of an `MCPSessionPool`"""
+
+    sessions: int
+    connected: int
+    in_flight: int
+    queue_depth: int = Field(description="Calls waiting for a free slot")
+    max_queue_depth: int
+    calls: int
+    failures: int
+    timeouts: int
+    rejected: int
+    latency_avg: float | None = Field(description="Seconds, over the recent calls")
+    latency_p50: float | None
+    latency_p95: float | None
+    latency_max: float | None
+
+
+class MCPSessionPool:
+    """
+    A bounded pool of sessions with one MCP server.
+
+    Each call is dispatched to the session with the fewest calls in flight, and
+    a new session is opened, up to `size`, when every open one is busy.  With
+    `max_calls_per_session` set the pool has a fixed capacity: further calls
+    wait for a slot, and once `max_queue` calls are waiting new calls are
+    rejected with `MCPPoolSaturatedException`.  Calls that take longer than
+    `call_timeout`, not counting the time to connect, raise `TimeoutError`.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], MCPSession],
+        size: int = 1,
+        max_calls_per_session: int | None = None,
+        max_queue: int | None = None,
+        call_timeout: float | None = None,
+        latency_window: int = 1_000,
+    ):
+        assert size >= 1, "A pool needs at least one session"
+        self.session_factory = session_factory
+        self.size = size
+        self.max_calls_per_session = max_calls_per_session
+        self.max_queue = max_queue
+        self.call_timeout = call_timeout
+        # shared by every session of the pool
+        self.listeners: list[NotificationListener] = []
+
+        self.sessions: list[MCPSession] = []
+        self._in_flight: dict[MCPSession, int] = {}
+        self._slots = (
+            asyncio.Semaphore(size * max_calls_per_session)
+            if max_calls_per_session
+            else None
+        )
+        self._waiting = 0
+        self._max_waiting = 0
+        self._calls = 0
+        self._failures = 0
+        self._timeouts = 0
+        self._rejected = 0
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+
+        self._add_session()
+
+    @property
+    def primary(self) -> MCPSession:
+        """The first session of the pool, which is always open"""
+        return self.sessions[0]
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self.primary.loop
+
+    def _add_session(self) -> MCPSession:
+        session = self.session_factory()
+        session.listeners = self.listeners
+        self.sessions.append(session)
+        self._in_flight[session] = 0
+        return session
+
+    def _pick(self) -> MCPSession:
+        session = min(self.sessions, key=self._in_flight.__getitem__)
+        if self._in_flight[session] and len(self.sessions) < self.size:
+            session = self._add_session()
+        return session
+
+    async def _acquire_slot(self) -> None:
+        if self._slots is None:
+            return
+        if self._slots.locked():
+            if self.max_queue is not None and self._waiting >= self.max_queue:
+                self._rejected += 1
+                raise MCPPoolSaturatedException(
+                    f"{self._waiting} calls are already waiting for the MCP server"
+                )
+        self._waiting += 1
+        self._max_waiting = max(self._max_waiting, self._waiting)
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+    async def run(
+        self,
+        operation: Callable[[ClientSession], Awaitable[T]],
+        retry: bool = False,
+    ) -> T:
+        """Run `operation` on the least loaded session, see `MCPSession.run`"""
+        await self._acquire_slot()
+        session = self._pick()
+        self._in_flight[session] += 1
+        self._calls += 1
+        start = time.perf_counter()
+        try:
+            # connecting is bounded by the session's `connect_timeout`, only the
+            # call itself by `call_timeout`
+            await session.get()
+            start = time.perf_counter()
+            return await asyncio.wait_for(
+                session.run(operation, retry=retry), self.call_timeout
+            )
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise
+        except (Exception, MCPConnectionException):
+            self._failures += 1
+            raise
+        finally:
+            self._latencies.append(time.perf_counter() - start)
+            self._in_flight[session] -= 1
+            if self._slots is not None:
+                self._slots.release()
+
+    def metrics(self) -> MCPPoolMetrics:
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction: float) -> float | None:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+        return MCPPoolMetrics(
+            sessions=len(self.sessions),
+            connected=sum(session.connected for session in self.sessions),
+            in_flight=sum(self._in_flight.values()),
+            queue_depth=self._waiting,
+            max_queue_depth=self._max_waiting,
+            calls=self._calls,
+            failures=self._failures,
+            timeouts=self._timeouts,
+            rejected=self._rejected,
+            latency_avg=sum(latencies) / len(latencies) if latencies else None,
+            latency_p50=percentile(0.5),
+            latency_p95=percentile(0.95),
+            latency_max=latencies[-1] if latencies else None,
+        )
+
+    def reset_metrics(self) -> None:
+        """Start counting calls and latencies afresh, eg. after a warm up"""
+        self._max_waiting = self._waiting
+        self._calls = self._failures = self._timeouts = self._rejected = 0
+        self._latencies.clear()
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(session.aclose() for session in self.sessions))
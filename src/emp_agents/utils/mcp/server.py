@@ -0,0 +1,266 @@
+"""
+Serve emp_agents tools over MCP, so other processes can use skills and agents
+without importing emp_agents.
+
+    emp-agents-mcp                                # every registered skill, over stdio
+    emp-agents-mcp --skill ERC20Skill --transport sse --port 8000
+    emp-agents-mcp --module my_package.skills --agent my_package.agents:researcher
+"""
+
+import argparse
+import asyncio
+import contextvars
+import importlib
+import inspect
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Iterable, Sequence
+
+from mcp import types
+from mcp.server.lowlevel import Server
+
+from emp_agents.exceptions import DuplicateToolException, InvalidToolArgumentsException
+from emp_agents.logger import logger
+from emp_agents.models import FunctionTool, GenericTool
+from emp_agents.models.protocol.registry import ToolRegistry
+
+if TYPE_CHECKING:
+    from emp_agents.agents.base import AgentBase
+
+DEFAULT_MODULES = ["emp_agents.tools"]
+
+
+def _is_async(tool: GenericTool) -> bool:
+    if isinstance(tool, FunctionTool):
+        func = tool.func
+        if isinstance(func, (classmethod, staticmethod)):
+            func = func.__func__
+        return inspect.iscoroutinefunction(func)
+    return inspect.iscoroutinefunction(tool.execute)
+
+
+def _to_content(result: Any) -> list[types.TextContent]:
+    text = result if isinstance(result, str) else json.dumps(result, default=str)
+    return [types.TextContent(type="text", text=text)]
+
+
+class ToolServer:
+    """
+    An MCP server for a set of tools.
+
+    The MCP server handles every request in its own task, so calls run
+    concurrently: async tools on the event loop and sync tools in a thread pool
+    of `max_workers` threads, so a blocking tool does not stall the others.
+    `max_concurrency` bounds the number of calls executing at once.
+    """
+
+    def __init__(
+        self,
+        tools: Iterable[GenericTool] = (),
+        name: str = "emp-agents",
+        max_concurrency: int | None = None,
+        max_workers: int | None = None,
+    ):
+        self.name = name
+        self.tools: dict[str, GenericTool] = {}
+        for tool in tools:
+            self.add_tool(tool)
+
+        self._limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="emp-agents-mcp"
+        )
+        self.server: Server = Server(name)
+        self.server.list_tools()(self.list_tools)
+        self.server.call_tool()(self.call_tool)
+
+    def add_tool(self, tool: GenericTool) -> None:
+        if tool.name in self.tools:
+            raise DuplicateToolException(f"Tool {tool.name} already exists")
+        self.tools[tool.name] = tool
+
+    def add_skill(self, skill_name: str) -> None:
+        """Add a registered skill's tools, skipping any whose schema cannot be built"""
+        for tool_name in ToolRegistry.get_tool_names(skill_name):
+            try:
+                tool = ToolRegistry.get_tool(skill_name, tool_name)
+            except Exception as e:
+                logger.warning(f"Not serving {skill_name}.{tool_name}: {e!r}")
+                continue
+            self.add_tool(tool)
+
+    def add_agent(self, agent: "AgentBase", name: str | None = None) -> None:
+        """Expose an agent as a tool that answers questions"""
+        tool = FunctionTool.from_agent(agent)
+        self.add_tool(
+            tool.model_copy(update={"name": name or agent.agent_id or "answer"})
+        )
+
+    async def list_tools(self) -> list[types.Tool]:
+        return [
+            types.Tool(
+                name=tool.name,
+                description=tool.description,
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        key: param.model_dump(exclude_none=True)
+                        for key, param in tool.parameters.items()
+                    },
+                    "required": tool.required,
+                },
+            )
+            for tool in self.tools.values()
+        ]
+
+    async def execute(self, tool: GenericTool, arguments: dict[str, Any]) -> Any:
+        if _is_async(tool):
+            return await tool.execute(**arguments)
+
+        # like `asyncio.to_thread`, the tool sees the calling task's context
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self._executor, partial(context.run, tool.execute, **arguments)
+        )
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def call_tool(
+        self, name: str, arguments: dict[str, Any]
+    ) -> list[types.TextContent]:
+        tool = self.tools.get(name)
+        if tool is None:
+            raise ValueError(f"Unknown tool: {name}")
+
+        try:
+            if self._limit is None:
+                result = await self.execute(tool, arguments)
+            else:
+                async with self._limit:
+                    result = await self.execute(tool, arguments)
+        except InvalidToolArgumentsException as e:
+            # the same payload `execute_tool` gives an agent, so the caller can retry
+            return _to_content(
+                {"error": "invalid_arguments", "tool": e.tool_name, "details": e.errors}
+            )
+        return _to_content(result)
+
+    async def run_stdio(self) -> None:
+        from mcp.server.stdio import stdio_server
+
+        async with stdio_server() as (read, write):
+            await self.server.run(
+                read, write, self.server.create_initialization_options()
+            )
+
+    def sse_app(self):
+        from mcp.server.sse import SseServerTransport
+        from starlette.applications import Starlette
+        from starlette.routing import Mount, Route
+
+        sse = SseServerTransport("/messages/")
+
+        async def handle_sse(request) -> None:
+            async with sse.connect_sse(
+                request.scope, request.receive, request._send
+            ) as (read, write):
+                await self.server.run(
+                    read, write, self.server.create_initialization_options()
+                )
+
+        return Starlette(
+            routes=[
+                Route("/sse", endpoint=handle_sse),
+                Mount("/messages/", app=sse.handle_post_message),
+            ]
+        )
+
+    async def run_sse(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        import uvicorn
+
+        server = uvicorn.Server(uvicorn.Config(self.sse_app(), host=host, port=port))
+        await server.serve()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _load_object(path: str) -> Any:
+    module_name, _, attribute = path.partition(":")
+    obj = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def build_server(
+    modules: Sequence[str] = DEFAULT_MODULES,
+    skills: Sequence[str] | None = None,
+    agents: Sequence[str] = (),
+    **kwargs: Any,
+) -> ToolServer:
+    """
+    A server for the skills registered by importing `modules`, every one unless
+    `skills` names them, and the agents at the `module:attribute` paths.
+    """
+    for module in modules:
+        importlib.import_module(module)
+
+    server = ToolServer(**kwargs)
+    for skill_name in skills or ToolRegistry.get_skill_names():
+        server.add_skill(skill_name)
+    for path in agents:
+        server.add_agent(_load_object(path), name=path.rpartition(":")[2] or None)
+    logger.info(f"Serving {len(server.tools)} tools over MCP")
+    return server
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--transport", choices=["stdio", "sse"], default="stdio")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--module",
+        action="append",
+        dest="modules",
+        help="Import a module to register its skills, defaults to emp_agents.tools",
+    )
+    parser.add_argument(
+        "--skill",
+        action="append",
+        dest="skills",
+        help="Serve only these skills, by class name",
+    )
+    parser.add_argument(
+        "--agent",
+        action="append",
+        dest="agents",
+        default=[],
+        help="Serve an agent, as module:attribute",
+    )
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    parser.add_argument("--max-workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = build_server(
+        modules=args.modules or DEFAULT_MODULES,
+        skills=args.skills,
+        agents=args.agents,
+        max_concurrency=args.max_concurrency,
+        max_workers=args.max_workers,
+    )
+    try:
+        if args.transport == "sse":
+            asyncio.run(server.run_sse(args.host, args.port))
+        else:
+            asyncio.run(server.run_stdio())
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import asyncio
+from contextlib import AbstractAsyncContextManager
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, TypeVar
+
+import anyio
+import anyio.abc
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp import ClientSession
+from mcp.types import InitializeResult, ServerNotification
+
+from emp_agents.exceptions import MCPConnectionException
+from emp_agents.logger import logger
+
+T = TypeVar("T")
+
+Streams = tuple[MemoryObjectReceiveStream, MemoryObjectSendStream]
+StreamsFactory = Callable[[], AbstractAsyncContextManager[Streams]]
+NotificationListener = Callable[[ServerNotification], None]
+
+# raised by the mcp SDK when a request is made on, or waiting on, a lost connection
+CONNECTION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+
+
+class MCPSession:
+    """
+    A long-lived, reconnecting session with an MCP server.
+
+    A supervisor task owns the transport (an SSE connection or a stdio server
+    process) and the `ClientSession` on top of it, because the SDK's context
+    managers must be entered and exited in the same task.  Requests from any
+    task are multiplexed over the one session, the server is pinged every
+    `health_check_interval` seconds, and a lost connection is reopened with
+    exponential backoff.
+
+    Reads are retried once on a fresh connection.  Tool calls are not, since the
+    server may have already acted on a call that was in flight when the
+    connection dropped; they raise `MCPConnectionException` instead.
+    """
+
+    def __init__(
+        self,
+        open_streams: StreamsFactory,
+        health_check_interval: float = 30.0,
+        ping_timeout: float = 10.0,
+        connect_timeout: float = 30.0,
+        request_timeout: float | None = None,
+        max_reconnect_delay: float = 30.0,
+    ):
+        self.open_streams = open_streams
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self.max_reconnect_delay = max_reconnect_delay
+
+        # the number of connections opened so far
+        self.generation = 0
+        self.last_error: BaseException | None = None
+        # what the server reported when the current connection was initialized
+        self.initialize_result: InitializeResult | None = None
+        self.listeners: list[NotificationListener] = []
+
+        self._session: ClientSession | None = None
+        self._connected = asyncio.Event()
+        # set to wake the supervisor when the connection is lost or on close
+        self._wake = asyncio.Event()
+        self._closing = False
+        self._supervisor: asyncio.Task | None = None
+        self._connection_scope: anyio.CancelScope | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._session is not None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self._loop
+
+    def start(self) -> None:
+        if self._supervisor is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def get(self) -> ClientSession:
+        """The live session, waiting for the connection to be (re)opened"""
+        if self._closing:
+            raise MCPConnectionException("The MCP session is closed")
+        self.start()
+        try:
+            await asyncio.wait_for(self._connected.wait(), self.connect_timeout)
+        except asyncio.TimeoutError as e:
+            raise MCPConnectionException(
+                f"Could not connect to the MCP server: {self.last_error!r}"
+            ) from e
+        assert self._session is not None
+        return self._session
+
+    async def run(
+        self,
+        operation: Callable[[ClientSession], Awaitable[T]],
+        retry: bool = False,
+    ) -> T:
+        """Run `operation` on the session, optionally retrying it once on a new connection"""
+        attempts = 2 if retry else 1
+        for attempt in range(attempts):
+            session = await self.get()
+            try:
+                return await operation(session)
+            except CONNECTION_ERRORS as e:
+                self._lost(session)
+                if attempt == attempts - 1:
+                    raise MCPConnectionException(
+                        "The connection to the MCP server was lost"
+                    ) from e
+        raise AssertionError("unreachable")
+
+    async def aclose(self) -> None:
+        self._closing = True
+        self._wake.set()
+        if self._connection_scope is not None:
+            self._connection_scope.cancel()
+        if self._supervisor is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._supervisor), 5)
+            except asyncio.TimeoutError:
+                self._supervisor.cancel()
+        self._supervisor = None
+
+    async def __aenter__(self) -> "MCPSession":
+        self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    def _lost(self, session: ClientSession | None = None) -> None:
+        if session is None or session is self._session:
+            self._session = None
+            self._connected.clear()
+            self._wake.set()
+
+    async def _supervise(self) -> None:
+        delay = 0.1
+        while not self._closing:
+            self._wake.clear()
+            generation = self.generation
+            try:
+                await self._connect()
+                if self.generation == generation and not self._closing:
+                    self.last_error = ConnectionError(
+                        "The server closed the connection while initializing"
+                    )
+            except Exception as e:
+                self.last_error = e
+                logger.warning(f"MCP connection failed: {e!r}")
+            finally:
+                self._connection_scope = None
+                self._lost()
+
+            if self._closing:
+                break
+            if self.generation != generation:
+                delay = 0.1
+            # back off before reconnecting, returning early on close
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _connect(self) -> None:
+        timeout = (
+            timedelta(seconds=self.request_timeout) if self.request_timeout else None
+        )
+        async with self.open_streams() as (read, write):
+            # messages are relayed so a server going away is noticed immediately
+            relay_write, relay_read = anyio.create_memory_object_stream[Any](0)
+            async with anyio.create_task_group() as task_group:
+                self._connection_scope = task_group.cancel_scope
+                task_group.start_soon(self._relay, read, relay_write, task_group)
+                async with ClientSession(
+                    relay_read,
+                    write,
+                    read_timeout_seconds=timeout,
+                    message_handler=self._handle_message,
+                ) as session:
+                    self.initialize_result = await session.initialize()
+                    self.generation += 1
+                    self._session = session
+                    self._connected.set()
+                    await self._watch(session)
+                task_group.cancel_scope.cancel()
+
+    async def _handle_message(self, message: Any) -> None:
+        if isinstance(message, ServerNotification):
+            for listener in self.listeners:
+                listener(message)
+
+    async def _relay(
+        self,
+        read: MemoryObjectReceiveStream,
+        write: MemoryObjectSendStream,
+        task_group: anyio.abc.TaskGroup,
+    ) -> None:
+        try:
+            async with write:
+                async for message in read:
+                    await write.send(message)
+        except CONNECTION_ERRORS:
+            pass
+        # the server went away, abandon the session even if it is still initializing
+        task_group.cancel_scope.cancel()
+
+    async def _watch(self, session: ClientSession) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.health_check_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                with anyio.fail_after(self.ping_timeout):
+                    await session.send_ping()
+            except Exception as e:
+                self.last_error = e
+                logger.warning(f"MCP health check failed: {e!r}")
+                return
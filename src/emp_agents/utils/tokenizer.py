@@ -1,13 +1,13 @@
-from typing import TYPE_CHECKING
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterator
 
 import tiktoken
 
-from emp_agents.models import SystemMessage, UserMessage
+from emp_agents.models import Provider, SystemMessage, UserMessage
 from emp_agents.models.shared import Request
-from emp_agents.providers import OpenAIModelType
-
-if TYPE_CHECKING:
-    from emp_agents.models.openai import OpenAIBase
 
 document = "<document>"
 
@@ -24,7 +24,12 @@ Document: \"\"\"<document>\"\"\"
 1."""
 
 
-async def extract_chunk(client: OpenAIBase, document, template_prompt=template_prompt):
+async def extract_chunk(
+    client: Provider,
+    document: str,
+    template_prompt: str = template_prompt,
+    model: str | None = None,
+) -> str:
     prompt = template_prompt.replace("<document>", document)
 
     messages = [
@@ -33,7 +38,7 @@ async def extract_chunk(client: OpenAIBase, document, template_prompt=template_p
     ]
     response = await client.completion(
         Request(
-            model=OpenAIModelType.gpt4,
+            model=client._load_model(model),
             messages=messages,
             temperature=0,
             max_tokens=1500,
@@ -42,23 +47,173 @@ async def extract_chunk(client: OpenAIBase, document, template_prompt=template_p
             presence_penalty=0,
         )
     )
-    assert response.choices[0].message.content, "No content"
-    return "1." + response.choices[0].message.content
+    assert response.text, "No content"
+    return "1." + response.text
+
+
+class ExtractionCheckpoint:
+    """
+    Append-only JSONL record of the chunks that have already been extracted.
+
+    The first line identifies the document, chunking settings, tokenizer and
+    model, so a checkpoint is never resumed against a different document or
+    encoding.  Every completed chunk is appended as its own line, which keeps
+    writes O(1) for very large documents.  A line left incomplete by an
+    interrupted run is cut off on load, so the next record starts on its own
+    line.
+    """
+
+    def __init__(self, path: Path | str, digest: str):
+        self.path = Path(path)
+        self.digest = digest
+        self.results: dict[int, str] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            self._write_header()
+            return
+
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            complete = data.rfind(b"\n") + 1
+            if complete < len(data):
+                # drop the partially written final line of an interrupted run
+                f.truncate(complete)
+        lines = data[:complete].decode().splitlines()
 
+        header = json.loads(lines[0]) if lines else {}
+        if header.get("digest") != self.digest:
+            self._write_header()
+            return
 
-def chunk(client: OpenAIBase, text: str):
+        for line in lines[1:]:
+            row = json.loads(line)
+            self.results[row["index"]] = row["result"]
+
+    def _write_header(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as f:
+            f.write(json.dumps({"digest": self.digest}) + "\n")
+
+    def record(self, index: int, result: str) -> None:
+        self.results[index] = result
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"index": index, "result": result}) + "\n")
+
+
+def split_document(
+    text: str, chunk_size: int = 1000, tokenizer: Any | None = None
+) -> list[str]:
+    """Split a document into roughly `chunk_size` token chunks, on sentence boundaries"""
     clean_text = text.replace("  ", " ").replace("\n", "; ").replace(";", " ")
-    tokenizer = tiktoken.get_encoding("cl100k_base")
-    results = []
-    chunks = create_chunks(clean_text, 1000, tokenizer)
-    text_chunks = [tokenizer.decode(chunk) for chunk in chunks]
-    for chunk in text_chunks:
-        results.append(extract_chunk(client, chunk, template_prompt))
+    if tokenizer is None:
+        tokenizer = tiktoken.get_encoding("cl100k_base")
+    chunks = create_chunks(clean_text, chunk_size, tokenizer)
+    return [tokenizer.decode(chunk) for chunk in chunks]
 
 
-def create_chunks(text: str, n, tokenizer):
-    tokens = tokenizer.encode(text)
+async def map_extract(
+    client: Provider,
+    text: str,
+    template_prompt: str = template_prompt,
+    model: str | None = None,
+    chunk_size: int = 1000,
+    concurrency: int = 8,
+    checkpoint: Path | str | None = None,
+    tokenizer: Any | None = None,
+) -> AsyncIterator[tuple[int, str]]:
+    """
+    Run `extract_chunk` over every chunk of a document with bounded concurrency.
+
+    Results are yielded as `(chunk_index, result)` in completion order.  If a
+    checkpoint path is given, completed chunks are persisted and skipped when
+    the same document is processed again, so an interrupted run can resume.
+    Any tokenizer with tiktoken's `encode`/`decode` interface can be supplied.
+    """
+    text_chunks = split_document(text, chunk_size, tokenizer)
+
+    saved: ExtractionCheckpoint | None = None
+    if checkpoint is not None:
+        encoding = getattr(tokenizer, "name", None) or (
+            type(tokenizer).__qualname__ if tokenizer is not None else "cl100k_base"
+        )
+        digest = hashlib.sha256(
+            f"{chunk_size}:{encoding}:{client._load_model(model)}:"
+            f"{template_prompt}:{text}".encode()
+        ).hexdigest()
+        saved = ExtractionCheckpoint(checkpoint, digest)
+        for index, result in sorted(saved.results.items()):
+            yield index, result
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _run(index: int, chunk_text: str) -> tuple[int, str]:
+        async with semaphore:
+            return index, await extract_chunk(
+                client, chunk_text, template_prompt, model=model
+            )
+
+    pending = [
+        asyncio.create_task(_run(index, chunk_text))
+        for index, chunk_text in enumerate(text_chunks)
+        if saved is None or index not in saved.results
+    ]
+    try:
+        for next_result in asyncio.as_completed(pending):
+            index, result = await next_result
+            if saved is not None:
+                saved.record(index, result)
+            yield index, result
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def extract_document(
+    client: Provider,
+    text: str,
+    template_prompt: str = template_prompt,
+    model: str | None = None,
+    chunk_size: int = 1000,
+    concurrency: int = 8,
+    checkpoint: Path | str | None = None,
+    tokenizer: Any | None = None,
+    merge: Callable[[list[str]], str] = "\n".join,
+) -> str:
+    """Extract information from a whole document, merging the results in chunk order"""
+    results: dict[int, str] = {}
+    async for index, result in map_extract(
+        client,
+        text,
+        template_prompt,
+        model=model,
+        chunk_size=chunk_size,
+        concurrency=concurrency,
+        checkpoint=checkpoint,
+        tokenizer=tokenizer,
+    ):
+        results[index] = result
+    return merge([results[index] for index in sorted(results)])
+
+
+async def chunk(
+    client: Provider,
+    text: str,
+    model: str | None = None,
+    concurrency: int = 8,
+) -> list[str]:
+    results: dict[int, str] = {}
+    async for index, result in map_extract(
+        client, text, template_prompt, model=model, concurrency=concurrency
+    ):
+        results[index] = result
+    return [results[index] for index in sorted(results)]
+
+
+def create_chunks(text: str, n, tokenizer) -> Iterator[list[int]]:
     """Yield successive n-sized chunks from text."""
+    tokens = tokenizer.encode(text)
     i = 0
     while i < len(tokens):
         # Find the nearest end of sentence within a range of 0.5 * n and 1.5 * n tokens
@@ -0,0 +1,49 @@
+import asyncio
+from typing import Any, Callable
+
+from pydantic import Field
+
+from emp_agents.models import (
+    AssistantMessage,
+    Message,
+    Provider,
+    Request,
+    ResponseT,
+    ToolCall,
+)
+
+
+class FakeResponse(ResponseT):
+    content: str = ""
+    calls: list[ToolCall] = Field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return self.content
+
+    @property
+    def messages(self) -> list[Message]:
+        return [AssistantMessage(content=self.content, tool_calls=self.calls or None)]
+
+    @property
+    def tool_calls(self) -> list[ToolCall]:
+        return self.calls
+
+
+class FakeProvider(Provider[FakeResponse]):
+    """A provider that answers every request with `respond(request)`, without any network calls"""
+
+    api_key: str | None = "fake"
+    default_model: str | None = "fake-model"
+    respond: Callable[[Request], str | FakeResponse] = lambda request: "ok"
+    delay: float = 0
+    requests: list[Request] = Field(default_factory=list)
+
+    async def completion(self, request: Request) -> FakeResponse:
+        self.requests.append(request)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        response: Any = self.respond(request)
+        if isinstance(response, FakeResponse):
+            return response
+        return FakeResponse(content=response)
@@ -0,0 +1,41 @@
+"""A skill served by the MCP server tests and benchmark"""
+
+import asyncio
+import threading
+import time
+from typing import Annotated
+
+from typing_extensions import Doc
+
+from emp_agents.models.protocol import SkillSet, tool_method
+
+
+class LoadTestSkill(SkillSet):
+    """Tools that wait, to measure how many calls a server runs at once"""
+
+    @tool_method
+    @staticmethod
+    def blocking_wait(
+        seconds: Annotated[float, Doc("How long to block for")],
+    ) -> str:
+        """Block the calling thread"""
+        time.sleep(seconds)
+        return threading.current_thread().name
+
+    @tool_method
+    @staticmethod
+    async def async_wait(
+        seconds: Annotated[float, Doc("How long to wait for")],
+    ) -> str:
+        """Wait without blocking"""
+        await asyncio.sleep(seconds)
+        return "done"
+
+    @tool_method
+    @staticmethod
+    def multiply(
+        a: Annotated[int, Doc("The first number")],
+        b: Annotated[int, Doc("The second number")],
+    ) -> int:
+        """Multiply two numbers"""
+        return a * b
@@ -0,0 +1,50 @@
+"""A local MCP server used by the MCP client tests, run over stdio"""
+
+import asyncio
+import os
+
+from mcp.server.fastmcp import Context, FastMCP
+
+server = FastMCP("test-server")
+
+
+@server.tool()
+def add(a: int, b: int) -> int:
+    """Add two numbers"""
+    return a + b
+
+
+@server.tool()
+def pid() -> int:
+    """The server's process ID"""
+    return os.getpid()
+
+
+@server.tool()
+async def slow_echo(text: str, delay: float = 0.2) -> str:
+    """Echo the text after a delay"""
+    await asyncio.sleep(delay)
+    return text
+
+
+@server.tool()
+def crash() -> str:
+    """Exit the server without responding"""
+    os._exit(1)
+
+
+@server.tool()
+async def announce_tools_changed(ctx: Context) -> str:
+    """Send a tools/list_changed notification"""
+    await ctx.session.send_tool_list_changed()
+    return "sent"
+
+
+@server.prompt()
+def greeting(name: str) -> str:
+    """Greet someone"""
+    return f"Hello {name}"
+
+
+if __name__ == "__main__":
+    server.run("stdio")
@@ -0,0 +1,143 @@
+import asyncio
+import json
+
+import pytest
+
+from emp_agents import AgentBase
+from emp_agents.implicits import (
+    IgnoreDepends,
+    ScopedValue,
+    current_context,
+    inject,
+    lazy_implicit,
+    set_implicit,
+)
+from emp_agents.models import Request, ToolCall
+from emp_agents.models.shared.message import ToolMessage
+from emp_agents.tools.protocol.network import NetworkSkill
+from tests.fakes import FakeProvider, FakeResponse
+
+selected = ScopedValue[str | None]("test_selected", None)
+
+
+def select(name: str) -> str:
+    """Select a name"""
+    selected.set(name)
+    return f"selected {name}"
+
+
+async def read_selected() -> str:
+    """Read the selected name"""
+    # yield to the other agents between setting and reading
+    await asyncio.sleep(0.01)
+    return str(selected.get())
+
+
+def call(tool: str, **arguments) -> ToolCall:
+    return ToolCall(
+        id=f"call_{tool}",
+        type="function",
+        function=ToolCall.Function(name=tool, arguments=json.dumps(arguments)),
+    )
+
+
+def scripted(*steps: ToolCall):
+    """Makes each tool call in turn, then answers with the last tool result"""
+
+    def respond(request: Request) -> FakeResponse:
+        done = sum(isinstance(m, ToolMessage) for m in request.messages or [])
+        if done < len(steps):
+            return FakeResponse(calls=[steps[done]])
+        return FakeResponse(content=request.messages[-1].content)
+
+    return respond
+
+
+def make_agent(*steps: ToolCall, **kwargs) -> AgentBase:
+    return AgentBase(
+        provider=FakeProvider(respond=scripted(*steps), delay=0.01),
+        tools=[select, read_selected],
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sync_tools", [True, False])
+async def test_concurrent_agents_keep_their_own_state(sync_tools):
+    agents = {
+        name: make_agent(
+            call("select", name=name), call("read_selected"), sync_tools=sync_tools
+        )
+        for name in ["alice", "bob", "carol"]
+    }
+    answers = await asyncio.gather(*(agent.answer("go") for agent in agents.values()))
+    assert answers == list(agents)
+    assert selected.get() is None
+
+
+@pytest.mark.asyncio
+async def test_state_persists_between_turns():
+    agent = make_agent(call("select", name="dave"))
+    await agent.answer("select")
+
+    agent.provider.respond = scripted(call("read_selected"))  # type: ignore
+    await agent.reset()
+    assert await agent.answer("read") == "dave"
+
+    branch = agent.fork()
+    await branch.reset()
+    assert await branch.answer("read") == "dave"
+
+
+@pytest.mark.asyncio
+async def test_network_is_scoped_to_the_agent():
+    def make(network: str) -> AgentBase:
+        return AgentBase(
+            provider=FakeProvider(
+                respond=scripted(
+                    call("set_network", network=network), call("get_network")
+                ),
+                delay=0.01,
+            ),
+            tools=NetworkSkill._tools,
+        )
+
+    answers = await asyncio.gather(
+        make("ethereum").answer("go"), make("base").answer("go")
+    )
+    assert answers == ["current network: Ethereum", "current network: Base"]
+    assert NetworkSkill.get_network_type() is None
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self) -> int:
+        self.calls += 1
+        return self.calls
+
+
+@inject
+def cached_value(value: int = IgnoreDepends(lazy_implicit("test_counter", cache=True))):
+    return value
+
+
+def test_implicits_are_scoped_and_resolved_once():
+    counter = Counter()
+    set_implicit("test_counter", counter)
+    try:
+        assert cached_value() == 1
+        assert cached_value() == 1
+
+        class Agent(AgentBase):
+            def _load_implicits(self):
+                set_implicit("test_counter", lambda: 100)
+
+        agent = Agent(provider=FakeProvider())
+        with agent.context.activate():
+            assert cached_value() == 100
+        assert cached_value() == 1
+        assert counter.calls == 1
+    finally:
+        current_context().implicits.pop("test_counter", None)
@@ -0,0 +1,137 @@
+import gc
+import tracemalloc
+
+from emp_agents.agents.compact_history import CompactConversationProvider
+from emp_agents.agents.history import ConversationProvider
+from emp_agents.models import (
+    AssistantMessage,
+    SystemMessage,
+    ToolCall,
+    ToolMessage,
+    UserMessage,
+)
+
+CONVERSATION = [
+    SystemMessage(content="system"),
+    UserMessage(content="q1"),
+    AssistantMessage(content="a1"),
+    UserMessage(content="q2"),
+    AssistantMessage(
+        content=None,
+        tool_calls=[
+            ToolCall(
+                id="call_1",
+                type="function",
+                function=ToolCall.Function(name="lookup", arguments="{}"),
+            )
+        ],
+    ),
+    ToolMessage(content="found", tool_call_id="call_1"),
+    AssistantMessage(content="a2"),
+]
+
+
+def make_history(count: int):
+    messages = []
+    for i in range(count):
+        if i % 2:
+            messages.append(ToolMessage(content=f"result {i} ✓", tool_call_id=f"c{i}"))
+        else:
+            messages.append(UserMessage(content=f"question {i}"))
+    return messages
+
+
+def test_round_trip():
+    tool_call = ToolCall(
+        id="call_1",
+        type="function",
+        function=ToolCall.Function(name="lookup", arguments='{"key": "value"}'),
+    )
+    messages = [
+        SystemMessage(content="system"),
+        UserMessage(content="héllo"),
+        AssistantMessage(content=None, tool_calls=[tool_call]),
+        ToolMessage(content="found", tool_call_id="call_1"),
+        AssistantMessage(content="done"),
+    ]
+    history = CompactConversationProvider()
+    history.add_messages(messages)
+    assert history.get_history() == messages
+    # the window moves back to the tool call and keeps the system message
+    assert history.get_history(last_n=2) == [messages[0]] + messages[2:]
+
+
+def test_set_history_rewrites_from_divergence():
+    history = CompactConversationProvider()
+    messages = make_history(10)
+    history.add_messages(messages)
+
+    conversation = history.get_history()
+    history.set_history(conversation[:4] + [AssistantMessage(content="changed")])
+    assert history.get_history() == messages[:4] + [AssistantMessage(content="changed")]
+
+    history.set_history([AssistantMessage(content="summary")])
+    assert history.get_history() == [AssistantMessage(content="summary")]
+
+
+def test_windowed_write_back():
+    history = CompactConversationProvider(window=3)
+    history.add_messages(make_history(100))
+
+    window = history.get_history()
+    # the window would start with a tool result, so it moves back one message
+    assert len(window) == 4
+    history.set_history(window + [AssistantMessage(content="reply")])
+    assert len(history) == 101
+    assert history.get_history(last_n=1) == [AssistantMessage(content="reply")]
+
+
+def test_fork():
+    history = CompactConversationProvider()
+    history.add_messages(make_history(4))
+    branch = history.fork()
+    branch.add_message(UserMessage(content="branch"))
+    assert len(history) == 4
+    assert len(branch) == 5
+
+
+def test_uses_less_memory_than_message_list():
+    messages = make_history(5_000)
+
+    def traced(provider) -> int:
+        gc.collect()
+        tracemalloc.start()
+        provider.add_messages([message.model_copy() for message in messages])
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return size
+
+    assert traced(CompactConversationProvider()) * 2 < traced(ConversationProvider())
+
+
+def test_window_keeps_the_system_message_and_tool_calls():
+    history = CompactConversationProvider(window=2)
+    history.add_messages(CONVERSATION)
+
+    window = history.get_history()
+    assert window == [CONVERSATION[0]] + CONVERSATION[-3:]
+
+    history.set_history(window + [AssistantMessage(content="next")])
+    history.window = None
+    assert history.get_history() == CONVERSATION + [AssistantMessage(content="next")]
+
+
+def test_set_history_rewrites_changed_tool_calls_and_refusals():
+    history = CompactConversationProvider()
+    history.add_messages(CONVERSATION)
+
+    changed = CONVERSATION[4].model_copy(deep=True)
+    changed.tool_calls[0].function.arguments = {"key": "value"}
+    refused = AssistantMessage(content="a2", refusal="not allowed")
+    history.set_history(CONVERSATION[:4] + [changed, CONVERSATION[5], refused])
+    assert history.get_history() == CONVERSATION[:4] + [
+        changed,
+        CONVERSATION[5],
+        refused,
+    ]
@@ -0,0 +1,108 @@
+import os
+import subprocess
+import sys
+import textwrap
+from decimal import Decimal
+
+import pytest
+
+from emp_agents.models import FunctionTool, UserMessage
+from emp_agents.utils import canonical_json, get_function_schema, request_fingerprint
+
+SCRIPT = textwrap.dedent("""
+    import random
+    import sys
+
+    from emp_agents.models import FunctionTool, Request, UserMessage
+    from emp_agents.providers.anthropic import AnthropicProvider
+    from emp_agents.providers.openai import OpenAIProvider
+    from emp_agents.utils import canonical_json
+
+
+    def transfer(
+        token: str, recipient: str, amount: int, memo: str = ""
+    ) -> str:
+        "Transfer tokens"
+        return ""
+
+
+    def quote(base: str, target: str, amount: float | None) -> str:
+        "Quote a swap"
+        return ""
+
+
+    def balance(address: str, block: int | None = None) -> str:
+        "Get a balance"
+        return ""
+
+
+    tools = [FunctionTool.from_func(f) for f in (transfer, quote, balance)]
+    random.shuffle(tools)
+    request = Request(
+        model="gpt-4o-mini",
+        messages=[UserMessage(content="hi")],
+        tools=tools,
+        max_tokens=100,
+    )
+    openai = OpenAIProvider(api_key="test")._from_request(request)
+    anthropic = AnthropicProvider(api_key="test")._from_request(
+        request.model_copy(update={"model": "claude-3-5-sonnet-20241022"})
+    )
+    sys.stdout.buffer.write(canonical_json(openai) + b"\\n")
+    sys.stdout.buffer.write(canonical_json(anthropic.get("tools")))
+    """)
+
+
+def _serialize(seed: str) -> bytes:
+    env = {**os.environ, "PYTHONHASHSEED": seed}
+    return subprocess.run(
+        [sys.executable, "-c", SCRIPT], env=env, capture_output=True, check=True
+    ).stdout
+
+
+def test_requests_are_byte_identical_across_processes():
+    outputs = {_serialize(seed) for seed in ("0", "1", "2", "1234")}
+    assert len(outputs) == 1
+
+
+def lookup(zeta: str, alpha: str, middle: int, limit: int = 1) -> str:
+    """Look something up"""
+    return ""
+
+
+def convert(zeta: str, alpha: str, middle: bool | str | float) -> str:
+    """Convert something"""
+    return ""
+
+
+def test_required_and_union_types_keep_signature_order():
+    schema = get_function_schema(convert)
+    assert schema["parameters"]["required"] == ["zeta", "alpha", "middle"]
+    assert schema["parameters"]["properties"]["middle"]["type"] == [
+        "boolean",
+        "string",
+        "number",
+    ]
+
+
+def test_fingerprint_ignores_key_order():
+    tool = FunctionTool.from_func(lookup)
+    # the function itself has no stable JSON form
+    payload = tool.model_dump(exclude={"func"})
+    reordered = dict(reversed(list(payload.items())))
+    assert canonical_json(payload) == canonical_json(reordered)
+    assert request_fingerprint(payload) == request_fingerprint(reordered)
+
+
+def test_canonical_json_rejects_values_without_a_stable_form():
+    assert canonical_json({"amount": Decimal("1.10"), "data": b"\x01"}) == (
+        b'{"amount":"1.10","data":"0x01"}'
+    )
+    message = UserMessage(content="hi")
+    assert canonical_json({"message": message}) == canonical_json(
+        {"message": message.model_dump(mode="json")}
+    )
+    with pytest.raises(TypeError):
+        canonical_json({"value": object()})
+    with pytest.raises(TypeError):
+        canonical_json(FunctionTool.from_func(lookup).model_dump())
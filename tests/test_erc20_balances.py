@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+from eth_rpc.networks import Ethereum
+from eth_typeshed.multicall import TryResult
+
+from emp_agents.tools.protocol import erc20
+from emp_agents.tools.protocol.erc20 import ERC20Skill
+
+BROKEN_TOKEN = "0x" + "ff" * 20
+
+
+class FakeMulticall:
+    """Answers `decimals` with 6 and `balanceOf` with the holder's last byte"""
+
+    def __init__(self):
+        self.chunks: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def try_execute(self, *calls, block_number="latest") -> list[TryResult]:
+        self.chunks.append(len(calls))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        results = []
+        for call in calls:
+            if call.address.lower() == BROKEN_TOKEN:
+                results.append(TryResult(success=False, result=None))
+            elif call.func.name == "decimals":
+                results.append(TryResult(success=True, result=6))
+            else:
+                holder = int(call.data[-2:], 16)
+                results.append(TryResult(success=True, result=holder * 10**6))
+        return results
+
+
+@pytest.fixture
+def multicall(monkeypatch) -> FakeMulticall:
+    fake = FakeMulticall()
+    monkeypatch.setattr(erc20, "make_multicall", lambda network: fake)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_get_balances_batches_tokens_and_holders(multicall, monkeypatch):
+    monkeypatch.setattr(erc20, "MULTICALL_CHUNK_SIZE", 7)
+    tokens = [f"0x{i:040x}" for i in range(1, 6)] + [BROKEN_TOKEN]
+    holders = [f"0x{i:040x}" for i in range(1, 4)]
+
+    with erc20.erc20_scope.scoped(erc20.load_network, lambda: Ethereum):
+        result = await ERC20Skill.get_balances(tokens, holders + holders[:1])
+    balances = json.loads(result)
+
+    # one decimals call per token and one balance call per token and holder
+    assert sum(multicall.chunks) == 6 + 6 * 3
+    assert max(multicall.chunks) == 7
+    assert multicall.max_in_flight == erc20.MULTICALL_CONCURRENCY
+    assert list(balances) == tokens
+    assert balances[tokens[0]] == {holders[0]: 1, holders[1]: 2, holders[2]: 3}
+    assert balances[BROKEN_TOKEN] == {holder: None for holder in holders}
+
+
+@pytest.mark.asyncio
+async def test_get_balances_needs_a_network(multicall):
+    result = await ERC20Skill.get_balances(["0x" + "11" * 20], ["0x" + "22" * 20])
+    assert result.startswith("NOTE: No network set")
+    assert multicall.chunks == []
@@ -0,0 +1,149 @@
+import pytest
+
+from emp_agents.utils.tokenizer import extract_document, map_extract, split_document
+
+from .fakes import FakeProvider
+
+
+class WordTokenizer:
+    """Offline stand-in for a tiktoken encoding: one token per word"""
+
+    def encode(self, text: str) -> list[str]:
+        return text.split(" ")
+
+    def decode(self, tokens: list[str]) -> str:
+        return " ".join(tokens)
+
+
+DOCUMENT = " ".join(
+    f"Sentence number {i} describes page {i // 10}." for i in range(600)
+)
+
+
+def _first_sentence(request) -> str:
+    prompt = request.messages[-1].content
+    return prompt.split('"""')[1].split(".")[0]
+
+
+@pytest.mark.asyncio
+async def test_map_extract_bounded_concurrency():
+    in_flight = 0
+    peak = 0
+
+    class CountingProvider(FakeProvider):
+        async def completion(self, request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                return await super().completion(request)
+            finally:
+                in_flight -= 1
+
+    provider = CountingProvider(respond=_first_sentence, delay=0.01)
+    chunks = split_document(DOCUMENT, chunk_size=100, tokenizer=WordTokenizer())
+    assert len(chunks) > 4
+
+    results = [
+        r
+        async for r in map_extract(
+            provider,
+            DOCUMENT,
+            chunk_size=100,
+            concurrency=3,
+            tokenizer=WordTokenizer(),
+        )
+    ]
+
+    assert sorted(index for index, _ in results) == list(range(len(chunks)))
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_extract_document_resumes_from_checkpoint(tmp_path):
+    checkpoint = tmp_path / "extract.jsonl"
+    calls = 0
+
+    def flaky(request):
+        nonlocal calls
+        calls += 1
+        if calls > 3:
+            raise RuntimeError("provider went away")
+        return _first_sentence(request)
+
+    with pytest.raises(RuntimeError):
+        await extract_document(
+            FakeProvider(respond=flaky),
+            DOCUMENT,
+            chunk_size=100,
+            concurrency=1,
+            checkpoint=checkpoint,
+            tokenizer=WordTokenizer(),
+        )
+
+    provider = FakeProvider(respond=_first_sentence)
+    merged = await extract_document(
+        provider,
+        DOCUMENT,
+        chunk_size=100,
+        concurrency=1,
+        checkpoint=checkpoint,
+        tokenizer=WordTokenizer(),
+    )
+
+    total = len(split_document(DOCUMENT, chunk_size=100, tokenizer=WordTokenizer()))
+    assert len(provider.requests) == total - 3
+    assert merged.splitlines()[0] == "1.Sentence number 0 describes page 0"
+    assert len(merged.splitlines()) == total
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_recovers_from_a_torn_line(tmp_path):
+    checkpoint = tmp_path / "extract.jsonl"
+    total = len(split_document(DOCUMENT, chunk_size=100, tokenizer=WordTokenizer()))
+
+    async def extract(provider):
+        return await extract_document(
+            provider,
+            DOCUMENT,
+            chunk_size=100,
+            concurrency=1,
+            checkpoint=checkpoint,
+            tokenizer=WordTokenizer(),
+        )
+
+    first = await extract(FakeProvider(respond=_first_sentence))
+    lines = checkpoint.read_text().splitlines(keepends=True)
+    # a crash in the middle of writing the last record
+    checkpoint.write_text("".join(lines[:-1]) + lines[-1][:10])
+
+    provider = FakeProvider(respond=_first_sentence)
+    assert await extract(provider) == first
+    assert len(provider.requests) == 1
+
+    # the re-extracted chunk was recorded on a line of its own
+    provider = FakeProvider(respond=_first_sentence)
+    assert await extract(provider) == first
+    assert len(provider.requests) == 0
+    assert len(checkpoint.read_text().splitlines()) == total + 1
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_is_not_reused_across_models(tmp_path):
+    checkpoint = tmp_path / "extract.jsonl"
+
+    async def extract(model):
+        provider = FakeProvider(respond=_first_sentence)
+        await extract_document(
+            provider,
+            DOCUMENT,
+            model=model,
+            chunk_size=100,
+            checkpoint=checkpoint,
+            tokenizer=WordTokenizer(),
+        )
+        return len(provider.requests)
+
+    total = await extract("model-a")
+    assert await extract("model-a") == 0
+    assert await extract("model-b") == total
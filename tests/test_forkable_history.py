@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from emp_agents.agents import AgentBase
+from emp_agents.agents.history import (
+    ConversationProvider,
+    ForkableConversationProvider,
+)
+from emp_agents.models import AssistantMessage, UserMessage
+
+from .fakes import FakeProvider, FakeResponse
+
+
+def contents(history) -> list[str]:
+    return [message.content for message in history.get_history()]
+
+
+def test_branches_share_prefix():
+    history = ForkableConversationProvider()
+    prefix = [UserMessage(content=str(i)) for i in range(1_000)]
+    history.add_messages(prefix)
+
+    branch = history.fork()
+    history.add_message(AssistantMessage(content="a"))
+    branch.add_message(AssistantMessage(content="b"))
+
+    assert contents(history)[-2:] == ["999", "a"]
+    assert contents(branch)[-2:] == ["999", "b"]
+    assert history._head.parent is branch._head.parent
+    assert branch._head.messages == [AssistantMessage(content="b")]
+    assert all(a is b for a, b in zip(history.get_history()[:-1], branch.get_history()))
+
+
+def test_set_history_keeps_shared_prefix():
+    history = ForkableConversationProvider()
+    history.add_messages([UserMessage(content="1"), UserMessage(content="2")])
+    branch = history.fork()
+
+    conversation = branch.get_history()
+    branch.set_history(conversation + [AssistantMessage(content="3")])
+    assert branch._head.messages == [AssistantMessage(content="3")]
+    assert contents(branch) == ["1", "2", "3"]
+
+    # a rewrite of the shared prefix only affects this branch
+    branch.set_history([conversation[0], AssistantMessage(content="x")])
+    assert contents(branch) == ["1", "x"]
+    assert contents(history) == ["1", "2"]
+
+    branch.set_history([AssistantMessage(content="summary")])
+    assert contents(branch) == ["summary"]
+    assert len(branch) == 1
+    assert contents(history) == ["1", "2"]
+
+
+def test_conversation_provider_fork_copies():
+    history = ConversationProvider()
+    history.add_message(UserMessage(content="1"))
+    branch = history.fork()
+    branch.add_message(UserMessage(content="2"))
+    assert contents(history) == ["1"]
+    assert contents(branch) == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_agent_fork_explores_in_parallel():
+    def respond(request):
+        return FakeResponse(content=f"plan for {request.messages[-1].content}")
+
+    agent = AgentBase(
+        provider=FakeProvider(respond=respond),
+        conversation=ForkableConversationProvider(),
+        prompt="plan things",
+    )
+    await agent.answer("start")
+
+    branches = [agent.fork() for _ in range(3)]
+    answers = await asyncio.gather(
+        *[branch.answer(f"option {i}") for i, branch in enumerate(branches)]
+    )
+    assert answers == ["plan for option 0", "plan for option 1", "plan for option 2"]
+    for i, branch in enumerate(branches):
+        assert contents(branch.conversation)[-2:] == [f"option {i}", answers[i]]
+        assert len(branch.conversation._head.messages) == 2
+    assert contents(agent.conversation) == ["plan things", "start", "plan for start"]
@@ -1,3 +1,4 @@
+import gc
 from typing import Literal
 
 from emp_agents.utils import get_function_schema
@@ -10,3 +11,36 @@ def simple_func(x: Literal["a", "b", "c"]) -> str:
 def test_enums_in_schema():
     schema = get_function_schema(simple_func)
     assert schema["parameters"]["properties"]["x"]["enum"] == ["a", "b", "c"]
+
+
+def test_schema_is_memoized(monkeypatch):
+    from emp_agents.utils.function_schema import core
+
+    def lookup(key: str, limit: int = 10) -> str:
+        """Look something up"""
+        return key
+
+    cached = len(core._schemas)
+    calls = []
+    build = core._build_function_schema
+    monkeypatch.setattr(
+        core,
+        "_build_function_schema",
+        lambda *args: calls.append(args) or build(*args),
+    )
+
+    schema = get_function_schema(lookup)
+    schema["parameters"]["properties"]["key"]["description"] = "modified"
+    again = get_function_schema(lookup)
+    assert len(calls) == 1
+    assert again["parameters"]["properties"]["key"]["description"] == (
+        "The key parameter"
+    )
+
+    get_function_schema(lookup, format="claude")
+    assert len(calls) == 2
+
+    calls.clear()
+    del lookup
+    gc.collect()
+    assert len(core._schemas) == cached
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = {"anthropic", "eth_rpc", "eth_typeshed", "mcp", "tiktoken", "tweepy"}
+
+
+def imported_modules(statement: str) -> dict[str, int]:
+    """Runs `statement` in a fresh interpreter, returns the cumulative import time per module"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def top_level(modules: dict[str, int]) -> set[str]:
+    return {name.split(".")[0] for name in modules}
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import emp_agents",
+        "from emp_agents import OpenAIProvider",
+        "from emp_agents.providers import OpenAIProvider",
+        "from emp_agents.models import Message, Request",
+    ],
+)
+def test_light_imports_do_not_load_heavy_dependencies(statement):
+    assert top_level(imported_modules(statement)) & HEAVY_MODULES == set()
+
+
+def test_heavy_dependencies_load_on_access():
+    modules = imported_modules("import emp_agents; emp_agents.AnthropicProvider")
+    assert "anthropic" in top_level(modules)
+    assert "eth_rpc" not in top_level(modules)
+
+    modules = imported_modules("from emp_agents.types import MCPClient")
+    assert "mcp" in top_level(modules)
@@ -0,0 +1,88 @@
+import json
+import multiprocessing
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from emp_agents.middleware.rag import LocalRag  # noqa: E402
+from emp_agents.middleware.rag.embeddings import HashingEmbedder  # noqa: E402
+from emp_agents.middleware.rag.vector_index import VectorIndex  # noqa: E402
+from emp_agents.models import UserMessage  # noqa: E402
+
+DOCUMENTS = [
+    "Uniswap is a decentralized exchange for swapping ERC20 tokens",
+    "The Boston Red Sox are a baseball team",
+    "GMX is a perpetual futures exchange on arbitrum",
+]
+
+
+def _search_in_worker(path: str, dimensions: int, query, queue) -> None:
+    index = VectorIndex(path, dimensions)
+    queue.put(index.search(query, k=1)[0][1])
+
+
+@pytest.mark.asyncio
+async def test_hashing_embedder_is_deterministic():
+    embedder = HashingEmbedder(dimensions=64)
+    first, second = await embedder.embed(["swap tokens", "swap tokens"])
+    assert first.dtype == np.float32
+    assert np.allclose(first, second)
+    assert np.isclose(np.linalg.norm(first), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_local_rag_incremental_adds_and_shared_index(tmp_path):
+    rag = LocalRag(index_path=str(tmp_path), num_chunks=1)
+    await rag.add_documents(DOCUMENTS[:2])
+    assert await rag.get_context("which exchange lets me swap tokens") == DOCUMENTS[0]
+
+    await rag.add_documents(DOCUMENTS[2:])
+    assert len(rag.index) == 3
+    assert await rag.get_context("perpetual futures on arbitrum") == DOCUMENTS[2]
+
+    # a separate process maps the same files and sees every committed row
+    (query,) = await rag.embedder.embed(["baseball team"])
+    queue: multiprocessing.Queue = multiprocessing.get_context("spawn").Queue()
+    worker = multiprocessing.get_context("spawn").Process(
+        target=_search_in_worker,
+        args=(str(tmp_path), rag.embedder.dimensions, query, queue),
+    )
+    worker.start()
+    worker.join(timeout=60)
+    assert queue.get(timeout=5) == DOCUMENTS[1]
+
+    messages = await rag.process([UserMessage(content="tell me about baseball")])
+    assert DOCUMENTS[1] in messages[-1].content
+
+
+@pytest.mark.asyncio
+async def test_add_after_an_interrupted_add_drops_its_rows(tmp_path):
+    rag = LocalRag(index_path=str(tmp_path), num_chunks=1)
+    await rag.add_documents(DOCUMENTS[:1])
+
+    # an add that wrote part of its rows and crashed before committing
+    with open(tmp_path / "embeddings.f32", "ab") as f:
+        f.write(b"\0" * 10)
+    with open(tmp_path / "documents.jsonl", "ab") as f:
+        f.write(b'{"text": "orphan"}\n{"text": "orph')
+
+    await rag.add_documents(DOCUMENTS[1:])
+    assert len(rag.index) == 3
+    assert await rag.get_context("baseball team") == DOCUMENTS[1]
+    assert await rag.get_context("perpetual futures on arbitrum") == DOCUMENTS[2]
+    assert b"orphan" not in (tmp_path / "documents.jsonl").read_bytes()
+
+
+def test_index_without_a_recorded_documents_size(tmp_path):
+    index = VectorIndex(tmp_path, 2)
+    index.add(["a", "b"], np.eye(2))
+    meta = json.loads((tmp_path / "meta.json").read_text())
+    del meta["documents_size"]
+    (tmp_path / "meta.json").write_text(json.dumps(meta))
+    with open(tmp_path / "documents.jsonl", "ab") as f:
+        f.write(b'{"text": "orphan"}\n')
+
+    index.add(["c"], np.array([[1.0, 1.0]]) / np.sqrt(2))
+    assert [index.search(row, k=1)[0][1] for row in np.eye(2)] == ["a", "b"]
+    assert index.search(np.ones(2), k=1)[0][1] == "c"
@@ -0,0 +1,156 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from mcp import ClientSession, StdioServerParameters
+
+from emp_agents import AgentBase
+from emp_agents.types.mcp import MCPClient, MCPConnectionType
+from emp_agents.utils.mcp.lookup import MCPUtil
+from emp_agents.utils.mcp.manifest import ToolManifestCache, server_version
+from tests.fakes import FakeProvider
+
+SERVER = Path(__file__).parent / "servers" / "stdio_mcp.py"
+
+
+def make_client(cache: ToolManifestCache | None = None, **kwargs) -> MCPClient:
+    return MCPClient(
+        connection_type=MCPConnectionType.STDIO,
+        params=StdioServerParameters(command=sys.executable, args=[str(SERVER)]),
+        manifest_cache=cache,
+        connect_timeout=5,
+        **kwargs,
+    )
+
+
+def make_broken_client() -> MCPClient:
+    return MCPClient(
+        connection_type=MCPConnectionType.STDIO,
+        params=StdioServerParameters(
+            command=sys.executable, args=["-c", "import sys; sys.exit(1)"]
+        ),
+        connect_timeout=1,
+    )
+
+
+@pytest.fixture
+def list_tools_calls(monkeypatch):
+    calls = []
+    list_tools = ClientSession.list_tools
+
+    async def counted(self):
+        calls.append(self)
+        return await list_tools(self)
+
+    monkeypatch.setattr(ClientSession, "list_tools", counted)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_warm_start_uses_the_cached_manifest(tmp_path, list_tools_calls):
+    cache = ToolManifestCache(directory=tmp_path)
+    async with make_client(cache) as client:
+        cold = await client.list_tools()
+    assert len(list_tools_calls) == 1
+
+    async with make_client(cache) as client:
+        warm = await client.list_tools()
+        assert await client.call_tool("add", {"a": 1, "b": 2}) == "3"
+    assert len(list_tools_calls) == 1
+    assert [tool.model_dump() for tool in warm] == [tool.model_dump() for tool in cold]
+
+
+@pytest.mark.asyncio
+async def test_a_new_server_version_is_listed_again(tmp_path, list_tools_calls):
+    cache = ToolManifestCache(directory=tmp_path)
+    async with make_client(cache) as client:
+        await client.list_tools()
+        key = client.cache_key
+        tools = cache.load(key, "stale")
+        assert tools is None
+        manifest = next(tmp_path.glob("*.json"))
+        manifest.write_text(
+            manifest.read_text().replace('"version": "', '"version": "x')
+        )
+
+    async with make_client(cache) as client:
+        await client.list_tools()
+    assert len(list_tools_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_tools_changed_without_a_new_version_are_revalidated(
+    tmp_path, list_tools_calls
+):
+    cache = ToolManifestCache(directory=tmp_path, revalidate=True)
+    async with make_client(cache) as client:
+        listed = await client.list_tools()
+        # the server dropped a tool but still reports the same version
+        key = client.cache_key
+        version = server_version(client.session.initialize_result)
+        stale = cache.load(key, version)
+        cache.store(
+            key, version, stale + [stale[0].model_copy(update={"name": "gone"})]
+        )
+
+    async with make_client(cache) as client:
+        warm = await client.list_tools()
+        assert "gone" in [tool.name for tool in warm]
+        await client._revalidation
+    assert len(list_tools_calls) == 2
+    assert [tool.name for tool in cache.load(key, version)] == [
+        tool.name for tool in listed
+    ]
+
+    async with make_client(cache) as client:
+        assert [tool.name for tool in await client.list_tools()] == [
+            tool.name for tool in listed
+        ]
+        await client._revalidation
+    # an unchanged manifest is left as it is
+    assert len(list_tools_calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_list_changed_notification_invalidates_the_manifest(
+    tmp_path, list_tools_calls
+):
+    cache = ToolManifestCache(directory=tmp_path)
+    async with make_client(cache) as client:
+        await client.list_tools()
+        assert list(tmp_path.glob("*.json"))
+
+        await client.call_tool("announce_tools_changed", {})
+        for _ in range(50):
+            if not list(tmp_path.glob("*.json")):
+                break
+            await asyncio.sleep(0.01)
+        assert not list(tmp_path.glob("*.json"))
+
+        await client.list_tools()
+    assert len(list_tools_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_clients_initialize_concurrently_and_tolerate_failures():
+    agent = AgentBase(provider=FakeProvider())
+    good, broken = make_client(), make_broken_client()
+    agent._mcp_clients = [broken, good]
+    try:
+        await agent.initialize_mcp_clients()
+    finally:
+        await good.aclose()
+        await broken.aclose()
+    assert "add" in agent._tools_map
+
+
+@pytest.mark.asyncio
+async def test_get_all_function_tools_skips_failed_servers():
+    good, broken = make_client(), make_broken_client()
+    try:
+        tools = await MCPUtil.get_all_function_tools([good, broken])
+        assert {tool.name for tool in tools} >= {"add", "pid"}
+    finally:
+        await good.aclose()
+        await broken.aclose()
@@ -0,0 +1,137 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from mcp import StdioServerParameters
+
+from emp_agents import AgentBase
+from emp_agents.exceptions import MCPPoolSaturatedException
+from emp_agents.types.mcp import MCPClient, MCPConnectionType
+from tests.fakes import FakeProvider
+
+SERVER = Path(__file__).parent / "servers" / "stdio_mcp.py"
+
+
+def make_client(**kwargs) -> MCPClient:
+    return MCPClient(
+        connection_type=MCPConnectionType.STDIO,
+        params=StdioServerParameters(command=sys.executable, args=[str(SERVER)]),
+        **kwargs,
+    )
+
+
+def slow_echo(client: MCPClient, text: str, delay: float = 0.3):
+    return client.call_tool("slow_echo", {"text": text, "delay": delay})
+
+
+@pytest.mark.asyncio
+async def test_calls_are_spread_over_the_pool():
+    async with make_client(pool_size=3) as client:
+        results = await asyncio.gather(*(slow_echo(client, str(i)) for i in range(9)))
+        assert results == [str(i) for i in range(9)]
+
+        metrics = client.metrics()
+        assert metrics is not None
+        assert metrics.sessions == 3
+        assert metrics.connected == 3
+        assert metrics.calls == 9
+        assert metrics.in_flight == 0
+
+        pids = set()
+        for session in client.pool.sessions:
+            result = await session.run(lambda s: s.call_tool("pid", {}))
+            pids.add(result.content[0].text)
+        assert len(pids) == 3
+
+
+@pytest.mark.asyncio
+async def test_idle_pool_reuses_one_session():
+    async with make_client(pool_size=3) as client:
+        for i in range(3):
+            assert await slow_echo(client, str(i), delay=0) == str(i)
+        assert client.metrics().sessions == 1
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_queues_then_rejects():
+    async with make_client(max_calls_per_session=2, max_queue=1) as client:
+        await client.list_tools()
+        calls = [asyncio.create_task(slow_echo(client, str(i))) for i in range(3)]
+        await asyncio.sleep(0.05)
+
+        metrics = client.metrics()
+        assert metrics.in_flight == 2
+        assert metrics.queue_depth == 1
+
+        with pytest.raises(MCPPoolSaturatedException):
+            await slow_echo(client, "rejected")
+
+        assert await asyncio.gather(*calls) == ["0", "1", "2"]
+        metrics = client.metrics()
+        assert metrics.max_queue_depth == 1
+        assert metrics.rejected == 1
+        assert metrics.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_time_out():
+    async with make_client(call_timeout=0.2) as client:
+        # a cold session connects before the call, outside of its timeout
+        await client.session.get()
+        with pytest.raises(TimeoutError):
+            await slow_echo(client, "late", delay=2)
+        assert await slow_echo(client, "fast", delay=0) == "fast"
+
+        metrics = client.metrics()
+        assert metrics.timeouts == 1
+        assert metrics.calls == 2
+        assert metrics.latency_max is not None and metrics.latency_max >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_call_timeout_excludes_connecting():
+    # starting the server takes longer than the timeout, the call itself does not
+    async with make_client(call_timeout=0.05) as client:
+        assert await slow_echo(client, "cold", delay=0) == "cold"
+        assert client.metrics().timeouts == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_of_another_loop_is_closed_when_replaced():
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    try:
+        async with make_client() as client:
+            future = asyncio.run_coroutine_threadsafe(
+                slow_echo(client, "other", delay=0), other
+            )
+            assert await asyncio.wrap_future(future) == "other"
+            old = client._pool
+            assert old is not None and old.primary.connected
+
+            assert await slow_echo(client, "here", delay=0) == "here"
+            assert client._pool is not old
+            for _ in range(50):
+                if not old.primary.connected:
+                    break
+                await asyncio.sleep(0.1)
+            assert not old.primary.connected
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join()
+        other.close()
+
+
+@pytest.mark.asyncio
+async def test_agent_closes_its_mcp_clients():
+    client = make_client()
+    async with AgentBase(provider=FakeProvider()) as agent:
+        agent._mcp_clients.append(client)
+        assert await slow_echo(client, "hi", delay=0) == "hi"
+        session = client.session
+        assert session.connected
+    assert client.metrics() is None
+    assert not session.connected
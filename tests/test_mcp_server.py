@@ -0,0 +1,111 @@
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from mcp import StdioServerParameters
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from emp_agents import AgentBase
+from emp_agents.types.mcp import MCPClient, MCPConnectionType
+from emp_agents.utils.mcp.server import build_server
+from tests.fakes import FakeProvider
+
+ROOT = Path(__file__).parent.parent
+
+
+def load_test_server(**kwargs):
+    return build_server(
+        modules=["tests.servers.skills"], skills=["LoadTestSkill"], **kwargs
+    )
+
+
+def text(result) -> str:
+    return result.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_lists_and_calls_skill_tools():
+    server = load_test_server()
+    async with create_connected_server_and_client_session(server.server) as client:
+        tools = {tool.name: tool for tool in (await client.list_tools()).tools}
+        assert set(tools) == {"blocking_wait", "async_wait", "multiply"}
+        assert tools["multiply"].inputSchema["required"] == ["a", "b"]
+
+        assert text(await client.call_tool("multiply", {"a": "3", "b": 4})) == "12"
+        assert text(await client.call_tool("async_wait", {"seconds": 0})) == "done"
+
+        invalid = json.loads(text(await client.call_tool("multiply", {"a": "x"})))
+        assert invalid["error"] == "invalid_arguments"
+        assert {error["loc"][0] for error in invalid["details"]} == {"a", "b"}
+
+        unknown = await client.call_tool("missing", {})
+        assert unknown.isError
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_blocking_tools_run_in_parallel():
+    server = load_test_server(max_workers=8)
+    async with create_connected_server_and_client_session(server.server) as client:
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(client.call_tool("blocking_wait", {"seconds": 0.3}) for _ in range(8))
+        )
+        assert time.perf_counter() - start < 1.2
+        assert len({text(result) for result in results}) == 8
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_bounds_running_calls():
+    server = load_test_server(max_concurrency=2)
+    async with create_connected_server_and_client_session(server.server) as client:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(client.call_tool("async_wait", {"seconds": 0.1}) for _ in range(6))
+        )
+        assert time.perf_counter() - start >= 0.3
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_serves_agents():
+    agent = AgentBase(
+        provider=FakeProvider(respond=lambda request: "42"),
+        description="Answers questions",
+    )
+    server = build_server(modules=[], skills=[])
+    server.add_agent(agent, name="oracle")
+    async with create_connected_server_and_client_session(server.server) as client:
+        result = await client.call_tool("oracle", {"question": "What is the answer?"})
+        assert text(result) == "42"
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_stdio_entry_point():
+    client = MCPClient(
+        connection_type=MCPConnectionType.STDIO,
+        params=StdioServerParameters(
+            command=sys.executable,
+            args=[
+                "-m",
+                "emp_agents.utils.mcp.server",
+                "--module",
+                "tests.servers.skills",
+                "--skill",
+                "LoadTestSkill",
+            ],
+            cwd=str(ROOT),
+        ),
+    )
+    async with client:
+        assert {tool.name for tool in await client.list_tools()} == {
+            "blocking_wait",
+            "async_wait",
+            "multiply",
+        }
+        assert await client.call_tool("multiply", {"a": 6, "b": 7}) == "42"
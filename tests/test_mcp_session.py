@@ -0,0 +1,100 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from mcp import StdioServerParameters
+
+from emp_agents.exceptions import MCPConnectionException
+from emp_agents.types.mcp import MCPClient, MCPConnectionType
+
+SERVER = Path(__file__).parent / "servers" / "stdio_mcp.py"
+
+
+def make_client(**kwargs) -> MCPClient:
+    return MCPClient(
+        connection_type=MCPConnectionType.STDIO,
+        params=StdioServerParameters(command=sys.executable, args=[str(SERVER)]),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_calls_share_one_server_process():
+    async with make_client() as client:
+        tools = await client.list_tools()
+        assert {tool.name for tool in tools} >= {"add", "pid", "slow_echo"}
+
+        first = await client.call_tool("pid", {})
+        assert await client.call_tool("add", {"a": 3, "b": 4}) == "7"
+        assert await client.call_tool("pid", {}) == first
+        assert client.session.generation == 1
+
+        prompts = await client.get_prompts()
+        assert [prompt.name for prompt in prompts] == ["greeting"]
+
+
+@pytest.mark.asyncio
+async def test_calls_are_multiplexed():
+    async with make_client() as client:
+        await client.list_tools()
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                client.call_tool("slow_echo", {"text": str(i), "delay": 0.5})
+                for i in range(8)
+            )
+        )
+        assert results == [str(i) for i in range(8)]
+        assert time.perf_counter() - start < 2
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_the_server_dies():
+    async with make_client() as client:
+        first = await client.call_tool("pid", {})
+
+        # the in-flight call is not retried, the server may have acted on it
+        with pytest.raises(MCPConnectionException):
+            await client.call_tool("crash", {})
+
+        second = await client.call_tool("pid", {})
+        assert second != first
+        assert client.session.generation == 2
+
+
+@pytest.mark.asyncio
+async def test_idle_session_is_health_checked():
+    async with make_client(health_check_interval=0.1, ping_timeout=0.5) as client:
+        session = client.session
+        await client.call_tool("pid", {})
+
+        pings = 0
+        ping = type(await session.get()).send_ping
+
+        async def counted_ping(self):
+            nonlocal pings
+            pings += 1
+            return await ping(self)
+
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(type(await session.get()), "send_ping", counted_ping)
+            await asyncio.sleep(0.5)
+        assert pings >= 2
+        assert session.generation == 1
+
+
+@pytest.mark.asyncio
+async def test_connection_failure_is_reported():
+    client = MCPClient(
+        connection_type=MCPConnectionType.STDIO,
+        params=StdioServerParameters(
+            command=sys.executable, args=["-c", "import sys; sys.exit(1)"]
+        ),
+        connect_timeout=1,
+    )
+    with pytest.raises(MCPConnectionException):
+        await client.list_tools()
+    await client.aclose()
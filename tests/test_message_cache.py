@@ -0,0 +1,48 @@
+from emp_agents.models import Request, SystemMessage, UserMessage
+from emp_agents.providers.anthropic import AnthropicProvider
+from emp_agents.providers.openai import OpenAIModelType, OpenAIProvider
+
+
+def test_cached_dump_is_reused_and_invalidated():
+    message = UserMessage(content="hello")
+    dump = message.cached_dump()
+    assert message.cached_dump() is dump
+    assert message == UserMessage(content="hello")
+
+    message.content = "changed"
+    assert message.cached_dump()["content"] == "changed"
+
+    copied = message.model_copy(update={"content": "copied"})
+    assert copied.cached_dump()["content"] == "copied"
+    assert message.cached_dump()["content"] == "changed"
+
+
+def test_openai_request_reuses_message_dicts():
+    provider = OpenAIProvider(api_key="test")
+    messages = [SystemMessage(content="system"), UserMessage(content="hi")]
+    request = Request(model=OpenAIModelType.gpt4o_mini, messages=messages)
+
+    first = provider._from_request(request)
+    second = provider._from_request(request)
+    assert all(a is b for a, b in zip(first["messages"], second["messages"]))
+    assert first["messages"][1] == {"role": "user", "content": "hi"}
+
+
+def test_openai_reasoning_model_does_not_modify_cache():
+    provider = OpenAIProvider(api_key="test")
+    message = SystemMessage(content="system")
+    request = Request(model=OpenAIModelType.o1, messages=[message])
+
+    result = provider._from_request(request)
+    assert result["messages"][0]["role"] == "user"
+    assert message.cached_dump()["role"] == "system"
+
+
+def test_anthropic_request_reuses_message_dicts():
+    provider = AnthropicProvider(api_key="test")
+    message = UserMessage(content="hi")
+    request = Request(model="claude", messages=[SystemMessage(content="s"), message])
+
+    result = provider._from_request(request)
+    assert result["system"] == "s"
+    assert result["messages"][0] is message.cached_dump(exclude_none=True)
@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import pytest
+
+from emp_agents.middleware import MiddlewarePipeline
+from emp_agents.middleware.rag._type import Rag
+from emp_agents.models import Middleware, MiddlewareMode, UserMessage
+
+
+class SlowRag(Rag):
+    name: str = "slow rag"
+    description: str = "returns a fixed context after a delay"
+    context: str
+    delay: float = 0.1
+
+    async def get_context(self, query: str) -> str:
+        await asyncio.sleep(self.delay)
+        return self.context
+
+
+class Shout(Middleware):
+    name: str = "shout"
+    description: str = "upper cases the latest message"
+
+    async def process(self, messages):
+        message = messages[-1]
+        return messages[:-1] + [
+            message.model_copy(update={"content": message.content.upper()})
+        ]
+
+
+@pytest.mark.asyncio
+async def test_read_middleware_run_concurrently_and_merge_in_order():
+    pipeline = MiddlewarePipeline(
+        [
+            SlowRag(context="first", delay=0.2),
+            SlowRag(context="second", delay=0.1),
+        ]
+    )
+    message = UserMessage(content="question")
+
+    start = time.monotonic()
+    conversation = await pipeline.run([message])
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.3
+    content = conversation[-1].content
+    assert content.startswith("question")
+    assert content.index("first") < content.index("second")
+    assert message.content == "question"
+
+
+@pytest.mark.asyncio
+async def test_rewrite_middleware_is_a_barrier_and_timeouts_are_skipped():
+    pipeline = MiddlewarePipeline(
+        [
+            SlowRag(context="context", delay=0),
+            Shout(),
+            SlowRag(context="late", delay=1, timeout=0.05),
+            SlowRag(context="after", delay=0),
+        ]
+    )
+    assert [len(stage) for stage in pipeline.stages] == [1, 1, 2]
+    assert pipeline.stages[1][0].mode == MiddlewareMode.rewrite
+
+    conversation = await pipeline.run([UserMessage(content="question")])
+
+    content = conversation[-1].content
+    assert "QUESTION" in content and "CONTEXT" in content
+    assert content.endswith("after")
+    assert "late" not in content
+
+
+@pytest.mark.asyncio
+async def test_read_middleware_without_a_contribution():
+    class Observer(Middleware):
+        name: str = "observer"
+        description: str = "only watches the conversation"
+        mode: MiddlewareMode = MiddlewareMode.read
+
+        async def process(self, messages):
+            return messages
+
+    messages = [UserMessage(content="question")]
+    pipeline = MiddlewarePipeline([Observer(), SlowRag(context="context", delay=0)])
+    conversation = await pipeline.run(messages)
+    assert conversation[-1].content == "question" + await SlowRag(
+        context="context", delay=0
+    ).contribute(messages)
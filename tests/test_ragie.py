@@ -0,0 +1,92 @@
+import asyncio
+import gc
+import json
+
+import httpx
+import pytest
+
+from emp_agents.middleware.rag import Ragie
+from emp_agents.utils.cache import TTLCache
+
+
+def test_ttl_cache_expires_and_evicts():
+    now = 0.0
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10, clock=lambda: now)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache and "a" in cache
+
+    now = 11.0
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_ragie_reuses_client_caches_and_prefetches():
+    queries: list[dict] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        queries.append(json.loads(request.content))
+        await asyncio.sleep(0.05)
+        return httpx.Response(
+            200, json={"scored_chunks": [{"text": f"about {queries[-1]['query']}"}]}
+        )
+
+    ragie = Ragie(api_key="test")
+    ragie._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = ragie._get_client()
+
+    task = ragie.prefetch("swaps")
+    assert await ragie.get_context("swaps") == "about swaps"
+    assert task.done()
+    assert await ragie.get_context("swaps") == "about swaps"
+    assert len(queries) == 1
+    # a cached query is not fetched again
+    assert (await ragie.prefetch("swaps"))["scored_chunks"]
+    assert len(queries) == 1
+
+    ragie.partition = "other"
+    await ragie.get_context("swaps")
+    assert queries[-1] == {"query": "swaps", "partition": "other"}
+    assert len(queries) == 2
+    assert ragie._get_client() is client
+
+    await ragie.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_prefetch_is_logged_not_left_unretrieved(caplog):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("unreachable")
+
+    ragie = Ragie(api_key="test")
+    ragie._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    loop = asyncio.get_running_loop()
+    unretrieved: list[dict] = []
+    loop.set_exception_handler(lambda loop, context: unretrieved.append(context))
+    try:
+        task = ragie.prefetch("swaps")
+        await asyncio.wait([task])
+        del task
+        gc.collect()
+    finally:
+        loop.set_exception_handler(None)
+
+    assert unretrieved == []
+    assert "Prefetching Ragie context failed" in caplog.text
+    assert ragie._inflight == {}
+    await ragie.aclose()
+
+
+def test_ragie_client_is_recreated_on_another_event_loop():
+    ragie = Ragie(api_key="test")
+
+    async def get_client() -> httpx.AsyncClient:
+        return ragie._get_client()
+
+    first = asyncio.run(get_client())
+    second = asyncio.run(get_client())
+    assert second is not first
+    assert not second.is_closed
@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import pytest
+from fast_depends import Provider as SharedProvider
+
+from emp_agents.agents import SkillsAgent
+from emp_agents.implicits import IgnoreDepends, Provider, inject
+from emp_agents.models import Request, ToolCall
+from emp_agents.models.protocol import SkillSet, view_action
+from emp_agents.models.shared.message import ToolMessage
+from tests.fakes import FakeProvider, FakeResponse
+
+greeting_scope = Provider()
+shared_scope = SharedProvider()
+
+
+def load_name() -> str:
+    return "world"
+
+
+class GreetingSkill(SkillSet):
+    @view_action
+    @staticmethod
+    @inject(dependency_overrides_provider=greeting_scope)  # type: ignore[call-overload]
+    async def greet(name: str = IgnoreDepends(load_name)) -> str:
+        """Greet someone"""
+        # yield to the other agents between resolving and answering
+        await asyncio.sleep(0.01)
+        return f"hello {name}"
+
+    @view_action
+    @staticmethod
+    @inject(dependency_overrides_provider=shared_scope)  # type: ignore[call-overload]
+    def shared_greet(name: str = IgnoreDepends(load_name)) -> str:
+        """Greet someone"""
+        return f"hello {name}"
+
+
+def greeter(tool: str, name: str | None = None) -> SkillsAgent:
+    def respond(request: Request) -> FakeResponse:
+        if not any(isinstance(m, ToolMessage) for m in request.messages or []):
+            call = ToolCall(
+                id="call",
+                type="function",
+                function=ToolCall.Function(name=tool, arguments=json.dumps({})),
+            )
+            return FakeResponse(calls=[call])
+        return FakeResponse(content=request.messages[-1].content)
+
+    scope = greeting_scope if tool == "greet" else shared_scope
+    return SkillsAgent(
+        provider=FakeProvider(respond=respond, delay=0.01),
+        skills=[GreetingSkill],
+        scopes=[(scope, load_name, lambda: name)] if name else [],
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_agents_use_their_own_overrides():
+    agents = [greeter("greet", name) for name in ["alice", "bob", "carol"]]
+    agents.append(greeter("greet"))
+
+    answers = await asyncio.gather(*(agent.answer("go") for agent in agents))
+    assert answers == ["hello alice", "hello bob", "hello carol", "hello world"]
+    assert len(greeting_scope.dependency_overrides) == 0
+    assert await GreetingSkill.greet() == "hello world"
+
+
+@pytest.mark.asyncio
+async def test_scoped_block_and_process_wide_overrides():
+    with greeting_scope.scoped(load_name, lambda: "dave"):
+        assert await GreetingSkill.greet() == "hello dave"
+        assert await greeter("greet").answer("go") == "hello dave"
+        assert await greeter("greet", "erin").answer("go") == "hello erin"
+    assert await GreetingSkill.greet() == "hello world"
+
+    with greeting_scope.scope(load_name, lambda: "frank"):
+        assert await greeter("greet").answer("go") == "hello frank"
+    assert len(greeting_scope.dependency_overrides) == 0
+
+
+@pytest.mark.asyncio
+async def test_plain_fast_depends_provider_is_overridden_for_the_run():
+    assert await greeter("shared_greet", "gina").answer("go") == "hello gina"
+    assert shared_scope.dependency_overrides == {}
@@ -0,0 +1,90 @@
+import io
+
+import pytest
+
+from emp_agents.agents import AgentBase
+from emp_agents.models import (
+    AssistantMessage,
+    SystemMessage,
+    ToolCall,
+    ToolMessage,
+    UserMessage,
+    dump_messages,
+    export_messages,
+    import_messages,
+    load_messages,
+)
+
+from .fakes import FakeProvider, FakeResponse
+
+
+def make_messages():
+    return [
+        SystemMessage(content="system"),
+        UserMessage(content="what is the balance?"),
+        AssistantMessage(
+            content=None,
+            tool_calls=[
+                ToolCall(
+                    id="call_1",
+                    type="function",
+                    function=ToolCall.Function(
+                        name="balance", arguments='{"address": "0x1"}'
+                    ),
+                )
+            ],
+        ),
+        ToolMessage(content="100", tool_call_id="call_1"),
+        AssistantMessage(content="The balance is 100"),
+    ]
+
+
+def test_jsonl_round_trip():
+    fp = io.BytesIO()
+    assert dump_messages(make_messages(), fp) == 5
+    fp.seek(0)
+    assert list(load_messages(fp)) == make_messages()
+
+
+def test_streams_generators(tmp_path):
+    path = tmp_path / "archive.jsonl.gz"
+    count = export_messages((UserMessage(content=str(i)) for i in range(10_000)), path)
+    assert count == 10_000
+
+    messages = import_messages(path)
+    assert next(messages) == UserMessage(content="0")
+    assert sum(1 for _ in messages) == 9_999
+
+
+def test_append(tmp_path):
+    path = tmp_path / "archive.jsonl"
+    export_messages(make_messages()[:2], path)
+    export_messages(make_messages()[2:], path, append=True)
+    assert list(import_messages(path)) == make_messages()
+
+
+def test_msgpack_round_trip(tmp_path):
+    pytest.importorskip("msgpack")
+    path = tmp_path / "archive.msgpack"
+    export_messages(make_messages(), path)
+    assert list(import_messages(path)) == make_messages()
+
+
+@pytest.mark.asyncio
+async def test_agent_export_and_import(tmp_path):
+    path = tmp_path / "conversation.jsonl"
+    agent = AgentBase(
+        provider=FakeProvider(respond=lambda request: FakeResponse(content="hello")),
+        prompt="be nice",
+    )
+    await agent.answer("hi")
+    assert await agent.export_conversation(path) == 3
+
+    restored = AgentBase(provider=FakeProvider(), prompt="be nice")
+    await restored.reset()
+    await restored.import_conversation(path, batch_size=2)
+    assert [message.content for message in await restored._get_history()] == [
+        "be nice",
+        "hi",
+        "hello",
+    ]
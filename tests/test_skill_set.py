@@ -0,0 +1,66 @@
+from typing import Annotated
+
+from typing_extensions import Doc
+
+from emp_agents.models import FunctionTool
+from emp_agents.models.protocol import SkillSet, tool_method
+from emp_agents.models.protocol.registry import ToolRegistry
+
+
+def test_tools_are_built_lazily(monkeypatch):
+    built = []
+    from_func = FunctionTool.from_func.__func__
+    monkeypatch.setattr(
+        FunctionTool,
+        "from_func",
+        classmethod(
+            lambda cls, func: built.append(func.__name__) or from_func(cls, func)
+        ),
+    )
+
+    class LazySkill(SkillSet):
+        @tool_method
+        @staticmethod
+        def first(value: Annotated[str, Doc("a value")]) -> str:
+            """The first tool"""
+            return value
+
+        @tool_method
+        @staticmethod
+        def second(value: Annotated[str, Doc("a value")]) -> str:
+            """The second tool"""
+            return value
+
+    assert ToolRegistry.get_tool_names("LazySkill") == ["first", "second"]
+    assert built == []
+
+    tool = ToolRegistry.get_tool("LazySkill", "second")
+    assert tool.name == "second"
+    assert built == ["second"]
+
+    assert [tool.name for tool in LazySkill._tools] == ["first", "second"]
+    assert built == ["second", "first"]
+    assert LazySkill._tools_map["second"] is tool
+    assert list(LazySkill()) == LazySkill._tools
+    assert ToolRegistry.get_skill("LazySkill") is LazySkill._tools
+    assert built == ["second", "first"]
+
+
+def test_subclass_has_its_own_tools():
+    class BaseSkill(SkillSet):
+        @tool_method
+        @staticmethod
+        def base_tool() -> str:
+            """A base tool"""
+            return "base"
+
+    assert [tool.name for tool in BaseSkill._tools] == ["base_tool"]
+
+    class ChildSkill(BaseSkill):
+        @tool_method
+        @staticmethod
+        def child_tool() -> str:
+            """A child tool"""
+            return "child"
+
+    assert [tool.name for tool in ChildSkill._tools] == ["child_tool"]
@@ -0,0 +1,220 @@
+import sqlite3
+
+import pytest
+
+from emp_agents.agents import AgentBase
+from emp_agents.agents.sqlite_history import SQLiteConversationProvider
+from emp_agents.models import AssistantMessage, SystemMessage, UserMessage
+
+from .fakes import FakeProvider, FakeResponse
+from .test_compact_history import CONVERSATION
+
+
+def row_count(path) -> int:
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+
+def test_history_persists_across_instances(tmp_path):
+    path = str(tmp_path / "history.db")
+    history = SQLiteConversationProvider(path=path, session_id="s1")
+    history.add_message(SystemMessage(content="system"))
+    history.add_messages([UserMessage(content="hi"), AssistantMessage(content="hey")])
+    history.close()
+
+    reopened = SQLiteConversationProvider(path=path, session_id="s1")
+    assert reopened.get_history() == [
+        SystemMessage(content="system"),
+        UserMessage(content="hi"),
+        AssistantMessage(content="hey"),
+    ]
+    assert SQLiteConversationProvider(path=path, session_id="s2").get_history() == []
+
+
+def test_writes_are_batched_until_flush(tmp_path):
+    path = str(tmp_path / "history.db")
+    history = SQLiteConversationProvider(path=path, batch_size=3)
+    history.add_message(UserMessage(content="1"))
+    history.add_message(UserMessage(content="2"))
+    assert row_count(path) == 0
+
+    history.add_message(UserMessage(content="3"))
+    assert row_count(path) == 3
+
+    history.add_message(UserMessage(content="4"))
+    history.flush()
+    assert row_count(path) == 4
+
+
+def test_set_history_only_appends_new_messages(tmp_path):
+    path = str(tmp_path / "history.db")
+    history = SQLiteConversationProvider(path=path)
+    history.add_messages([UserMessage(content=str(i)) for i in range(5)])
+
+    conversation = history.get_history()
+    conversation.append(AssistantMessage(content="reply"))
+    history.set_history(conversation)
+    history.flush()
+
+    assert row_count(path) == 6
+    assert history.get_history() == conversation
+
+
+def test_summary_rewrite_keeps_archive(tmp_path):
+    path = str(tmp_path / "history.db")
+    history = SQLiteConversationProvider(path=path, session_id="s1")
+    history.add_messages([UserMessage(content=str(i)) for i in range(10)])
+    history.set_history([AssistantMessage(content="summary")])
+    history.add_message(UserMessage(content="next"))
+    history.close()
+
+    reopened = SQLiteConversationProvider(path=path, session_id="s1")
+    assert reopened.get_history() == [
+        AssistantMessage(content="summary"),
+        UserMessage(content="next"),
+    ]
+    assert row_count(path) == 12
+
+
+def test_windowed_history(tmp_path):
+    path = str(tmp_path / "history.db")
+    history = SQLiteConversationProvider(path=path, session_id="s1")
+    history.add_messages([UserMessage(content=str(i)) for i in range(10_000)])
+    history.close()
+
+    reopened = SQLiteConversationProvider(path=path, session_id="s1", window=3)
+    window = reopened.get_history()
+    assert [message.content for message in window] == ["9997", "9998", "9999"]
+    assert len(reopened) == 10_000
+
+    # writing the window back only replaces the window
+    reopened.set_history(window + [AssistantMessage(content="reply")])
+    reopened.flush()
+    assert len(reopened) == 10_001
+    assert row_count(path) == 10_001
+    assert reopened.get_history(last_n=2)[-1] == AssistantMessage(content="reply")
+    assert len(reopened.get_history(last_n=None)) == 3
+
+
+def test_reset(tmp_path):
+    history = SQLiteConversationProvider(path=str(tmp_path / "history.db"))
+    history.add_message(UserMessage(content="hi"))
+    history.reset()
+    assert history.get_history() == []
+    assert len(history) == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_flushes_at_end_of_turn(tmp_path):
+    path = str(tmp_path / "history.db")
+    agent = AgentBase(
+        provider=FakeProvider(respond=lambda request: FakeResponse(content="hello")),
+        conversation=SQLiteConversationProvider(
+            path=path, session_id="agent", batch_size=1_000
+        ),
+        prompt="be nice",
+    )
+    assert await agent.answer("hi") == "hello"
+
+    reopened = SQLiteConversationProvider(path=path, session_id="agent")
+    assert [message.content for message in reopened.get_history()] == [
+        "be nice",
+        "hi",
+        "hello",
+    ]
+
+
+def test_window_keeps_the_system_message_and_tool_calls(tmp_path):
+    history = SQLiteConversationProvider(
+        path=str(tmp_path / "history.db"), session_id="s1", window=2
+    )
+    history.add_messages(CONVERSATION)
+
+    window = history.get_history()
+    assert window == [CONVERSATION[0]] + CONVERSATION[-3:]
+
+    history.set_history(window + [AssistantMessage(content="next")])
+    history.flush()
+    assert len(history) == len(CONVERSATION) + 1
+    history.window = None
+    assert history.get_history() == CONVERSATION + [AssistantMessage(content="next")]
+
+
+@pytest.mark.asyncio
+async def test_agent_requests_keep_the_system_prompt(tmp_path):
+    provider = FakeProvider()
+    agent = AgentBase(
+        prompt="be terse",
+        provider=provider,
+        conversation=SQLiteConversationProvider(
+            path=str(tmp_path / "history.db"), window=3
+        ),
+    )
+    await agent.answer("q1")
+    await agent.answer("q2")
+
+    sent = provider.requests[-1].messages
+    assert sent[0] == SystemMessage(content="be terse")
+    assert [message.content for message in sent[1:]] == ["q1", "ok", "q2"]
+
+
+@pytest.mark.asyncio
+async def test_agent_summarizes_and_exports_the_whole_windowed_history(tmp_path):
+    provider = FakeProvider()
+    agent = AgentBase(
+        prompt="be terse",
+        provider=provider,
+        conversation=SQLiteConversationProvider(
+            path=str(tmp_path / "history.db"), window=2
+        ),
+    )
+    for i in range(4):
+        await agent.answer(f"q{i}")
+    assert await agent.export_conversation(tmp_path / "history.jsonl") == 9
+
+    await agent.summarize()
+    summarized = provider.requests[-1].messages[-1].content
+    assert all(f"q{i}" in summarized for i in range(4))
+    assert agent.conversation.get_full_history() == [AssistantMessage(content="ok")]
+
+
+def test_fork(tmp_path):
+    path = str(tmp_path / "history.db")
+    history = SQLiteConversationProvider(path=path, session_id="s1")
+    history.add_messages([UserMessage(content=str(i)) for i in range(5)])
+    history.set_history([AssistantMessage(content="summary")])
+    history.add_message(UserMessage(content="next"))
+
+    branch = history.fork()
+    assert branch.session_id != history.session_id
+    assert branch.get_history() == history.get_history()
+
+    branch.add_message(UserMessage(content="branch"))
+    branch.flush()
+    history.add_message(UserMessage(content="trunk"))
+    history.flush()
+    assert [m.content for m in branch.get_history()] == ["summary", "next", "branch"]
+    assert [m.content for m in history.get_history()] == ["summary", "next", "trunk"]
+
+    reopened = SQLiteConversationProvider(path=path, session_id=branch.session_id)
+    assert reopened.get_history() == branch.get_history()
+
+
+@pytest.mark.asyncio
+async def test_agent_fork_with_sqlite_history(tmp_path):
+    agent = AgentBase(
+        provider=FakeProvider(),
+        conversation=SQLiteConversationProvider(path=str(tmp_path / "history.db")),
+    )
+    await agent.answer("trunk")
+    branch = agent.fork()
+    await branch.answer("branch")
+
+    # the system prompt, the question and the answer
+    assert len(agent.conversation) == 3
+    assert [m.content for m in branch.conversation.get_history()[1:]] == [
+        "trunk",
+        "ok",
+        "branch",
+        "ok",
+    ]
@@ -0,0 +1,125 @@
+import pytest
+
+from emp_agents.models import AssistantMessage, UserMessage
+from emp_agents.utils import SegmentSummaryCache, summarize_conversation_hierarchical
+from emp_agents.utils.format import split_conversation
+
+
+def word_count(message) -> int:
+    return len((message.content or "").split())
+
+
+def make_history(turns: int, start: int = 0):
+    history = []
+    for i in range(start, start + turns):
+        history.append(UserMessage(content=f"question {i} " + "word " * 20))
+        history.append(AssistantMessage(content=f"answer {i} " + "word " * 20))
+    return history
+
+
+def test_split_conversation_is_prefix_stable():
+    history = make_history(10)
+    segments = split_conversation(history, 100, word_count)
+    longer = split_conversation(history + make_history(3, start=10), 100, word_count)
+
+    assert all(sum(word_count(m) for m in s) <= 100 for s in segments)
+    assert [m for s in segments for m in s] == history
+    assert longer[: len(segments) - 1] == segments[:-1]
+
+
+@pytest.mark.asyncio
+async def test_hierarchical_summary_reuses_cached_segments():
+    from .fakes import FakeProvider
+
+    provider = FakeProvider(respond=lambda request: "summary", delay=0.01)
+    cache = SegmentSummaryCache()
+    history = make_history(10)
+
+    summary = await summarize_conversation_hierarchical(
+        provider,
+        history,
+        model="fake-model",
+        segment_tokens=100,
+        cache=cache,
+        token_counter=word_count,
+    )
+    segments = split_conversation(history, 100, word_count)
+    assert summary.content == "summary"
+    assert len(provider.requests) == len(segments) + 1  # map + reduce
+    assert len(cache) == len(segments)
+
+    provider.requests.clear()
+    history += make_history(4, start=10)
+    await summarize_conversation_hierarchical(
+        provider,
+        history,
+        model="fake-model",
+        segment_tokens=100,
+        cache=cache,
+        token_counter=word_count,
+    )
+    new_segments = [
+        segment
+        for segment in split_conversation(history, 100, word_count)
+        if segment not in segments
+    ]
+    assert 0 < len(new_segments) < len(segments)
+    assert len(provider.requests) == len(new_segments) + 1
+
+
+@pytest.mark.asyncio
+async def test_merges_use_the_reduce_prompt():
+    from emp_agents.utils.format import DEFAULT_REDUCE_PROMPT
+
+    from .fakes import FakeProvider
+
+    provider = FakeProvider(respond=lambda request: "summary " + "word " * 60)
+    await summarize_conversation_hierarchical(
+        provider,
+        make_history(20),
+        model="fake-model",
+        prompt="Only keep the questions",
+        segment_tokens=100,
+        token_counter=word_count,
+    )
+    prompts = [request.messages[0].content for request in provider.requests]
+    merges = [prompt for prompt in prompts if prompt != "Only keep the questions"]
+    # several partial summaries are merged over more than one level
+    assert len(merges) > 1
+    assert set(merges) == {DEFAULT_REDUCE_PROMPT}
+    for request in provider.requests:
+        if request.messages[0].content == DEFAULT_REDUCE_PROMPT:
+            assert "Only keep the questions" not in request.messages[1].content
+
+
+@pytest.mark.asyncio
+async def test_failed_summary_keeps_the_history(monkeypatch):
+    from emp_agents.agents import AgentBase
+    from emp_agents.utils import format
+
+    from .fakes import FakeProvider
+
+    def fail(request):
+        raise RuntimeError("provider unavailable")
+
+    monkeypatch.setattr(format, "_count_message_tokens", word_count)
+    agent = AgentBase(provider=FakeProvider(respond=fail))
+    agent.add_messages(make_history(3))
+    before = await agent._get_history()
+
+    with pytest.raises(RuntimeError):
+        await agent.summarize(hierarchical=True)
+    assert await agent.summarize() == ""
+    assert await agent._get_history() == before
+
+
+@pytest.mark.asyncio
+async def test_hierarchical_summary_of_nothing_is_empty():
+    from .fakes import FakeProvider
+
+    provider = FakeProvider(respond=lambda request: "summary")
+    summary = await summarize_conversation_hierarchical(
+        provider, [], model="fake-model", token_counter=word_count
+    )
+    assert summary.content == ""
+    assert provider.requests == []
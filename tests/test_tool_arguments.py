@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from emp_agents.exceptions import InvalidToolArgumentsException
+from emp_agents.implicits import IgnoreDepends
+from emp_agents.models import FunctionTool
+from emp_agents.utils import execute_tool, get_arguments_adapter
+
+
+class Point(BaseModel):
+    x: int
+    y: int
+
+
+def scale(factor: float, point: Point, label: str = "point") -> str:
+    """Scale a point"""
+    return f"{label}: {point.x * factor}, {point.y * factor}"
+
+
+def tagged(name: str, **tags: str) -> str:
+    """Collects tags"""
+    return ",".join(f"{key}={value}" for key, value in sorted(tags.items()))
+
+
+def load_network() -> str:
+    return "mainnet"
+
+
+def with_network(address: str, network: str | None = IgnoreDepends(load_network)):
+    """Uses an injected network"""
+    return network
+
+
+def test_arguments_are_coerced():
+    tool = FunctionTool.from_func(scale)
+    assert tool.execute(factor="1.5", point={"x": "2", "y": 4}) == "point: 3.0, 6.0"
+
+
+def test_defaults_are_left_to_the_function():
+    arguments = get_arguments_adapter(scale).validate_python(
+        {"factor": 2, "point": {"x": 1, "y": 1}}
+    )
+    assert "label" not in arguments
+    assert isinstance(arguments["point"], Point)
+
+
+def test_adapter_is_compiled_once():
+    assert get_arguments_adapter(scale) is get_arguments_adapter(scale)
+
+
+def test_invalid_arguments_raise_structured_errors():
+    tool = FunctionTool.from_func(scale)
+    with pytest.raises(InvalidToolArgumentsException) as exc_info:
+        tool.execute(factor="fast", point={"x": 1}, colour="red")
+
+    assert exc_info.value.tool_name == "scale"
+    errors = {(error["type"], error["loc"]) for error in exc_info.value.errors}
+    assert errors == {
+        ("float_parsing", ("factor",)),
+        ("missing", ("point", "y")),
+        ("extra_forbidden", ("colour",)),
+    }
+
+
+def test_var_keyword_allows_extra_arguments():
+    tool = FunctionTool.from_func(tagged)
+    assert tool.execute(name="a", colour="red", size="l") == "colour=red,size=l"
+
+
+def test_injected_parameters_are_not_arguments():
+    tool = FunctionTool.from_func(with_network)
+    with pytest.raises(InvalidToolArgumentsException):
+        tool.execute(address="0x1", network="other")
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_returns_errors_to_the_model():
+    tool = FunctionTool.from_func(scale)
+    response = await execute_tool(
+        {tool.name: tool.execute}, tool.name, {"factor": "fast", "point": {}}
+    )
+    payload = json.loads(response)
+    assert payload["error"] == "invalid_arguments"
+    assert payload["tool"] == "scale"
+    assert {error["loc"][-1] for error in payload["details"]} == {"factor", "x", "y"}
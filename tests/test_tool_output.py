@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from emp_agents.agents import AgentBase
+from emp_agents.models import (
+    OffloadOutput,
+    ProjectOutput,
+    ToolCall,
+    ToolOutputStore,
+    TruncateOutput,
+)
+from emp_agents.models.protocol import output_policy
+
+from .fakes import FakeProvider, FakeResponse
+
+PAIRS = {
+    "schemaVersion": "1.0.0",
+    "pairs": [
+        {
+            "chainId": "base",
+            "pairAddress": f"0x{i}",
+            "baseToken": {"symbol": "EMP", "address": "0xabc"},
+            "liquidity": {"usd": 100.0, "base": 1, "quote": 2},
+            "txns": {"h24": {"buys": 10, "sells": 3}},
+        }
+        for i in range(5)
+    ],
+}
+
+
+def test_output_policies():
+    store = ToolOutputStore()
+    projected = ProjectOutput(
+        fields=["pairs.pairAddress", "pairs.baseToken.symbol", "pairs.liquidity.usd"],
+        max_items=2,
+    ).apply(json.dumps(PAIRS), store)
+    assert json.loads(projected) == {
+        "pairs": [
+            {
+                "pairAddress": f"0x{i}",
+                "baseToken": {"symbol": "EMP"},
+                "liquidity": {"usd": 100.0},
+            }
+            for i in range(2)
+        ]
+    }
+    assert ProjectOutput(fields=["a"]).apply("not json", store) == "not json"
+
+    truncated = TruncateOutput(max_chars=10).apply("x" * 25, store)
+    assert truncated == "x" * 10 + "\n... [truncated 15 characters]"
+
+    offloaded = OffloadOutput(page_size=10, preview_chars=4).apply("y" * 25, store)
+    handle = offloaded.split("`")[1]
+    assert store.pages(handle) == 3
+    assert store.read(handle, 3) == f"[{handle} page 3/3]\n" + "y" * 5
+
+
+@output_policy(OffloadOutput(page_size=100, preview_chars=10))
+def get_big_report() -> str:
+    """Returns a very large report"""
+    return "line\n" * 500
+
+
+@pytest.mark.asyncio
+async def test_agent_offloads_output_and_registers_retrieval_tool():
+    def call(name: str, arguments: dict) -> FakeResponse:
+        return FakeResponse(
+            calls=[
+                ToolCall(
+                    id=name,
+                    type="function",
+                    function=ToolCall.Function(
+                        name=name, arguments=json.dumps(arguments)
+                    ),
+                )
+            ]
+        )
+
+    handles: list[str] = []
+
+    def respond(request):
+        last = request.messages[-1]
+        if len(request.messages) == 2:
+            return call("get_big_report", {})
+        if not handles:
+            handles.append(last.content.split("`")[1])
+            return call("read_tool_output", {"handle": handles[0], "page": 2})
+        return last.content
+
+    agent = AgentBase(provider=FakeProvider(respond=respond), tools=[get_big_report])
+    response = await agent.answer("get me the report")
+
+    assert response == f"[{handles[0]} page 2/25]\n" + "line\n" * 20
+    assert "read_tool_output" in agent._tools_map
@@ -0,0 +1,116 @@
+import pytest
+
+from emp_agents.agents import AgentBase
+from emp_agents.models import (
+    AssistantMessage,
+    BM25ToolSelector,
+    FunctionTool,
+    ToolCall,
+    UserMessage,
+)
+
+from .fakes import FakeProvider
+
+
+def get_weather(city: str) -> str:
+    """Get the current weather forecast for a city"""
+    return "sunny"
+
+
+def get_token_balance(token_address: str, holder: str) -> str:
+    """Returns the ERC20 token balance of a holder"""
+    return "1"
+
+
+def make_tweet(content: str) -> str:
+    """Post a tweet to twitter"""
+    return "tweeted"
+
+
+def filler_tools(count: int) -> list[FunctionTool]:
+    tools = []
+    for i in range(count):
+
+        def filler() -> str:
+            return ""
+
+        filler.__name__ = f"unrelated_action_{i}"
+        filler.__doc__ = f"Does unrelated thing number {i}"
+        tools.append(FunctionTool.from_func(filler))
+    return tools
+
+
+TOOLS = [
+    FunctionTool.from_func(get_weather),
+    FunctionTool.from_func(get_token_balance),
+    FunctionTool.from_func(make_tweet),
+    *filler_tools(30),
+]
+
+
+def test_bm25_selects_relevant_tools():
+    selector = BM25ToolSelector(top_k=2)
+    selected = selector.select("what is my token balance?", TOOLS, pinned=set())
+    assert "get_token_balance" in {tool.name for tool in selected}
+    assert len(selected) == 2
+    assert selector.scores("what is my token balance?", TOOLS)[1] == max(
+        selector.scores("what is my token balance?", TOOLS)
+    )
+
+    selected = selector.select("what is the weather in Paris", TOOLS, {"make_tweet"})
+    assert {tool.name for tool in selected} >= {"get_weather", "make_tweet"}
+
+
+@pytest.mark.asyncio
+async def test_agent_sends_selected_tools_and_keeps_used_tools_pinned():
+    provider = FakeProvider()
+    agent = AgentBase(
+        provider=provider,
+        tools=TOOLS,
+        tool_selector=BM25ToolSelector(top_k=1),
+    )
+    agent.add_messages(
+        [
+            UserMessage(content="tweet hello"),
+            AssistantMessage(
+                content=None,
+                tool_calls=[
+                    ToolCall(
+                        id="1",
+                        type="function",
+                        function=ToolCall.Function(
+                            name="make_tweet", arguments='{"content": "hello"}'
+                        ),
+                    )
+                ],
+            ),
+        ]
+    )
+    await agent.answer("is it going to rain in the city tomorrow? check the weather")
+
+    sent = {tool.name for tool in provider.requests[-1].tools}
+    assert sent == {"get_weather", "make_tweet"}
+
+
+def test_bm25_fills_top_k_and_falls_back_to_every_tool():
+    selector = BM25ToolSelector(top_k=3)
+    selected = selector.select("what is the weather", TOOLS, pinned=set())
+    assert len(selected) == 3
+    assert "get_weather" in {tool.name for tool in selected}
+
+    assert selector.select("yes, go ahead and do it", TOOLS, set()) == TOOLS
+
+
+@pytest.mark.asyncio
+async def test_agent_query_covers_the_recent_turns():
+    provider = FakeProvider(respond=lambda request: "Shall I check the weather?")
+    agent = AgentBase(
+        provider=provider,
+        tools=TOOLS,
+        tool_selector=BM25ToolSelector(top_k=1),
+    )
+    await agent.answer("is it going to rain in Paris?")
+    await agent.answer("sure")
+
+    sent = [tool.name for tool in provider.requests[-1].tools]
+    assert sent == ["get_weather"]
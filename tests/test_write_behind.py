@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+from emp_agents.agents import AgentBase
+from emp_agents.agents.write_behind import (
+    InMemoryConversationStore,
+    WriteBehindConversationProvider,
+)
+from emp_agents.models import AssistantMessage, SystemMessage, UserMessage
+
+from .fakes import FakeProvider, FakeResponse
+
+
+class FailingStore(InMemoryConversationStore):
+    failures: int = 1
+
+    async def append(self, messages):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("store unavailable")
+        await super().append(messages)
+
+
+@pytest.mark.asyncio
+async def test_appends_are_batched_in_background():
+    store = InMemoryConversationStore(latency=0.01)
+    history = WriteBehindConversationProvider(store=store, flush_interval=0.05)
+
+    for i in range(10):
+        await history.add_message(UserMessage(content=str(i)))
+    assert len(await history.get_history()) == 10
+    assert store.writes == 0
+
+    await asyncio.sleep(0.2)
+    assert store.writes == 1
+    assert len(await store.load()) == 10
+    await history.aclose()
+
+
+@pytest.mark.asyncio
+async def test_flush_keeps_order_of_appends_and_replaces():
+    store = InMemoryConversationStore()
+    history = WriteBehindConversationProvider(store=store, flush_interval=10)
+
+    await history.add_messages([UserMessage(content="1"), UserMessage(content="2")])
+    await history.set_history([AssistantMessage(content="summary")])
+    await history.add_message(UserMessage(content="3"))
+    await history.flush()
+
+    assert await store.load() == [
+        AssistantMessage(content="summary"),
+        UserMessage(content="3"),
+    ]
+    assert store.writes == 1
+    await history.aclose()
+
+
+@pytest.mark.asyncio
+async def test_set_history_appends_only_new_messages():
+    store = InMemoryConversationStore()
+    history = WriteBehindConversationProvider(store=store)
+    await history.add_message(UserMessage(content="1"))
+    await history.flush()
+
+    conversation = await history.get_history()
+    await history.set_history(conversation + [AssistantMessage(content="2")])
+    await history.flush()
+    assert store.writes == 2
+    assert [message.content for message in await store.load()] == ["1", "2"]
+    await history.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_are_retried():
+    store = FailingStore()
+    history = WriteBehindConversationProvider(store=store, flush_interval=0.01)
+    await history.add_message(UserMessage(content="1"))
+
+    with pytest.raises(ConnectionError):
+        await history.flush()
+    await history.flush()
+    assert await store.load() == [UserMessage(content="1")]
+    await history.aclose()
+
+
+@pytest.mark.asyncio
+async def test_agent_with_async_conversation():
+    store = InMemoryConversationStore()
+    agent = AgentBase(
+        provider=FakeProvider(respond=lambda request: FakeResponse(content="hello")),
+        conversation=WriteBehindConversationProvider(store=store),
+        prompt="be nice",
+    )
+    assert await agent.answer("hi") == "hello"
+    await agent.conversation.flush()
+    assert [message.content for message in await store.load()] == [
+        "be nice",
+        "hi",
+        "hello",
+    ]
+
+    # a resumed session does not repeat the system message
+    resumed = AgentBase(
+        provider=FakeProvider(respond=lambda request: FakeResponse(content="again")),
+        conversation=WriteBehindConversationProvider(store=store),
+        prompt="be nice",
+    )
+    await resumed.answer("hi again")
+    await resumed.conversation.flush()
+    history = await store.load()
+    assert history[0] == SystemMessage(content="be nice")
+    assert [message.content for message in history[1:]] == [
+        "hi",
+        "hello",
+        "hi again",
+        "again",
+    ]
+    await agent.conversation.aclose()
+    await resumed.conversation.aclose()
+
+
+@pytest.mark.asyncio
+async def test_agent_turn_does_not_wait_for_the_store():
+    class FailingStore(InMemoryConversationStore):
+        async def append(self, messages):
+            raise ConnectionError("store unavailable")
+
+    agent = AgentBase(
+        provider=FakeProvider(respond=lambda request: FakeResponse(content="hello")),
+        conversation=WriteBehindConversationProvider(
+            store=FailingStore(), flush_interval=10
+        ),
+    )
+    assert await agent.answer("hi") == "hello"
+    assert [message.content for message in await agent._get_history()][-2:] == [
+        "hi",
+        "hello",
+    ]
+    with pytest.raises(ConnectionError):
+        await agent.conversation.flush()
+    agent.conversation._worker.cancel()
+
+
+def test_agent_with_async_conversation_can_not_be_forked():
+    agent = AgentBase(
+        provider=FakeProvider(),
+        conversation=WriteBehindConversationProvider(store=InMemoryConversationStore()),
+    )
+    with pytest.raises(TypeError, match="WriteBehindConversationProvider"):
+        agent.fork()